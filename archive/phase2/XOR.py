@@ -3,11 +3,18 @@ import matplotlib.pyplot as plt
 from sympy import isprime
 import os
 
+from bitvector import BitVector
+import xor_keyspace
+
 # --- Configuration ---
 ENCRYPTED_SIGNAL = "HEQUJ5"
 SIGNAL_BASE = 72
 DECRYPTION_KEY = 11
 OUTPUT_DIR = "wow_signal_xor_decryption"
+KEYSPACE_BITS = 20
+KEYSPACE_TOP = 10
+# Hydrogen line (1420 MHz) and the signal base, scored as motif hits.
+KEYSPACE_MOTIFS = [bin(1420)[2:], bin(SIGNAL_BASE)[2:]]
 
 # --- Helper Functions ---
 
@@ -27,14 +34,10 @@ def sequence_to_decimal(sequence, base):
     return decimal_value
 
 def repeating_key_xor(binary_message, key_int):
-    """Performs a repeating key XOR operation."""
-    key_binary = bin(key_int)[2:]
-    decrypted_bits = []
-    for i, bit in enumerate(binary_message):
-        key_bit = key_binary[i % len(key_binary)]
-        decrypted_bit = str(int(bit) ^ int(key_bit))
-        decrypted_bits.append(decrypted_bit)
-    return "".join(decrypted_bits)
+    """Performs a repeating key XOR operation and returns the result as a BitVector."""
+    message = BitVector(binary_message)
+    key = BitVector.from_int(key_int)
+    return message ^ key.tile(len(message))
 
 def analyze_payload(binary_str):
     """Performs a full analysis on a decrypted binary string."""
@@ -43,13 +46,14 @@ def analyze_payload(binary_str):
     print(f" -> Payload length: {length} bits")
 
     # Shannon Entropy
-    ones = binary_str.count('1')
+    payload = BitVector(binary_str)
+    ones = payload.popcount()
     prob_one = ones / length
     entropy = - (prob_one * np.log2(prob_one) + (1-prob_one) * np.log2(1-prob_one))
     print(f" -> Shannon Entropy: {entropy:.4f}")
 
     # Primality Check
-    payload_decimal = int(binary_str, 2)
+    payload_decimal = payload.to_int()
     print(f" -> Decimal Value: {payload_decimal}")
     if isprime(payload_decimal):
         print("\n*** MAJOR FINDING: The decrypted payload is a PRIME NUMBER. ***")
@@ -59,7 +63,7 @@ def analyze_payload(binary_str):
     # Visual Analysis (if possible)
     if length == 300: # We use 300 as it's our previously confirmed message size
         print(" -> Visualizing payload as a 20x15 image...")
-        pixels = np.array([int(bit) for bit in binary_str]).reshape((15, 20))
+        pixels = payload.array.reshape((15, 20))
         plt.figure(figsize=(10, 7.5))
         plt.imshow(pixels, cmap='gray_r', interpolation='nearest')
         plt.title("Decrypted Payload as a 20x15 Image")
@@ -68,6 +72,19 @@ def analyze_payload(binary_str):
         plt.close()
         print(f" -> Saved visualization to: {filepath}")
 
+def keyspace_search(binary_message, key_int):
+    """Ranks every repeating key up to KEYSPACE_BITS bits and reports where `key_int` lands."""
+    print(f"\n--- 3. Searching All Keys up to {KEYSPACE_BITS} Bits ---")
+    rows = xor_keyspace.search(binary_message, KEYSPACE_BITS, top=KEYSPACE_TOP,
+                               patterns=KEYSPACE_MOTIFS, keep=(key_int,))
+    for row in rows:
+        marker = " <- hypothesis key" if row['key'] == key_int else ""
+        print(f" -> #{row['rank']:<7} key={row['key']:<8} score={row['score']:6.2f} "
+              f"entropy={row['entropy']:.3f} printable={row['printable']:.2f} "
+              f"structure={row['structure']:.2f} {row['image_shape']} motifs={row['motifs']:.0f} "
+              f"prime={row['is_prime']}{marker}")
+    return rows
+
 # --- Main Execution ---
 if __name__ == "__main__":
     if not os.path.exists(OUTPUT_DIR):
@@ -78,7 +95,7 @@ if __name__ == "__main__":
     # 1. Convert the encrypted signal to its full binary representation
     print("\n--- 1. Converting Encrypted Signal ---")
     signal_decimal = sequence_to_decimal(ENCRYPTED_SIGNAL, SIGNAL_BASE)
-    signal_binary = bin(signal_decimal)[2:]
+    signal_binary = BitVector.from_int(signal_decimal)
     print(f" -> '{ENCRYPTED_SIGNAL}' (Base {SIGNAL_BASE}) = {signal_decimal} (Base 10)")
     print(f" -> Encrypted binary length: {len(signal_binary)} bits")
 
@@ -88,4 +105,7 @@ if __name__ == "__main__":
     # 3. Analyze the decrypted payload
     analyze_payload(decrypted_binary)
 
+    # 4. Compare the hypothesis key against the whole keyspace
+    keyspace_search(signal_binary, DECRYPTION_KEY)
+
     print("\n" + "="*60); print("--- DECRYPTION & ANALYSIS COMPLETE ---"); print("="*60)
\ No newline at end of file
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Content-Addressed Artifact Cache
+---------------------------------------------------
+Stores the result, console log and output files (plots, images) of an
+analysis stage on disk, keyed by a SHA-256 hash of
+
+    (stage name, stage version, stage dependencies, input bits, parameters)
+
+The dependencies are everything the stage reads besides its arguments,
+found by walking the names its code uses:
+
+  * the source of the stage and of the functions and classes it calls in
+    its own module,
+  * the module constants those functions read (NGRAM_MAX_N, ...),
+  * the file contents of every repository module they import, directly or
+    through other repository modules, including imports inside functions,
+  * the Python version and the installed version of every other package
+    imported along the way, or "missing" when it is not installed.
+
+On a hit the stored files are copied back into place and the stage is not
+run at all, so re-running a pipeline only spends time on the stages whose
+code, inputs, parameters or environment actually changed. Bump a stage's
+`version` to invalidate its entries by hand.
+
+Entries live in one directory each under the cache root. Every hit refreshes
+the entry's timestamp, and `evict` drops the least recently used entries
+until the cache fits in `max_bytes`.
+"""
+
+import dis
+import hashlib
+import importlib.metadata
+import importlib.util
+import inspect
+import os
+import pickle
+import shutil
+import site
+import sys
+import sysconfig
+import tempfile
+import types
+from functools import lru_cache
+
+import numpy as np
+
+from bitvector import BitVector
+
+DEFAULT_CACHE_DIR = ".artifact_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+ENTRY_FILE = "entry.pkl"
+
+# Module-level values built from these types are hashed as constants; anything else is identified by its module.
+CONSTANT_TYPES = (type(None), bool, int, float, complex, str, bytes, range, np.ndarray, np.generic)
+# Modules installed here belong to Python or to a package, and are identified by version instead of by file.
+INSTALL_PATHS = tuple({os.path.join(os.path.realpath(path), "") for path in
+                       [sysconfig.get_paths()[name] for name in ("stdlib", "platstdlib", "purelib", "platlib")]
+                       + [site.getusersitepackages()]})
+
+
+def _update(digest, value):
+    """Feeds a stage input or parameter into the hash, with a type tag per value."""
+    if isinstance(value, BitVector):
+        digest.update(b"bits:" + str(value).encode("ascii") + b";")
+    elif isinstance(value, np.ndarray):
+        digest.update(f"array:{value.dtype.str}:{value.shape}:".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}:{len(value)}:".encode())
+        for item in value:
+            _update(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)}:".encode())
+        for name in sorted(value, key=repr):
+            _update(digest, name)
+            _update(digest, value[name])
+    else:
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+
+def source_digest(func):
+    """Hash of a stage function's source, so editing a stage invalidates its entries."""
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = getattr(func, "__qualname__", repr(func))
+    return hashlib.sha256(source.encode()).hexdigest()
+
+def _is_constant(value):
+    if isinstance(value, (list, tuple)):
+        return all(_is_constant(item) for item in value)
+    if isinstance(value, dict):
+        return all(_is_constant(name) and _is_constant(item) for name, item in value.items())
+    return isinstance(value, CONSTANT_TYPES)
+
+def _code_objects(code):
+    """A code object and every function, class body and comprehension nested in it."""
+    yield code
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _code_objects(const)
+
+def _imports(code):
+    """Top-level names of the modules imported anywhere in a code object, lazy imports included."""
+    return {ins.argval.split(".")[0] for c in _code_objects(code) for ins in dis.get_instructions(c)
+            if ins.opname == "IMPORT_NAME" and ins.argval}
+
+def _module_file(name):
+    """Source file of a top-level module, or None for built-in, missing and namespace modules."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return getattr(module, "__file__", None)
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return None
+    return spec.origin if spec is not None and spec.has_location else None
+
+def _is_repo_file(path):
+    return bool(path) and path.endswith(".py") and not os.path.realpath(path).startswith(INSTALL_PATHS)
+
+@lru_cache(maxsize=256)
+def _file_summary(path, mtime_ns, size):
+    """(content hash, imported module names) of a repository module; cached per file version."""
+    with open(path, "rb") as f:
+        source = f.read()
+    try:
+        imports = sorted(_imports(compile(source, path, "exec")))
+    except SyntaxError:
+        imports = []
+    return hashlib.sha256(source).hexdigest(), imports
+
+@lru_cache(maxsize=1)
+def _distributions():
+    return importlib.metadata.packages_distributions()
+
+def package_version(name):
+    """'dist==version' for an installed top-level package, 'missing', or 'stdlib'."""
+    try:
+        if importlib.util.find_spec(name) is None:
+            return "missing"
+    except (ImportError, ValueError):
+        return "missing"
+    dists = sorted(set(_distributions().get(name, ())))
+    if not dists:
+        return "stdlib"
+    return ",".join(f"{dist}=={importlib.metadata.version(dist)}" for dist in dists)
+
+def dependency_digest(func):
+    """
+    Hash of what a stage function depends on besides its arguments (see the module
+    docstring): own-module sources and constants, repository module files, and versions.
+    """
+    home = getattr(func, "__module__", None)
+    entries = {"python": sys.version}
+    seen = set()
+
+    def visit_module(name):
+        if not name or name in seen:
+            return
+        seen.add(name)
+        path = _module_file(name)
+        if _is_repo_file(path):
+            stat = os.stat(path)
+            entries[f"module:{name}"], imports = _file_summary(path, stat.st_mtime_ns, stat.st_size)
+            for imported in imports:
+                visit_module(imported)
+        else:
+            entries[f"package:{name}"] = package_version(name)
+
+    def visit_function(function):
+        if function in seen:
+            return
+        seen.add(function)
+        entries[f"source:{function.__qualname__}"] = source_digest(function)
+        code = function.__code__
+        for imported in sorted(_imports(code)):
+            visit_module(imported)
+        names = sorted({name for c in _code_objects(code) for name in c.co_names})
+        for name in names:
+            if name in function.__globals__:
+                visit_global(name, function.__globals__[name])
+
+    def visit_global(name, value):
+        if isinstance(value, types.ModuleType):
+            visit_module(value.__name__.split(".")[0])
+        elif _is_constant(value):
+            entries[f"constant:{name}"] = value
+        elif isinstance(value, types.FunctionType) and value.__module__ == home:
+            visit_function(value)
+        elif isinstance(value, type) and value.__module__ == home:
+            entries[f"source:{value.__qualname__}"] = source_digest(value)
+        elif isinstance(getattr(value, "__module__", None), str):
+            visit_module(value.__module__.split(".")[0])
+
+    if isinstance(func, types.FunctionType):
+        visit_function(func)
+    else:
+        visit_global(getattr(func, "__qualname__", repr(func)), func)
+    digest = hashlib.sha256()
+    _update(digest, entries)
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """On-disk, size-bounded cache of stage results and the files they write."""
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, stage_name, version, func, inputs=(), params=()):
+        """Content address of one stage run."""
+        digest = hashlib.sha256()
+        _update(digest, [stage_name, version, dependency_digest(func)])
+        _update(digest, list(inputs))
+        _update(digest, params)
+        return digest.hexdigest()
+
+    def _entry_dir(self, key):
+        return os.path.join(self.root, key)
+
+    def load(self, key):
+        """
+        Returns (result, log) for a cached stage run and restores its files,
+        or None on a miss.
+        """
+        entry_dir = self._entry_dir(key)
+        entry_path = os.path.join(entry_dir, ENTRY_FILE)
+        try:
+            with open(entry_path, "rb") as f:
+                result, log, files = pickle.load(f)
+            for stored, path in files:
+                if os.path.dirname(path):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                shutil.copyfile(os.path.join(entry_dir, stored), path)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            self.misses += 1
+            return None
+        os.utime(entry_path)
+        self.hits += 1
+        return result, log
+
+    def store(self, key, result, log, artifacts=()):
+        """Saves a stage run together with the artifact files that exist on disk."""
+        os.makedirs(self.root, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".tmp-", dir=self.root)
+        try:
+            files = []
+            for i, path in enumerate(artifacts):
+                if os.path.isfile(path):
+                    stored = f"{i}_{os.path.basename(path)}"
+                    shutil.copyfile(path, os.path.join(staging, stored))
+                    files.append((stored, path))
+            with open(os.path.join(staging, ENTRY_FILE), "wb") as f:
+                pickle.dump((result, log, files), f)
+            # Publish the entry in one step so readers never see a half-written one.
+            os.replace(staging, self._entry_dir(key))
+        except OSError:
+            pass  # another run already stored this key, or the disk is full; the cache is best-effort
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def entries(self):
+        """Lists (last used, size in bytes, path) for every entry in the cache."""
+        entries = []
+        if not os.path.isdir(self.root):
+            return entries
+        for name in os.listdir(self.root):
+            entry_dir = os.path.join(self.root, name)
+            entry_path = os.path.join(entry_dir, ENTRY_FILE)
+            if name.startswith(".tmp-") or not os.path.isfile(entry_path):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry_dir, f)) for f in os.listdir(entry_dir))
+            entries.append((os.path.getmtime(entry_path), size, entry_dir))
+        return entries
+
+    def evict(self):
+        """Drops least recently used entries until the cache fits in max_bytes. Returns the number removed."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry_dir in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        """Removes every cached entry."""
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Assembly Simulation Engine
+---------------------------------------------------
+Shared engine behind the machine-assembly simulations. Without it, each
+script keeps a list of Component objects and copies every component into
+fresh lists or dicts at every step.
+
+The state of S independent runs (one per random seed) of N components is
+kept as arrays:
+
+    pos (S, N, d)   color (S, N)   energy (S, N)   active (S, N)   attached (S, N)
+
+Step t applies one instruction to component t % N in every run at once, as
+masked array updates. Components that are deactivated in a run ignore
+their instructions. The history is a preallocated buffer of
+(frames, S, N, d) positions plus per-frame color, energy and active arrays.
+It is filled in place, optionally only every `record_every` steps, so long
+instruction streams do not build one Python object per component per step.
+
+An instruction stream is a pair of arrays: opcodes (T,) and arguments
+(T, d). `compile_program` builds them from instruction names and a
+per-script table, so every script keeps its own instruction semantics:
+
+  * MOVE adds the argument vector,
+  * SCALE multiplies the position by arg[0],
+  * APPROACH moves the fraction arg[0] of the way to the component's
+    target and sets its energy to `glow`,
+  * TOGGLE_COLOR switches between color 0 and 1,
+  * ATTACH snaps to the nearest active, unattached other component, plus
+    `attach_offset`,
+  * DETACH and DEACTIVATE clear the attachment or the active flag,
+  * WAIT does nothing.
+
+With energy_decay=True, a component's energy drops by one each time it
+is addressed, before its instruction runs.
+
+From INDEX_MIN_COMPONENTS components on, ATTACH queries a uniform-grid
+spatial index (spatial_index.GridIndex) over the free components of each
+run. The engine updates the index whenever an instruction moves a
+component or changes its free status. Below that size, one vectorized
+distance computation over all runs is cheaper.
+"""
+
+import numpy as np
+
+from spatial_index import GridIndex
+
+WAIT, MOVE, SCALE, APPROACH, TOGGLE_COLOR, ATTACH, DETACH, DEACTIVATE = range(8)
+INDEX_MIN_COMPONENTS = 2048
+
+
+def random_positions(seeds, n, d=2, low=0.0, high=10.0):
+    """(seeds, n, d) starting positions, uniform in [low, high), one generator per seed."""
+    return np.stack([np.random.default_rng(seed).random((n, d)) * (high - low) + low for seed in seeds])
+
+def compile_program(instructions, table, d=2):
+    """
+    (ops, args) arrays for a sequence of instruction names. `table` maps a name to
+    (opcode, argument); names missing from the table become WAIT.
+    """
+    ops = np.full(len(instructions), WAIT, dtype=np.int64)
+    args = np.zeros((len(instructions), d))
+    for t, name in enumerate(instructions):
+        if name in table:
+            op, arg = table[name]
+            ops[t] = op
+            args[t] = arg
+    return ops, args
+
+
+class History:
+    """Preallocated per-frame record: pos (frames, S, N, d) and color/energy/active (frames, S, N)."""
+
+    def __init__(self, frames, seeds, n, d):
+        self.pos = np.empty((frames, seeds, n, d))
+        self.color = np.empty((frames, seeds, n), dtype=np.int8)
+        self.energy = np.empty((frames, seeds, n), dtype=np.int64)
+        self.active = np.empty((frames, seeds, n), dtype=bool)
+
+    def __len__(self):
+        return len(self.pos)
+
+    def record(self, frame, engine):
+        self.pos[frame] = engine.pos
+        self.color[frame] = engine.color
+        self.energy[frame] = engine.energy
+        self.active[frame] = engine.active
+
+
+class AssemblyEngine:
+    """Struct-of-arrays component state for S parallel runs of N components."""
+
+    def __init__(self, positions, targets=None, attach_offset=0.5, glow=5, energy_decay=False, spatial_index=None):
+        self.pos = np.array(positions, dtype=np.float64)
+        if self.pos.ndim == 2:
+            self.pos = self.pos[None]
+        self.seeds, self.n, self.d = self.pos.shape
+        self.targets = None if targets is None else np.broadcast_to(
+            np.asarray(targets, dtype=np.float64), self.pos.shape)
+        self.attach_offset = attach_offset
+        self.glow = glow
+        self.energy_decay = energy_decay
+        self.color = np.zeros((self.seeds, self.n), dtype=np.int8)
+        self.energy = np.zeros((self.seeds, self.n), dtype=np.int64)
+        self.active = np.ones((self.seeds, self.n), dtype=bool)
+        self.attached = np.full((self.seeds, self.n), -1, dtype=np.int64)
+        if spatial_index is None:
+            spatial_index = self.n >= INDEX_MIN_COMPONENTS
+        self.index = GridIndex(self.pos, self.free_mask()) if spatial_index else None
+
+    def free_mask(self):
+        """Components that ATTACH can target: active and not attached."""
+        return self.active & (self.attached < 0)
+
+    def nearest_free(self, comp, runs):
+        """Index of the nearest active, unattached component other than `comp` in each run (-1 if none)."""
+        if self.index is not None:
+            return np.array([self.index.nearest(run, comp, self.pos[run]) for run in runs.tolist()], dtype=np.int64)
+        pos = self.pos[runs]
+        dist = np.linalg.norm(pos - pos[:, comp, None, :], axis=2)
+        free = self.free_mask()[runs]
+        free[:, comp] = False
+        dist[~free] = np.inf
+        target = dist.argmin(axis=1)
+        target[~free.any(axis=1)] = -1
+        return target
+
+    def step(self, t, op, arg):
+        """Applies one instruction to component t % N in every run."""
+        comp = t % self.n
+        if self.energy_decay:
+            self.energy[:, comp] = np.maximum(self.energy[:, comp] - 1, 0)
+        if op == WAIT:
+            return
+        runs = np.flatnonzero(self.active[:, comp])
+        if not runs.size:
+            return
+        if op == MOVE:
+            self.pos[runs, comp] += arg
+        elif op == SCALE:
+            self.pos[runs, comp] *= arg[0]
+        elif op == APPROACH:
+            self.pos[runs, comp] += (self.targets[runs, comp] - self.pos[runs, comp]) * arg[0]
+            self.energy[runs, comp] = self.glow
+        elif op == TOGGLE_COLOR:
+            self.color[runs, comp] ^= 1
+        elif op == ATTACH:
+            target = self.nearest_free(comp, runs)
+            runs, target = runs[target >= 0], target[target >= 0]
+            self.attached[runs, comp] = target
+            self.pos[runs, comp] = self.pos[runs, target] + self.attach_offset
+        elif op == DETACH:
+            self.attached[runs, comp] = -1
+        elif op == DEACTIVATE:
+            self.active[runs, comp] = False
+        if self.index is not None and op != TOGGLE_COLOR:
+            free = self.free_mask()[runs, comp].tolist()
+            for run, is_free in zip(runs.tolist(), free):
+                self.index.update(run, comp, self.pos[run, comp], is_free)
+
+    def run(self, ops, args=None, record_every=1):
+        """Runs an instruction stream and returns its History (one frame per `record_every` steps)."""
+        ops = np.asarray(ops).tolist()
+        args = np.zeros((len(ops), self.d)) if args is None else np.asarray(args, dtype=np.float64)
+        history = History(-(-len(ops) // record_every), self.seeds, self.n, self.d)
+        for t, op in enumerate(ops):
+            self.step(t, op, args[t])
+            if (t + 1) % record_every == 0 or t == len(ops) - 1:
+                history.record(t // record_every, self)
+        return history
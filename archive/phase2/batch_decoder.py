@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Batch Candidate Decoder
+---------------------------------------------------
+Runs the self-referential decryption chain of the main pipeline
+
+    n = decode(sequence, initial_base)  ->  new_base = n**2  ->  decode(sequence, new_base)
+
+for many candidate sequences and a whole range of initial bases in one
+process. The result is streamed as JSONL, one record per decodable
+(sequence, base) pair. For each sequence the chain is evaluated for a whole
+chunk of bases at once. The first decode runs on int64 numpy arrays when it
+cannot overflow. The big second decode uses numpy object arrays of gmpy2
+`mpz` values, or plain Python ints if gmpy2 is not installed.
+
+Usage:
+    python batch_decoder.py candidates.txt --bases 2:1000 > results.jsonl
+    echo HEQUJ5 | python batch_decoder.py - --bases 34 --bits
+"""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+INT64_LIMIT = 2 ** 63
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def _mpz():
+    """gmpy2.mpz when available, else int (imported here to keep startup fast)."""
+    try:
+        from gmpy2 import mpz
+        return mpz
+    except ImportError:
+        return int
+
+def digit_values(sequence):
+    """Digit values of an alphanumeric sequence (0-9 -> 0-9, A-Z -> 10-35)."""
+    digits = []
+    for char in sequence:
+        if '0' <= char <= '9':
+            digits.append(int(char))
+        elif 'A' <= char <= 'Z':
+            digits.append(10 + (ord(char) - ord('A')))
+        else:
+            raise ValueError(f"Invalid character for base conversion: {char}")
+    return digits
+
+def horner(digits, bases):
+    """Evaluates the digits as a number in every base of the array at once."""
+    value = np.zeros_like(bases)
+    for digit in digits:
+        value = value * bases + digit
+    return value
+
+def decode_chain(sequence, bases):
+    """
+    Runs the decryption chain for one sequence over an array of initial bases.
+    Yields (initial_base, intermediate, new_base, final) for every base where
+    both decodes are valid, in the order of `bases`.
+    """
+    digits = digit_values(sequence)
+    bases = np.asarray(bases, dtype=np.int64)
+    max_digit = max(digits, default=0)
+    bases = bases[bases > max_digit]
+    if not len(bases) or not digits:
+        return
+    mpz = _mpz()
+
+    if int(bases.max()) ** len(digits) < INT64_LIMIT:
+        intermediate = horner(digits, bases)
+    else:
+        intermediate = horner(digits, np.array([mpz(int(b)) for b in bases], dtype=object))
+    new_bases = np.array([mpz(int(n)) for n in intermediate], dtype=object) ** 2
+    valid = new_bases > max_digit
+    finals = horner(digits, new_bases[valid])
+    for base, n, new_base, final in zip(bases[valid], intermediate[valid], new_bases[valid], finals):
+        yield int(base), int(n), int(new_base), int(final)
+
+def decode_batch(sequences, bases, chunk_size=DEFAULT_CHUNK_SIZE, with_bits=False):
+    """
+    Decodes every sequence of an iterable (file lines, a generator, ...) over
+    `bases` and yields one JSON-ready record per result. Sequences with
+    invalid characters produce a record with an "error" field instead.
+    """
+    bases = np.asarray(bases, dtype=np.int64)
+    for sequence in sequences:
+        sequence = sequence.strip()
+        if not sequence:
+            continue
+        try:
+            for start in range(0, len(bases), chunk_size):
+                for base, n, new_base, final in decode_chain(sequence, bases[start:start + chunk_size]):
+                    record = {
+                        "sequence": sequence,
+                        "initial_base": base,
+                        "intermediate_decimal": n,
+                        "new_base": new_base,
+                        "final_decimal": final,
+                        "bit_length": final.bit_length(),
+                    }
+                    if with_bits:
+                        record["binary"] = format(final, 'b')
+                    yield record
+        except ValueError as e:
+            yield {"sequence": sequence, "error": str(e)}
+
+def parse_bases(spec):
+    """Parses '34', '2:64' (inclusive) or '2:1000:2' into an array of bases."""
+    parts = [int(part) for part in spec.split(":")]
+    if len(parts) == 1:
+        return np.array(parts, dtype=np.int64)
+    start, stop = parts[0], parts[1]
+    step = parts[2] if len(parts) > 2 else 1
+    return np.arange(start, stop + 1, step, dtype=np.int64)
+
+def write_jsonl(records, stream):
+    """Writes records one JSON object per line and returns how many were written."""
+    count = 0
+    for record in records:
+        stream.write(json.dumps(record) + "\n")
+        count += 1
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch self-referential decoding of candidate sequences.")
+    parser.add_argument("candidates", help="file with one candidate sequence per line, or - for stdin")
+    parser.add_argument("--bases", default="34", help="initial base(s): N, START:STOP or START:STOP:STEP (default: 34)")
+    parser.add_argument("--output", default="-", help="JSONL output file (default: stdout)")
+    parser.add_argument("--bits", action="store_true", help="include the final binary string in every record")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="bases evaluated per vectorized chunk")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.candidates == "-" else open(args.candidates)
+    sink = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        records = decode_batch(source, parse_bases(args.bases), args.chunk_size, args.bits)
+        count = write_jsonl(records, sink)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    print(f"Wrote {count} record(s).", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.linalg import dft
+import quantum_evolution
 
 # --- Constants ---
 BINARY_STRING = "110011111110011110001110111101111100011100100110001011000001100001110101110011011000111000000111001001101100100001001101001101111111111111000000011000101100000110011011100000111000101011111100110101100101111011101000101011001000001101111101110001110000010111001001111111101101111001011100111011111111"
@@ -12,17 +12,8 @@ def get_binary_state_at_timestep(initial_binary, t):
     """
     Runs the quantum evolution model for 't' steps and returns the binary state.
     """
-    initial_state = np.array([int(bit) * 2 - 1 for bit in initial_binary], dtype=np.complex128)
-    n = len(initial_state)
-    qft_matrix = dft(n, scale='sqrtn')
-    
-    current_state = initial_state
-    for i in range(t):
-        evolved_state = np.dot(qft_matrix, current_state)
-        phase_shift = np.exp(1j * 2 * np.pi * FREQUENCY_OFFSET_KEY * i / (TIMESTEPS * 1e6))
-        current_state = evolved_state * phase_shift
-        
-    return "".join(['1' if np.real(c) >= 0 else '0' for c in current_state])
+    evolution = quantum_evolution.get_evolution(initial_binary, FREQUENCY_OFFSET_KEY, TIMESTEPS)
+    return evolution.binary_state_at(t)
 
 def create_bit_flip_map(before_state, after_state):
     """
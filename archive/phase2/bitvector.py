@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Packed Bit-Vector Core Type
+---------------------------------------------------
+BitVector holds a binary message as an immutable numpy bit array so the
+analyzers stop rebuilding `np.array([int(bit) for bit in binary_string])`
+from characters at every stage.
+
+Bits are stored unpacked, one uint8 per bit, so `array` and slices are
+zero-copy views. The packed form (`numpy.packbits`, and uint64 words on top
+of it) is derived once on first use and backs the integer and byte
+conversions. Integers and bytes follow the `int(binary_string, 2)`
+convention: the first bit is the most significant one.
+"""
+
+import numpy as np
+
+
+class BitVector:
+    """Immutable sequence of bits with vectorized XOR, popcount, rotate and slicing."""
+
+    __slots__ = ('_bits', '_packed', '_state')
+
+    def __init__(self, bits):
+        if isinstance(bits, BitVector):
+            # Vectors are immutable, so another vector's buffer can be shared.
+            self._set(bits._bits)
+            return
+        if isinstance(bits, str):
+            bits = np.frombuffer(bits.encode('ascii'), dtype=np.uint8) - ord('0')
+        arr = np.array(bits, dtype=np.uint8, copy=True).ravel()
+        if arr.size and arr.max() > 1:
+            raise ValueError("BitVector values must be 0 or 1.")
+        arr.flags.writeable = False
+        self._set(arr)
+
+    def _set(self, arr):
+        self._bits = arr
+        self._packed = None
+        self._state = None
+
+    @classmethod
+    def _wrap(cls, arr):
+        """Builds a BitVector around an existing read-only uint8 array without copying."""
+        vector = cls.__new__(cls)
+        vector._set(arr)
+        return vector
+
+    @classmethod
+    def from_int(cls, value, length=None):
+        """Big-endian bits of a non-negative int, zero-padded on the left to `length`."""
+        if value < 0:
+            raise ValueError("BitVector.from_int requires a non-negative integer.")
+        if length is None:
+            length = max(value.bit_length(), 1)
+        elif value.bit_length() > length:
+            raise ValueError(f"{value} does not fit in {length} bits.")
+        data = value.to_bytes((length + 7) // 8, byteorder='big')
+        return cls.from_bytes(data, length)
+
+    @classmethod
+    def from_bytes(cls, data, length=None):
+        """
+        Bits of a big-endian byte string, keeping the last `length` bits (left-padded
+        with zeros when the bytes hold fewer).
+        """
+        arr = np.unpackbits(np.frombuffer(bytes(data), dtype=np.uint8))
+        if length is not None:
+            if length > len(arr):
+                arr = np.concatenate((np.zeros(length - len(arr), dtype=np.uint8), arr))
+            arr = arr[len(arr) - length:]
+        arr.flags.writeable = False
+        return cls._wrap(arr)
+
+    # --- Views ---
+
+    @property
+    def array(self):
+        """Read-only uint8 view of the bits (0/1)."""
+        return self._bits
+
+    def as_int8(self):
+        """Read-only int8 view of the bits, sharing memory with the vector."""
+        return self._bits.view(np.int8)
+
+    def to_state(self):
+        """The +/-1 complex state used by the quantum evolution model (cached)."""
+        if self._state is None:
+            state = self._bits.astype(np.complex128) * 2 - 1
+            state.flags.writeable = False
+            self._state = state
+        return self._state
+
+    def packed(self):
+        """numpy.packbits form, padded with zeros at the end to a whole byte."""
+        if self._packed is None:
+            packed = np.packbits(self._bits)
+            packed.flags.writeable = False
+            self._packed = packed
+        return self._packed
+
+    def words(self):
+        """Packed bits as big-endian uint64 words, zero-padded at the end."""
+        packed = self.packed()
+        padded = np.zeros(-(-len(packed) // 8) * 8, dtype=np.uint8)
+        padded[:len(packed)] = packed
+        return padded.view('>u8')
+
+    # --- Conversions ---
+
+    def to_int(self):
+        """Integer value, matching int(str(self), 2)."""
+        if not len(self):
+            return 0
+        return int.from_bytes(self.to_bytes(), byteorder='big')
+
+    def to_bytes(self):
+        """Big-endian bytes of to_int(), left-padded to a whole byte."""
+        pad = -len(self) % 8
+        if pad:
+            return np.packbits(np.concatenate((np.zeros(pad, dtype=np.uint8), self._bits))).tobytes()
+        return self.packed().tobytes()
+
+    def __str__(self):
+        return (self._bits + ord('0')).tobytes().decode('ascii')
+
+    def __repr__(self):
+        text = str(self)
+        if len(text) > 48:
+            text = text[:45] + '...'
+        return f"BitVector('{text}', length={len(self)})"
+
+    # --- Operations ---
+
+    def popcount(self):
+        """Number of set bits."""
+        return int(np.count_nonzero(self._bits))
+
+    def rotate(self, k):
+        """Cyclic left rotation by k positions (negative k rotates right)."""
+        arr = np.roll(self._bits, -k)
+        arr.flags.writeable = False
+        return BitVector._wrap(arr)
+
+    def flip(self, positions):
+        """Copy of the vector with the bits at `positions` inverted, once per occurrence."""
+        arr = self._bits.copy()
+        np.bitwise_xor.at(arr, np.asarray(positions, dtype=np.intp), 1)
+        arr.flags.writeable = False
+        return BitVector._wrap(arr)
+
+    def tile(self, length):
+        """The vector repeated cyclically out to `length` bits."""
+        arr = np.resize(self._bits, length)
+        arr.flags.writeable = False
+        return BitVector._wrap(arr)
+
+    def __len__(self):
+        return len(self._bits)
+
+    def __iter__(self):
+        return iter(self._bits.tolist())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return BitVector._wrap(self._bits[index])
+        return int(self._bits[index])
+
+    def __xor__(self, other):
+        other = other if isinstance(other, BitVector) else BitVector(other)
+        if len(other) != len(self):
+            raise ValueError(f"Cannot XOR bit vectors of length {len(self)} and {len(other)}.")
+        arr = self._bits ^ other._bits
+        arr.flags.writeable = False
+        return BitVector._wrap(arr)
+
+    def __invert__(self):
+        arr = self._bits ^ 1
+        arr.flags.writeable = False
+        return BitVector._wrap(arr)
+
+    def __eq__(self, other):
+        if not isinstance(other, BitVector):
+            return NotImplemented
+        return np.array_equal(self._bits, other._bits)
+
+    def __hash__(self):
+        return hash((len(self), self._bits.tobytes()))
+
+    def __reduce__(self):
+        # Rebuild through the constructor so unpickled copies (e.g. from worker processes) stay read-only.
+        return (BitVector, (self._bits,))
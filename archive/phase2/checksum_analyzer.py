@@ -1,4 +1,7 @@
 import crcmod
+from collections import Counter
+
+from crc_search import CRC_WIDTHS, FRAMINGS, crc_search, word_sum_search
 
 # --- Constants ---
 BINARY_STRING = "110011111110011110001110111101111100011100100110001011000001100001110101110011011000111000000111001001101100100001001101001101111111111111000000011000101100000110011011100000111000101011111100110101100101111011101000101011001000001101111101110001110000010111001001111111101101111001011100111011111111"
@@ -76,6 +79,37 @@ def xor_sum_checksum(binary_data):
         print("Interpretation: 1868 is not a 16-bit XOR checksum. The chunk size or method could be different.")
     print("-" * 20)
 
+def exhaustive_checksum_search(binary_data):
+    """
+    Tries every CRC polynomial of widths 8-16 with init/xorout/reflection/framing
+    variants, and the sum, XOR, Fletcher and Adler families over 1-32 bit words.
+    """
+    print("\n--- Checksum Method 4: Exhaustive Search ---")
+
+    crc_matches = crc_search(binary_data, EXPECTED_CHECKSUM)
+    # Each polynomial is tried under 16 variants per framing, so a random message
+    # is expected to match that many polynomials of every wide-enough width by chance.
+    per_width = Counter(m['width'] for m in crc_matches)
+    expected = 16 * len(FRAMINGS)
+    for width in CRC_WIDTHS:
+        if EXPECTED_CHECKSUM < 1 << width:
+            print(f"CRC-{width}: {per_width[width]} parameter sets reproduce {EXPECTED_CHECKSUM} (about {expected} expected by chance).")
+    for m in crc_matches[:10]:
+        print(f"  -> CRC-{m['width']} poly={m['poly']} init={m['init']} xorout={m['xorout']} "
+              f"refin={m['refin']} refout={m['refout']} framing={m['framing']}")
+
+    word_matches = word_sum_search(binary_data, EXPECTED_CHECKSUM)
+    print(f"Word-sum families: {len(word_matches)} parameter sets reproduce {EXPECTED_CHECKSUM}.")
+    for m in word_matches:
+        print(f"  -> {m['family']} over {m['word_bits']}-bit words ({m['padding']})")
+
+    if word_matches:
+        print("Result: MATCH FOUND.")
+        print("Interpretation: A simple word-sum reproduces 1868. Check whether the word size is meaningful before reading it as a checksum.")
+    else:
+        print("Result: No word-sum match. CRC matches at the rate expected by chance are not evidence on their own.")
+    print("-" * 20)
+
 def main():
     """
     Runs all checksum analysis functions.
@@ -87,6 +121,7 @@ def main():
     simple_summation_checksum(BINARY_STRING)
     crc16_checksum(BINARY_STRING)
     xor_sum_checksum(BINARY_STRING)
+    exhaustive_checksum_search(BINARY_STRING)
 
 if __name__ == "__main__":
     # First, ensure the required libraries are installed.
@@ -1,3 +1,5 @@
+from motif_scanner import MotifScanner
+
 # --- Constants ---
 BINARY_STRING = "110011111110011110001110111101111100011100100110001011000001100001110101110011011000111000000111001001101100100001001101001101111111111111000000011000101100000110011011100000111000101011111100110101100101111011101000101011001000001101111101110001110000010111001001111111101101111001011100111011111111"
 
@@ -25,9 +27,10 @@ def search_for_formulas(binary_data):
     }
 
     # 2. Search for each pattern
+    # All patterns are matched in a single pass over the bits.
+    first_positions = MotifScanner(list(patterns.values())).first_positions(binary_data)
     found_match = False
-    for name, pattern in patterns.items():
-        index = binary_data.find(pattern)
+    for (name, pattern), index in zip(patterns.items(), first_positions.tolist()):
         print(f"\nSearching for: {name}")
         print(f"  - Combined Binary Pattern: {pattern}")
         if index != -1:
@@ -7,32 +7,34 @@ This script consolidates all analysis and reporting functionality into a single
 
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.fft import fft
-from gmpy2 import mpz
-from reedsolo import RSCodec
-import tensorflow as tf
-import requests
 import json
 import io
 import sys
-import random
 import os
 import math
-from collections import Counter
-from scipy.linalg import dft
 from PIL import Image
-import markdown
 import base64
+# TensorFlow, SciPy, reedsolo, requests and markdown are imported inside the
+# stages that use them so that loading this module (and runs that skip ML) stays fast.
 
 # Add the current directory to sys.path to allow relative imports when run as a script.
-import sys
-import os
 sys.path.append(os.path.dirname(__file__))
 
 # Import constants from the constants module to centralize configuration values.
 import constants
 # Import image slicing functions from the image_slicer module to modularize image processing.
 import image_slicer
+# Import the FFT-based evolution engine shared with the command analysis scripts.
+import quantum_evolution
+# Import the packed bit-vector type shared by all analysis stages.
+from bitvector import BitVector
+# Import the n-gram engine used by the cryptanalysis stage.
+import ngram_engine
+# Import the stage scheduler and the on-disk cache that let reruns skip unchanged stages.
+from stage_registry import StageRegistry, StageFailed
+from artifact_cache import ArtifactCache
+# Import the deterministic primality test shared by all analyzers.
+from primality import is_prime
 
 # --- Create Output Directory ---
 # The output directory path is now retrieved from the constants module.
@@ -72,7 +74,7 @@ def analyze_as_image(binary_string, width, height, title):
         print(f"Error: Binary string length ({len(binary_string)}) does not match image dimensions ({width*height}).")
         return None
     try:
-        pixels = np.array([int(bit) for bit in binary_string])
+        pixels = BitVector(binary_string).array
         image_grid = pixels.reshape((height, width))
         plt.figure(figsize=(8, 8 * (height/width)))
         plt.imshow(image_grid, cmap='gray_r', interpolation='nearest')
@@ -87,14 +89,14 @@ def analyze_as_image(binary_string, width, height, title):
         return path
     except Exception as e:
         print(f"An error occurred during image generation: {e}")
-        return None
+        raise StageFailed(str(e)) from e
 
 def analyze_as_timeseries(binary_string):
     """Plots the binary string as a simple time-series signal and returns the file path."""
     print("\n[ANALYSIS] Generating time-series plot...")
     print("Methodology: The binary string is plotted as a sequence of 0s and 1s over time to analyze its temporal characteristics.")
     try:
-        signal = np.array([int(bit) for bit in binary_string])
+        signal = BitVector(binary_string).array
         plt.figure(figsize=(15, 5))
         plt.step(range(len(signal)), signal, where='mid')
         plt.title("Hypothesis: Time-Series Signal")
@@ -109,7 +111,7 @@ def analyze_as_timeseries(binary_string):
         return path
     except Exception as e:
         print(f"An error occurred during time-series plot generation: {e}")
-        return None
+        raise StageFailed(str(e)) from e
 
 def analyze_with_fft(binary_string):
     """Performs a Fast Fourier Transform on the signal and returns the file path."""
@@ -117,7 +119,8 @@ def analyze_with_fft(binary_string):
     print("Methodology: The FFT is used to decompose the time-series signal into its constituent frequencies. This can reveal periodicities or hidden structures in the frequency domain.")
     print("Equation: X[k] = sum(x[n] * exp(-2j * pi * k * n / N)) for n=0 to N-1")
     try:
-        signal = np.array([int(bit) for bit in binary_string])
+        from scipy.fft import fft
+        signal = BitVector(binary_string).array
         fft_result = fft(signal)
         frequencies = np.fft.fftfreq(len(signal))
         positive_freq_indices = frequencies > 0
@@ -134,42 +137,17 @@ def analyze_with_fft(binary_string):
         return path
     except Exception as e:
         print(f"An error occurred during FFT analysis: {e}")
-        return None
-
-def miller_rabin(n, k=5):
-    if n < 2:
-        return False
-    for p in [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]:
-        if n < p * p:
-            return True
-        if n % p == 0:
-            return False
-    r, s = 0, n - 1
-    while s % 2 == 0:
-        r += 1
-        s //= 2
-    for _ in range(k):
-        a = random.randint(2, n - 1)
-        x = pow(a, s, n)
-        if x == 1 or x == n - 1:
-            continue
-        for _ in range(r - 1):
-            x = (x * x) % n
-            if x == n - 1:
-                break
-        else:
-            return False
-    return True
+        raise StageFailed(str(e)) from e
 
 def analyze_as_integer(binary_string):
     """Treats the binary string as a large integer and checks for primality."""
     print("\n[ANALYSIS] Analyzing as a single large integer...")
     print("Methodology: The 300-bit binary string is converted to a single large integer to test for primality. Prime numbers have unique mathematical properties and are often used in cryptography.")
     try:
-        large_integer = int(binary_string, 2)
+        large_integer = BitVector(binary_string).to_int()
         print(f" -> Decimal Value: {large_integer}")
-        print(" -> Checking for primality using Miller-Rabin test...")
-        is_prime_result = miller_rabin(large_integer)
+        print(" -> Checking for primality (deterministic Miller-Rabin / Baillie-PSW)...")
+        is_prime_result = is_prime(large_integer)
         if is_prime_result:
             print("\n*** MAJOR FINDING: The integer representation of the message is likely a PRIME NUMBER. ***")
         else:
@@ -177,17 +155,16 @@ def analyze_as_integer(binary_string):
         return is_prime_result
     except Exception as e:
         print(f"An error occurred during integer analysis: {e}")
-        return None
+        raise StageFailed(str(e)) from e
 
 def analyze_cryptography(binary_string):
     """Performs basic cryptanalysis on the binary string."""
     print("\n[ANALYSIS] Performing cryptanalysis...")
     print("Methodology: N-gram analysis is used to identify the frequency of short sequences of bits (bigrams and trigrams). Non-random data often exhibits patterns in n-gram frequencies.")
     try:
-        bigrams = [binary_string[i:i+2] for i in range(len(binary_string)-1)]
-        trigrams = [binary_string[i:i+3] for i in range(len(binary_string)-2)]
-        bigram_counts = {gram: bigrams.count(gram) for gram in set(bigrams)}
-        trigram_counts = {gram: trigrams.count(gram) for gram in set(trigrams)}
+        grams = ngram_engine.ngram_counts(binary_string, 3, min_n=2)
+        bigram_counts = {ngram_engine.gram(code, 2): int(count) for code, count in zip(*grams[2])}
+        trigram_counts = {ngram_engine.gram(code, 3): int(count) for code, count in zip(*grams[3])}
         
         print(" -> Bigram Frequencies:")
         for gram, count in sorted(bigram_counts.items()):
@@ -195,18 +172,23 @@ def analyze_cryptography(binary_string):
         print(" -> Trigram Frequencies:")
         for gram, count in sorted(trigram_counts.items()):
             print(f"    {gram}: {count}")
+        print(f" -> N-gram statistics against a uniform source (n=1..{constants.NGRAM_MAX_N}):")
+        for line in ngram_engine.format_statistics(ngram_engine.ngram_statistics(binary_string, constants.NGRAM_MAX_N)):
+            print(line)
             
     except Exception as e:
         print(f"An error occurred during cryptanalysis: {e}")
+        raise StageFailed(str(e)) from e
 
 def analyze_ecc(binary_string):
     """Investigates the potential application of Reed-Solomon codes."""
     print("\n[ANALYSIS] Investigating Error-Correcting Codes (ECCs)...")
     print("Methodology: This is a conceptual test to see if the signal could be a message encoded with a Reed-Solomon error-correcting code. A full analysis would require knowledge of the code's parameters.")
     try:
+        from reedsolo import RSCodec
         # Conceptual: we don't know the parameters, but we can try a common one
         # The binary string needs to be converted to bytes
-        byte_string = int(binary_string, 2).to_bytes((len(binary_string) + 7) // 8, byteorder='big')
+        byte_string = BitVector(binary_string).to_bytes()
         rsc = RSCodec(10) # 10 error correction symbols
         encoded = rsc.encode(byte_string)
         # Tamper with the message
@@ -216,13 +198,15 @@ def analyze_ecc(binary_string):
         print(" -> Conceptual Reed-Solomon decoding demonstration successful.")
     except Exception as e:
         print(f" -> Conceptual Reed-Solomon decoding failed: {e}")
+        raise StageFailed(str(e)) from e
 
 def analyze_with_ml(binary_string):
     """Demonstrates a machine learning approach for pattern recognition."""
     print("\n[ANALYSIS] Applying Machine Learning for Pattern Recognition...")
     print("Methodology: A simple neural network is used to demonstrate how machine learning could be applied to find patterns in the binary data. This is a conceptual demonstration and would require a proper training dataset for a real analysis.")
     try:
-        signal = np.array([int(bit) for bit in binary_string])
+        import tensorflow as tf
+        signal = BitVector(binary_string).array
         # Reshape for a simple model
         data = signal.reshape(1, -1)
         
@@ -241,23 +225,26 @@ def analyze_with_ml(binary_string):
         print(f" -> Conceptual prediction for the signal: {prediction}")
     except Exception as e:
         print(f"An error occurred during ML analysis: {e}")
+        raise StageFailed(str(e)) from e
 
 def analyze_signal_processing(binary_string):
     """Applies a low-pass filter to the binary data."""
     print("\n[ANALYSIS] Applying signal processing techniques...")
     print("Methodology: A simple low-pass filter (convolution) is applied to the binary signal to smooth it and potentially reveal underlying trends.")
     try:
-        binary_data = np.array([int(bit) for bit in binary_string])
+        binary_data = BitVector(binary_string).array
         filtered_data = np.convolve(binary_data, [1, 2, 3], mode='same')
         print(" -> Low-pass filter applied successfully.")
         print(f" -> Filtered data: {filtered_data}")
     except Exception as e:
         print(f"An error occurred during signal processing analysis: {e}")
+        raise StageFailed(str(e)) from e
 
 def analyze_5bit_chunks(binary_string):
     """Analyzes the binary string by splitting it into 5-bit chunks."""
     print("\n[ANALYSIS] Analyzing 5-bit chunks...")
     print("Methodology: The 300-bit binary string is split into 5-bit chunks to check for patterns. The sequence '11111' is noted as a potential spacer or break.")
+    binary_string = str(BitVector(binary_string))
     chunks = [binary_string[i:i+5] for i in range(0, len(binary_string), 5)]
     chunk_analysis_output_lines = []
     for chunk in chunks:
@@ -269,7 +256,15 @@ def analyze_5bit_chunks(binary_string):
         chunk_analysis_output_lines.append(line)
     return "\n".join(chunk_analysis_output_lines)
 
-def new_analysis_pipeline():
+def derive_base72_message():
+    """The candidate string read as a Base-72 number, as analyzed by new_analysis_pipeline."""
+    return BitVector.from_int(sequence_to_decimal(constants.WOW_ALPHANUMERIC, constants.TIME_STEPS))
+
+def evolve_message(message):
+    """States after 1..TIME_STEPS QFT steps; row t holds the state after t+1 steps."""
+    return quantum_evolution.evolve_states(message.to_state(), constants.TIME_STEPS, constants.FREQUENCY_OFFSET_KEY, constants.TIME_STEPS)[1:]
+
+def new_analysis_pipeline(message, states):
     print("="*60)
     # Use constants for the candidate string for consistency.
     print(f"--- LAUNCHING COMPREHENSIVE ANALYSIS OF CANDIDATE: {constants.WOW_ALPHANUMERIC} ---")
@@ -278,20 +273,18 @@ def new_analysis_pipeline():
     # 1. DERIVE THE NEW BINARY STRING
     print("\n--- Step 1: Deriving Binary String from Base-72 Conversion ---")
     print("Methodology: The candidate string 'HEQUJ5' is treated as a number in Base-72 and converted to a binary string for analysis.")
-    # Use constants for the alphanumeric string and time steps.
-    decimal_val = sequence_to_decimal(constants.WOW_ALPHANUMERIC, constants.TIME_STEPS)
-    binary_str = bin(decimal_val)[2:]
+    decimal_val = message.to_int()
+    binary_str = str(message)
     print(f"'{constants.WOW_ALPHANUMERIC}' (Base-72) = {decimal_val}")
     print(f"Resulting Binary String ({len(binary_str)} bits): {binary_str}")
 
     # 2. STATISTICAL ANALYSIS
     print("\n--- Step 2: Statistical Analysis ---")
     print("Methodology: Basic statistical properties of the binary string are calculated, including the percentage of 1s and the Shannon entropy, which measures the randomness of the data.")
-    length = len(binary_str)
-    counts = Counter(binary_str)
-    ones = counts.get('1', 0)
+    length = len(message)
+    ones = message.popcount()
     one_percentage = ones / length
-    entropy = -sum((c/length) * math.log2(c/length) for c in counts.values())
+    entropy = -sum((c/length) * math.log2(c/length) for c in (ones, length - ones) if c)
     print(f"1s Percentage: {one_percentage:.2%}")
     print(f"Shannon Entropy: {entropy:.4f} (1.0 = max randomness)")
 
@@ -299,15 +292,15 @@ def new_analysis_pipeline():
     print("\n--- Step 3: Generating Geometric Visualizations ---")
     print("Methodology: The binary string is visualized in different geometric forms to search for patterns.")
     # Bitmap (padded to 6x6)
-    padded_str = binary_str.zfill(36) # Pad with leading zeros
-    pixel_data = np.array([int(bit) for bit in padded_str]).reshape((6, 6))
+    padded = BitVector.from_int(decimal_val, max(len(message), 36)) # Pad with leading zeros
+    pixel_data = padded.array.reshape((6, 6))
     plt.figure(figsize=(4, 4)); plt.imshow(pixel_data, cmap='gray_r', interpolation='nearest'); plt.title("6x6 Bitmap"); plt.xticks([]); plt.yticks([])
     # Use constants for the output directory.
     plt.savefig(os.path.join(constants.OUTPUT_DIR, "final_bitmap.png")); plt.close()
     print("  - Saved: final_bitmap.png")
 
     # Spherical Map
-    bits = np.array([int(bit) for bit in binary_str])
+    bits = message.array
     indices = np.arange(0, len(bits), dtype=float) + 0.5
     phi = np.arccos(1 - 2*indices/len(bits)); theta = np.pi * (1 + 5**0.5) * indices
     x, y, z = np.cos(theta)*np.sin(phi), np.sin(theta)*np.sin(phi), np.cos(phi)
@@ -323,16 +316,11 @@ def new_analysis_pipeline():
     # 4. QUANTUM EVOLUTION MODEL
     print("\n--- Step 4: Running Quantum Evolution Model ---")
     print("Methodology: The binary string is treated as the initial state of a quantum system, which is then evolved over time using a Quantum Fourier Transform (QFT). This can reveal complex, dynamic patterns.")
-    initial_state = np.array([int(bit)*2-1 for bit in binary_str], dtype=np.complex128)
-    n = len(initial_state)
-    qft_matrix = dft(n, scale='sqrtn')
+    n = states.shape[1]
     fig, ax = plt.subplots(figsize=(12, 12), subplot_kw={'projection': 'polar'})
-    current_state = initial_state
-    # Use constants for TIME_STEPS and FREQUENCY_OFFSET_KEY.
+    # Use constants for TIME_STEPS.
     for t in range(constants.TIME_STEPS):
-        evolved_state = np.dot(qft_matrix, current_state)
-        phase_shift = np.exp(1j * 2 * np.pi * constants.FREQUENCY_OFFSET_KEY * t / (constants.TIME_STEPS * 1e6))
-        current_state = evolved_state * phase_shift
+        current_state = states[t]
         theta = np.linspace(0, 2*np.pi, n, endpoint=False)
         radius = 1 + (t * 0.05)
         amplitudes = np.abs(current_state); phases = np.angle(current_state)
@@ -348,15 +336,8 @@ def new_analysis_pipeline():
     plt.savefig(os.path.join(constants.OUTPUT_DIR, "final_quantum_evolution.png")); plt.close()
     print("  - Saved: final_quantum_evolution.png")
 
-def model_system_physics():
-    """
-    Models the physics of the dynamic system to determine its nature.
-    """
-    print("="*60)
-    print("--- Phase 2: Theoretical Physics Modeling ---")
-    print("Methodology: This analysis treats the evolving data points from the quantum model as physical objects and calculates their velocity, acceleration, and kinetic energy. This can help determine if the system is open or closed.")
-
-    # 1. Re-derive the binary string from the Base-72 conversion of HEQUJ5
+def derive_physics_message():
+    """Re-derives the binary string from the Base-72 conversion of HEQUJ5 used by the physics model."""
     base72_decimal = 0
     power = len(constants.WOW_ALPHANUMERIC) - 1
     for digit in constants.WOW_ALPHANUMERIC:
@@ -364,25 +345,28 @@ def model_system_physics():
         if '0' <= digit <= '9': val = int(digit)
         else: val = 10 + (ord(digit) - ord('A'))
         base72_decimal += val * (72 ** power)
-   
-    binary_str = bin(base72_decimal)[2:]
-   
-    # 2. Run the quantum evolution to extract trajectory data in Cartesian (x, y) coordinates
-    initial_state = np.array([int(bit) * 2 - 1 for bit in binary_str], dtype=np.complex128)
-    n = len(initial_state)
-    qft_matrix = dft(n, scale='sqrtn')
+    return BitVector.from_int(base72_decimal)
+
+def model_system_physics(states):
+    """
+    Models the physics of the dynamic system to determine its nature.
+    `states` is the quantum evolution of the physics message (see derive_physics_message).
+    """
+    print("="*60)
+    print("--- Phase 2: Theoretical Physics Modeling ---")
+    print("Methodology: This analysis treats the evolving data points from the quantum model as physical objects and calculates their velocity, acceleration, and kinetic energy. This can help determine if the system is open or closed.")
+
+    # 1. Use the quantum evolution to extract trajectory data in Cartesian (x, y) coordinates
+    n = states.shape[1]
    
     # Store trajectories as a list of (x, y) coordinates
     # Use constants for NUM_CLUSTERS_TO_TRACK.
     trajectories_cartesian = [[] for _ in range(constants.NUM_CLUSTERS_TO_TRACK)]
-    current_state = initial_state
    
     print("Extracting Cartesian (x,y) trajectory data over 72 timesteps...")
-    # Use constants for TIME_STEPS and FREQUENCY_OFFSET_KEY.
+    # Use constants for TIME_STEPS.
     for t in range(constants.TIME_STEPS):
-        evolved_state = np.dot(qft_matrix, current_state)
-        phase_shift = np.exp(1j * 2 * np.pi * constants.FREQUENCY_OFFSET_KEY * t / (constants.TIME_STEPS * 1e6))
-        current_state = evolved_state * phase_shift
+        current_state = states[t]
        
         amplitudes = np.abs(current_state)
         # Use constants for NUM_CLUSTERS_TO_TRACK.
@@ -395,7 +379,7 @@ def model_system_physics():
             x, y = radius * np.cos(theta), radius * np.sin(theta)
             trajectories_cartesian[i].append((x, y))
 
-    # 3. Calculate Physics: Velocity, Acceleration, and Force
+    # 2. Calculate Physics: Velocity, Acceleration, and Force
     print("Calculating velocity, acceleration, and force vectors...")
     # Assume timestep dt=1 and mass m=1 for this model
     force_vectors = []
@@ -429,7 +413,7 @@ def model_system_physics():
         force_vectors.append(forces_at_t)
         total_kinetic_energy_over_time.append(kinetic_energy_at_t)
 
-    # 4. Visualize the Physics
+    # 3. Visualize the Physics
     print("Generating physics plots...")
    
     # Plot 1: Force Vectors on the Trajectories
@@ -464,7 +448,7 @@ def model_system_physics():
     plt.savefig(filepath2); plt.close()
     print(f"  - Saved plot: analysis_kinetic_energy.png")
 
-    # 5. Formulate Archival Search Query
+    # 4. Formulate Archival Search Query
     energy_change = total_kinetic_energy_over_time[-1] - total_kinetic_energy_over_time[0]
     print("\n" + "="*60)
     print("--- Phase 2: Archival Search Formulation ---")
@@ -479,6 +463,11 @@ def model_system_physics():
 
 # --- LLM Integration ---
 def ask_llama(analysis_summary, binary_string, five_bit_chunk_analysis):
+    try:
+        import requests
+    except ImportError:
+        print("\nrequests is not installed, skipping the Llama analysis. Please install it using: pip install requests")
+        return
     print("\n--- Contacting Llama instance for analysis ---")
     
     prompt = f"""
@@ -534,10 +523,59 @@ def ask_llama(analysis_summary, binary_string, five_bit_chunk_analysis):
     except requests.exceptions.RequestException as e:
         print(f"\nError contacting Llama instance: {e}")
 
+# --- Stage Registry ---
+def build_registry(skip_ml=False):
+    """
+    Declares every analysis stage with the named values it consumes and produces.
+    Stages that return an image path publish it as an output for the HTML report,
+    and `artifacts` lists the files each stage writes for the artifact cache.
+    """
+    out = lambda name: os.path.join(constants.OUTPUT_DIR, name)
+    registry = StageRegistry()
+    registry.add("image_20x15", analyze_as_image, inputs=["message"], outputs=["image_20x15_path"],
+                 args=(20, 15, "20x15 Orientation"), artifacts=["image_20x15_Orientation.png"])
+    registry.add("image_15x20", analyze_as_image, inputs=["message"], outputs=["image_15x20_path"],
+                 args=(15, 20, "15x20 Orientation"), artifacts=["image_15x20_Orientation.png"])
+    # This one fails, so its path is not added to the report.
+    registry.add("image_34x34", analyze_as_image, inputs=["message"], args=(34, 34, "34x34 Orientation"))
+    registry.add("timeseries", analyze_as_timeseries, inputs=["message"], outputs=["timeseries_path"],
+                 artifacts=["timeseries_plot.png"])
+    registry.add("fft", analyze_with_fft, inputs=["message"], outputs=["fft_path"], artifacts=["fft_plot.png"])
+    registry.add("integer", analyze_as_integer, inputs=["message"], outputs=["is_prime"])
+    registry.add("cryptography", analyze_cryptography, inputs=["message"], artifacts=["ngram_frequencies.png"])
+    registry.add("ecc", analyze_ecc, inputs=["message"])
+    if not skip_ml:
+        # Training is not seeded, so every run gets a fresh model.
+        registry.add("ml", analyze_with_ml, inputs=["message"], cacheable=False)
+    registry.add("signal_processing", analyze_signal_processing, inputs=["message"])
+    registry.add("five_bit_chunks", analyze_5bit_chunks, inputs=["message"], outputs=["five_bit_chunk_analysis"])
+    registry.add("layered_images", image_slicer.analyze_layered_images, inputs=["message"], outputs=["layer_paths"],
+                 args=(3, constants.OUTPUT_DIR), artifacts=[out(f"layer_{i + 1}.png") for i in range(3)] + [out("composite_image.png")])
+    registry.add("parity_layers", image_slicer.analyze_parity_layers, inputs=["message"], outputs=["parity_paths"],
+                 args=(constants.OUTPUT_DIR,),
+                 artifacts=[out(f"{kind}_parity_layer.png") for kind in ("even_row", "odd_row", "even_col", "odd_col")])
+    # The error position is drawn at random on every run, so the demonstration is never cached.
+    registry.add("hamming", image_slicer.analyze_with_hamming_code, inputs=["message"], outputs=["hamming_paths"],
+                 args=(20, 15, constants.OUTPUT_DIR), cacheable=False)
+    registry.add("base72_message", derive_base72_message, outputs=["base72_message"], inline=True)
+    registry.add("base72_evolution", evolve_message, inputs=["base72_message"], outputs=["base72_states"], inline=True)
+    registry.add("new_analysis_pipeline", new_analysis_pipeline, inputs=["base72_message", "base72_states"],
+                 artifacts=[out("final_bitmap.png"), out("final_sphere_map.png"), out("final_quantum_evolution.png")])
+    registry.add("physics_message", derive_physics_message, outputs=["physics_message"], inline=True)
+    registry.add("physics_evolution", evolve_message, inputs=["physics_message"], outputs=["physics_states"], inline=True)
+    registry.add("physics", model_system_physics, inputs=["physics_states"],
+                 artifacts=[out("analysis_force_vectors.png"), out("analysis_kinetic_energy.png")])
+    return registry
+
 # --- Main Execution ---
-def main():
+def main(skip_ml=False, max_workers=None, use_cache=True):
     """
     Runs the full decryption and analysis pipeline.
+    Pass skip_ml=True (or --skip-ml on the command line) to leave out the
+    TensorFlow stage, so the run never loads TensorFlow.
+    Independent stages run in parallel on up to `max_workers` processes
+    (--workers N on the command line). Unchanged stages are restored from the
+    artifact cache unless use_cache=False (--no-cache).
     """
     # Capture original stdout
     original_stdout = sys.stdout
@@ -572,7 +610,8 @@ def main():
         print("ERROR: Final conversion failed unexpectedly.")
         return
    
-    final_binary_message = bin(final_decimal)[2:]
+    final_message = BitVector.from_int(final_decimal)
+    final_binary_message = str(final_message)
     print(f" -> Final Binary Message Generated ({len(final_binary_message)} bits):\n{final_binary_message}")
 
     # --- STAGE 2: ANALYSIS ---
@@ -580,29 +619,14 @@ def main():
     print("      STARTING ANALYSIS OF DECRYPTED MESSAGE")
     print("="*70)
     
-    image_paths = []
-   
-    image_paths.append(analyze_as_image(final_binary_message, 20, 15, "20x15 Orientation"))
-    image_paths.append(analyze_as_image(final_binary_message, 15, 20, "15x20 Orientation"))
-    analyze_as_image(final_binary_message, 34, 34, "34x34 Orientation") # This one fails, so we don't add it
-    image_paths.append(analyze_as_timeseries(final_binary_message))
-    image_paths.append(analyze_with_fft(final_binary_message))
-    is_prime = analyze_as_integer(final_binary_message)
-    analyze_cryptography(final_binary_message)
-    analyze_ecc(final_binary_message)
-    analyze_with_ml(final_binary_message)
-    analyze_signal_processing(final_binary_message)
-    five_bit_chunk_analysis = analyze_5bit_chunks(final_binary_message)
-    image_paths.extend(image_slicer.analyze_layered_images(final_binary_message, 3, constants.OUTPUT_DIR))
-    image_paths.extend(image_slicer.analyze_parity_layers(final_binary_message, constants.OUTPUT_DIR))
-    hamming_paths = image_slicer.analyze_with_hamming_code(final_binary_message, 20, 15, constants.OUTPUT_DIR)
-    image_paths.extend(hamming_paths.values())
-    
-    # Run new analysis pipeline
-    new_analysis_pipeline()
-    
-    # Run physics model
-    model_system_physics()
+    # Stage output is replayed in registration order, so the log reads as a sequential run.
+    cache = ArtifactCache() if use_cache else None
+    results = build_registry(skip_ml).run({"message": final_message}, max_workers=max_workers, cache=cache)
+    image_paths = [results.get(name) for name in ("image_20x15_path", "image_15x20_path", "timeseries_path", "fft_path")]
+    image_paths.extend(results.get("layer_paths", []))
+    image_paths.extend(results.get("parity_paths", []))
+    image_paths.extend(results.get("hamming_paths", {}).values())
+    five_bit_chunk_analysis = results.get("five_bit_chunk_analysis", "")
    
     print("\n" + "="*70)
     print("--- ALL ANALYSES COMPLETE ---")
@@ -623,6 +647,7 @@ def main():
     print("      GENERATING COMPREHENSIVE HTML REPORT")
     print("="*70)
     try:
+        import markdown
         # Convert the captured analysis summary (which is plain text/markdown-like) to HTML
         html_summary = markdown.markdown(analysis_summary)
         
@@ -683,4 +708,6 @@ def main():
         print(f"An error occurred during HTML report generation: {e}")
 
 if __name__ == "__main__":
-    main()
+    args = sys.argv[1:]
+    workers = int(args[args.index("--workers") + 1]) if "--workers" in args else None
+    main(skip_ml="--skip-ml" in args, max_workers=workers, use_cache="--no-cache" not in args)
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Constant Matcher
+---------------------------------------------------
+Matches many numbers against a large table of mathematical and physical
+constants in one vectorized call, instead of comparing each ratio with a
+few hard-coded values.
+
+The table holds every base constant under a set of simple transforms
+(x, 1/x, x^2, sqrt(x), 2x, x/2). It is indexed by log10 of the absolute
+value and sorted. A query q matches a constant c within relative tolerance
+t when |q - c| <= t * |c|. That window lies inside
+|log q - log c| <= -log(1 - t), so two np.searchsorted calls find the
+candidates of every query at once and an exact check keeps the real
+matches.
+
+Significance: around a query the table has some density rho of constants
+per decade. A log-uniform random number then hits one of them by chance
+with probability p = 1 - exp(-2 * w * rho), where w is the half-width of
+the tolerance window in decades. `p_any` corrects p for the number of
+queries in the call (the look-elsewhere effect).
+
+The sources are the adjacent token ratios of any set of widths and
+offsets, and the fixed-point value of the stream at every split point
+between integer and fraction bits. Each match also reports the continued
+fraction of the query and the convergents of the constant, so it shows
+whether a ratio a/b is a best rational approximation such as 22/7 or
+355/113.
+"""
+
+import math
+from fractions import Fraction
+
+import numpy as np
+
+from bitvector import BitVector
+
+# name: value. Dimensionless constants, and SI values for the physical ones.
+CONSTANTS = {
+    'PI': math.pi,
+    'E': math.e,
+    'GOLDEN_RATIO': (1 + math.sqrt(5)) / 2,
+    'SQRT2': math.sqrt(2),
+    'SQRT3': math.sqrt(3),
+    'SQRT5': math.sqrt(5),
+    'LN2': math.log(2),
+    'LN10': math.log(10),
+    'LOG10_2': math.log10(2),
+    'EULER_GAMMA': 0.5772156649015329,
+    'CATALAN': 0.915965594177219,
+    'APERY_ZETA3': 1.2020569031595942,
+    'ZETA2': math.pi ** 2 / 6,
+    'SILVER_RATIO': 1 + math.sqrt(2),
+    'PLASTIC_NUMBER': 1.3247179572447460,
+    'FEIGENBAUM_DELTA': 4.66920160910299,
+    'FEIGENBAUM_ALPHA': 2.502907875095893,
+    'KHINCHIN': 2.6854520010653064,
+    'GLAISHER': 1.2824271291006226,
+    'E_TO_PI': math.e ** math.pi,
+    'PI_TO_E': math.pi ** math.e,
+    'FINE_STRUCTURE': 7.2973525693e-3,
+    'PROTON_ELECTRON_MASS_RATIO': 1836.15267343,
+    'NEUTRON_PROTON_MASS_RATIO': 1.00137841931,
+    'SPEED_OF_LIGHT': 299792458.0,
+    'PLANCK': 6.62607015e-34,
+    'REDUCED_PLANCK': 1.054571817e-34,
+    'GRAVITATIONAL': 6.67430e-11,
+    'BOLTZMANN': 1.380649e-23,
+    'AVOGADRO': 6.02214076e23,
+    'ELEMENTARY_CHARGE': 1.602176634e-19,
+    'ELECTRON_MASS': 9.1093837015e-31,
+    'PROTON_MASS': 1.67262192369e-27,
+    'RYDBERG': 10973731.568160,
+    'BOHR_RADIUS': 5.29177210903e-11,
+    'STEFAN_BOLTZMANN': 5.670374419e-8,
+    'WIEN_DISPLACEMENT': 2.897771955e-3,
+    'GAS_CONSTANT': 8.314462618,
+    'HYDROGEN_LINE_MHZ': 1420.405751768,
+    'HYDROGEN_LINE_CM': 21.10611405416,
+    'WOW_FREQUENCY_MHZ': 1420.4556,
+    'SIDEREAL_DAY_HOURS': 23.9344696,
+    'TROPICAL_YEAR_DAYS': 365.24219,
+    'ASTRONOMICAL_UNIT': 1.495978707e11,
+    'LIGHT_YEAR': 9.4607304725808e15,
+    'PARSEC': 3.0856775814913673e16,
+}
+
+# suffix: (function, label format)
+TRANSFORMS = {
+    '': (lambda x: x, '{}'),
+    'INV': (lambda x: 1 / x, '1/{}'),
+    'SQ': (lambda x: x * x, '{}^2'),
+    'SQRT': (math.sqrt, 'sqrt({})'),
+    'X2': (lambda x: 2 * x, '2*{}'),
+    'HALF': (lambda x: x / 2, '{}/2'),
+}
+
+# Only denominators up to this bound are listed among the convergents of a constant.
+MAX_CONVERGENT_DENOMINATOR = 10 ** 6
+
+
+def continued_fraction(numerator, denominator, max_terms=32):
+    """Continued-fraction terms [a0; a1, a2, ...] of numerator / denominator (exact, by Euclid)."""
+    terms = []
+    while denominator and len(terms) < max_terms:
+        q, r = divmod(numerator, denominator)
+        terms.append(q)
+        numerator, denominator = denominator, r
+    return terms
+
+def convergents(terms):
+    """The convergents p/q of a continued fraction, as Fractions."""
+    h0, h1, k0, k1 = 0, 1, 1, 0
+    result = []
+    for a in terms:
+        h0, h1 = h1, a * h1 + h0
+        k0, k1 = k1, a * k1 + k0
+        result.append(Fraction(h1, k1))
+    return result
+
+def constant_convergents(value, max_denominator=MAX_CONVERGENT_DENOMINATOR):
+    """Convergents of a float constant with denominators up to max_denominator."""
+    exact = Fraction(value)
+    terms = continued_fraction(exact.numerator, exact.denominator)
+    return [c for c in convergents(terms) if c.denominator <= max_denominator]
+
+def _is_simple_rational(value, max_denominator=100):
+    approx = Fraction(value).limit_denominator(max_denominator)
+    return abs(value - approx) <= 1e-12 * abs(value)
+
+
+class ConstantTable:
+    """Constants under every transform, sorted by log10 of their absolute value."""
+
+    def __init__(self, constants=CONSTANTS, transforms=TRANSFORMS):
+        names, values, bases = [], [], []
+        seen = set()
+        for base, value in constants.items():
+            for suffix, (fn, label) in transforms.items():
+                v = fn(value)
+                # Skip transforms that collapse to a simple rational (sqrt(2)^2 = 2) or repeat
+                # an earlier entry (2 * sqrt(2)/2); a base constant itself is always kept.
+                key = float(f'{v:.12g}')
+                if suffix and (key in seen or _is_simple_rational(v)):
+                    continue
+                seen.add(key)
+                names.append(label.format(base) if suffix else base)
+                values.append(v)
+                bases.append(base)
+        values = np.array(values, dtype=float)
+        order = np.argsort(np.log10(np.abs(values)), kind='stable')
+        self.names = [names[i] for i in order]
+        self.bases = [bases[i] for i in order]
+        self.values = values[order]
+        self.log_values = np.log10(np.abs(self.values))
+        # Position in insertion order, so that ties are reported in table order.
+        self.rank = order
+
+    def __len__(self):
+        return len(self.values)
+
+    def density(self, log_queries, decades=1.0):
+        """Number of table constants per decade around each query."""
+        lo = np.searchsorted(self.log_values, log_queries - decades / 2, 'left')
+        hi = np.searchsorted(self.log_values, log_queries + decades / 2, 'right')
+        return (hi - lo) / decades
+
+    def match(self, queries, tolerance=1e-3):
+        """
+        Every (query, constant) pair with |query - constant| <= tolerance * |constant|.
+        Returns parallel arrays (query_index, table_index, rel_error, p_chance), sorted
+        by query and then table order. Zero and non-finite queries never match.
+        """
+        queries = np.asarray(queries, dtype=float)
+        usable = np.isfinite(queries) & (queries != 0)
+        log_queries = np.full(queries.shape, np.nan)
+        log_queries[usable] = np.log10(np.abs(queries[usable]))
+        # Slightly wider than the exact window, so the exact check below decides.
+        width = -math.log10(1 - tolerance) * 1.01 if tolerance < 1 else np.inf
+        candidates = np.where(usable)[0]
+        lo = np.searchsorted(self.log_values, log_queries[candidates] - width, 'left')
+        hi = np.searchsorted(self.log_values, log_queries[candidates] + width, 'right')
+        counts = hi - lo
+        query_index = np.repeat(candidates, counts)
+        table_index = np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        rel_error = np.abs(queries[query_index] - self.values[table_index]) / np.abs(self.values[table_index])
+        keep = rel_error <= tolerance
+        query_index, table_index, rel_error = query_index[keep], table_index[keep], rel_error[keep]
+        order = np.lexsort((self.rank[table_index], query_index))
+        query_index, table_index, rel_error = query_index[order], table_index[order], rel_error[order]
+        half_width = (math.log10(1 + tolerance) - math.log10(1 - tolerance)) / 2 if tolerance < 1 else np.inf
+        p_chance = 1 - np.exp(-2 * half_width * self.density(log_queries[query_index]))
+        return query_index, table_index, rel_error, p_chance
+
+    def report(self, queries, tolerance=1e-3, fractions=None, labels=None):
+        """
+        Match dicts for every hit: query, constant, value, rel_error, p_chance and
+        p_any (corrected for the number of queries), plus continued-fraction details.
+        fractions[i] = (numerator, denominator) makes query i an exact ratio; labels[i]
+        is merged into its dict (e.g. the width, offset and token of a ratio).
+        """
+        queries = np.asarray(queries, dtype=float)
+        query_index, table_index, rel_error, p_chance = self.match(queries, tolerance)
+        trials = int(np.count_nonzero(np.isfinite(queries) & (queries != 0)))
+        results = []
+        for qi, ti, err, p in zip(query_index.tolist(), table_index.tolist(), rel_error.tolist(), p_chance.tolist()):
+            value = float(self.values[ti])
+            hit = {
+                'query': float(queries[qi]),
+                'constant': self.names[ti],
+                'value': value,
+                'rel_error': err,
+                'p_chance': p,
+                'p_any': 1 - (1 - p) ** trials,
+            }
+            reference = constant_convergents(value)
+            if fractions is not None:
+                num, den = fractions[qi]
+                ratio = Fraction(num, den)
+                hit['continued_fraction'] = continued_fraction(ratio.numerator, ratio.denominator)
+                hit['is_convergent'] = ratio in reference
+            else:
+                exact = Fraction(float(queries[qi]))
+                hit['continued_fraction'] = continued_fraction(exact.numerator, exact.denominator, max_terms=12)
+            hit['constant_convergents'] = [f'{c.numerator}/{c.denominator}' for c in reference[:8]]
+            if labels is not None:
+                hit.update(labels[qi])
+            results.append(hit)
+        return results
+
+def token_ratios(values):
+    """(ratios, numerators, denominators) of every adjacent token pair a/b with a, b != 0."""
+    values = np.asarray(values)
+    a, b = values[:-1], values[1:]
+    index = np.flatnonzero((a != 0) & (b != 0))
+    return a[index].astype(float) / b[index].astype(float), a[index], b[index], index
+
+def fixed_point_values(bits, max_integer_bits=1023):
+    """
+    Value of the stream read as fixed point with k integer bits, for every split
+    k = 1..len-1 (k <= max_integer_bits so that the value fits in a float).
+    Returns (split_points, values).
+    """
+    vector = BitVector(bits)
+    n = len(vector)
+    whole = vector.to_int()
+    splits = np.arange(1, min(n, max_integer_bits + 1))
+    # Exact big-int division rounds each value correctly to the nearest float.
+    values = np.array([whole / (1 << (n - int(k))) for k in splits], dtype=float)
+    return splits, values
+
+def match_fixed_point(bits, table=None, tolerance=1e-3):
+    """Constants matched by the fixed-point value of every integer/fraction split of the stream."""
+    table = ConstantTable() if table is None else table
+    splits, values = fixed_point_values(bits)
+    labels = [{'integer_bits': int(k), 'fraction_bits': len(bits) - int(k)} for k in splits]
+    return table.report(values, tolerance, labels=labels)
+
+def match_token_ratios(bits, widths, table=None, tolerance=1e-3):
+    """
+    Constants matched by the ratio of every pair of adjacent tokens, over all the
+    given widths and all offsets of each width, in one table lookup.
+    """
+    # Imported here so the table can be used without the tokenizer.
+    from fixed_width_tokenizer import tokenize
+    table = ConstantTable() if table is None else table
+    queries, fractions, labels = [], [], []
+    for width, matrix in tokenize(bits, widths).items():
+        for offset in range(width):
+            ratios, num, den, index = token_ratios(matrix.tokens(offset))
+            queries.append(ratios)
+            fractions += zip(num.tolist(), den.tolist())
+            labels += [{'width': width, 'offset': offset, 'token_start': int(i)} for i in index.tolist()]
+    queries = np.concatenate(queries) if queries else np.zeros(0)
+    return table.report(queries, tolerance, fractions=fractions, labels=labels)
@@ -7,3 +7,4 @@ OUTPUT_DIR = "wow_signal_final_candidate"
 TIME_STEPS = 72
 FREQUENCY_OFFSET_KEY = 1420.4556
 NUM_CLUSTERS_TO_TRACK = 10
+NGRAM_MAX_N = 8
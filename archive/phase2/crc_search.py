@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Checksum Search Engine
+---------------------------------------------------
+Searches for every checksum parameter set that maps the message to a
+target value, instead of testing one predefined CRC and two ad-hoc sums.
+
+CRC: every generator polynomial of each width (all 65,536 for CRC-16) is
+evaluated at once. The shift register of every polynomial is one element of
+a numpy array, and the message is clocked through all of them together, one
+bit per step. The variants are:
+
+  * init 0 or all ones, xorout 0 or all ones,
+  * input reflected per byte (refin) and output reflected (refout),
+  * framing: the raw bits, or bytes padded with zeros on the left (as
+    int.to_bytes does) or on the right.
+
+This covers the usual Rocksoft-model CRCs such as CRC-16/ARC, the 'crc-16'
+of crcmod. A per-polynomial byte table would need 2**16 x 256 entries per
+width. Clocking single bits across the polynomial axis gives the same
+vectorization without one.
+
+Word-sum families, for every word size k = 1..32 and both paddings:
+plain sum, sum mod 2**k and mod 2**16, one's-complement sum (end-around
+carry) and its complement, XOR fold, Fletcher (mod 2**k - 1) and Adler-32.
+All word sizes come from one tokenizer pass.
+"""
+
+import numpy as np
+
+from bitvector import BitVector
+from fixed_width_tokenizer import tokenize
+
+CRC_WIDTHS = tuple(range(8, 17))
+WORD_SIZES = tuple(range(1, 33))
+FRAMINGS = ('bits', 'left_pad', 'right_pad')
+ADLER_MOD = 65521
+
+
+def frame_bits(bits, framing, refin=False):
+    """
+    Message bits (uint8 array) as clocked into the CRC register for one framing.
+    refin reverses the bits of every byte; for the raw bits it reverses the stream.
+    """
+    arr = BitVector(bits).array
+    if framing == 'bits':
+        return arr[::-1].copy() if refin else arr
+    pad = np.zeros(-len(arr) % 8, dtype=np.uint8)
+    arr = np.concatenate([pad, arr] if framing == 'left_pad' else [arr, pad])
+    if refin:
+        arr = arr.reshape(-1, 8)[:, ::-1].ravel()
+    return arr
+
+def reflect(values, width):
+    """Bit-reverses the low `width` bits of every value."""
+    values = np.asarray(values, dtype=np.uint32)
+    out = np.zeros_like(values)
+    for i in range(width):
+        out |= ((values >> np.uint32(i)) & np.uint32(1)) << np.uint32(width - 1 - i)
+    return out
+
+def crc_registers(message, width, init=0, polys=None):
+    """
+    Final CRC register (before refout / xorout) of `message` bits for every polynomial
+    (default: all 2**width, as the array index), MSB-first shifting.
+    """
+    polys = np.arange(1 << width, dtype=np.uint32) if polys is None else np.asarray(polys, dtype=np.uint32)
+    mask = np.uint32((1 << width) - 1)
+    top = np.uint32(width - 1)
+    state = np.full(polys.shape, init, dtype=np.uint32)
+    for bit in np.asarray(message, dtype=np.uint32).tolist():
+        feedback = ((state >> top) & np.uint32(1)) ^ np.uint32(bit)
+        state = ((state << np.uint32(1)) & mask) ^ (polys * feedback)
+    return state
+
+def crc_search(bits, target, widths=CRC_WIDTHS, framings=FRAMINGS):
+    """Every CRC parameter set (width, poly, init, xorout, refin, refout, framing) giving `target`."""
+    matches = []
+    for width in widths:
+        if target >= 1 << width:
+            continue
+        ones = (1 << width) - 1
+        for framing in framings:
+            for refin in (False, True):
+                message = frame_bits(bits, framing, refin)
+                for init in (0, ones):
+                    register = crc_registers(message, width, init)
+                    for refout in (False, True):
+                        out = reflect(register, width) if refout else register
+                        for xorout in (0, ones):
+                            for poly in np.flatnonzero((out ^ np.uint32(xorout)) == target).tolist():
+                                matches.append({
+                                    'family': 'crc', 'width': width, 'poly': f'0x{poly:0{(width + 3) // 4}X}',
+                                    'init': f'0x{init:X}', 'xorout': f'0x{xorout:X}',
+                                    'refin': refin, 'refout': refout, 'framing': framing,
+                                })
+    return matches
+
+def _word_checksums(words, k):
+    """(name, value) for every word-sum checksum of the k-bit words."""
+    xor = int(np.bitwise_xor.reduce(words)) if len(words) else 0
+    words = words.astype(np.int64)
+    total = int(words.sum())
+    results = [('sum', total), (f'sum_mod_2^{k}', total % (1 << k)), ('sum_mod_2^16', total % (1 << 16))]
+    ones = total
+    while ones >> k:
+        ones = (ones & ((1 << k) - 1)) + (ones >> k)
+    results += [('ones_complement_sum', ones), ('ones_complement_checksum', ~ones & ((1 << k) - 1))]
+    results.append(('xor_fold', xor))
+    if k >= 2:
+        mod = (1 << k) - 1
+        s1 = np.cumsum(words) % mod
+        a, b = int(s1[-1]) if len(s1) else 0, int(s1.sum()) % mod
+        results += [('fletcher_s1', a), ('fletcher_s2', b), ('fletcher', (b << k) | a)]
+    if k == 8:
+        a_run = 1 + np.cumsum(words)
+        a, b = int(a_run[-1]) % ADLER_MOD if len(a_run) else 1, int(a_run.sum()) % ADLER_MOD
+        results += [('adler32', (b << 16) | a), ('adler32_a', a), ('adler32_b', b)]
+    return results
+
+def word_sum_search(bits, target, word_sizes=WORD_SIZES):
+    """Every (family, word size, padding) word-sum checksum that equals `target`."""
+    bits = str(BitVector(bits))
+    matches = []
+    right = tokenize(bits, word_sizes, ignore_tail=False)
+    for k in word_sizes:
+        left_bits = '0' * (-len(bits) % k) + bits
+        left = tokenize(left_bits, [k])[k]
+        seen = set()
+        for padding, words in (('right_pad', right[k].tokens(0)), ('left_pad', left.tokens(0))):
+            key = tuple(words.tolist())
+            if key in seen:
+                continue  # No padding needed for this word size.
+            seen.add(key)
+            for name, value in _word_checksums(words, k):
+                if value == target:
+                    matches.append({'family': name, 'word_bits': k, 'padding': padding})
+    return matches
+
+def search(bits, target, widths=CRC_WIDTHS, word_sizes=WORD_SIZES):
+    """All CRC and word-sum parameter sets that reproduce `target`."""
+    return crc_search(bits, target, widths) + word_sum_search(bits, target, word_sizes)
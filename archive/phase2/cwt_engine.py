@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - FFT Continuous Wavelet Transform
+---------------------------------------------------
+Computes the continuous wavelet transform of pywt.cwt (method='conv') for
+all scales with one batched FFT multiply. pywt.cwt convolves the signal
+once per scale.
+
+For every scale, pywt convolves the signal with the integrated wavelet
+resampled at that scale (k), takes the first difference, multiplies it by
+-sqrt(scale) and crops the centre. The difference of a convolution is a
+convolution with the differenced kernel
+
+    d = -sqrt(scale) * [k0, k1 - k0, ..., k[-1] - k[-2], -k[-1]],
+
+so each scale is a single FIR filter followed by a crop at a per-scale
+offset. A FilterBank holds the FFTs of all these filters at one padded
+length and is cached per (scales, wavelet, block length). A transform is
+then
+
+    rfft(signals)[:, None, :] * bank  ->  irfft  ->  gather the crops,
+
+which handles a batch of signals (all evolved states, or many candidates)
+at once. The batch is processed in groups that keep the intermediate
+(batch x scales x nfft) array under MAX_BATCH_BYTES.
+
+`cwt_stream` transforms long inputs in fixed-size blocks with overlap-save.
+Each block reads `lookback` samples before and `lookahead` samples after
+its outputs, so memory depends on the block size and not on the input
+length. The result is identical to the full transform.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+DEFAULT_WAVELET = 'morl'
+PRECISION = 12
+STREAM_BLOCK = 4096
+MAX_BATCH_BYTES = 1 << 26
+
+
+def fast_length(n):
+    """Smallest 2**a * 3**b * 5**c >= n, a length the FFT handles quickly."""
+    best = 1 << max(n - 1, 0).bit_length()
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            m = p35
+            while m < n:
+                m *= 2
+            best = min(best, m)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+@lru_cache(maxsize=16)
+def wavelet_kernels(scales, wavelet=DEFAULT_WAVELET, precision=PRECISION):
+    """
+    (kernels, starts, is_complex): the differenced, scaled filter of every scale and the
+    index of each scale's first output sample in the full convolution.
+    """
+    import pywt
+    wavelet = pywt.DiscreteContinuousWavelet(wavelet)
+    int_psi, x = pywt.integrate_wavelet(wavelet, precision=precision)
+    is_complex = bool(wavelet.complex_cwt)
+    if is_complex:
+        int_psi = np.conj(int_psi)
+    step = x[1] - x[0]
+    kernels, starts = [], []
+    for scale in scales:
+        if scale <= 0:
+            raise ValueError("`scales` must only include positive values")
+        j = (np.arange(scale * (x[-1] - x[0]) + 1) / (scale * step)).astype(int)
+        k = int_psi[j[j < int_psi.size]][::-1]
+        if k.size < 2:
+            raise ValueError(f"Selected scale of {scale} too small.")
+        kernels.append(-np.sqrt(scale) * np.concatenate(([k[0]], np.diff(k), [-k[-1]])))
+        # pywt drops floor((len(k) - 2) / 2) samples after the leading one removed by diff.
+        starts.append(1 + (k.size - 2) // 2)
+    return tuple(kernels), np.array(starts), is_complex
+
+
+class FilterBank:
+    """Frequency-domain filters of every scale, for output blocks of `block` samples."""
+
+    def __init__(self, scales, wavelet=DEFAULT_WAVELET, block=STREAM_BLOCK, precision=PRECISION):
+        kernels, starts, self.is_complex = wavelet_kernels(tuple(scales), wavelet, precision)
+        self.scales = np.asarray(scales)
+        self.block = block
+        # Output sample m of a scale is sum_k d[k] x[m + start - k].
+        self.lookback = int(max(len(d) - 1 - s for d, s in zip(kernels, starts)))
+        self.lookahead = int(starts.max())
+        self.nfft = fast_length(block + self.lookback + self.lookahead)
+        padded = np.zeros((len(kernels), self.nfft), dtype=np.complex128 if self.is_complex else np.float64)
+        for i, d in enumerate(kernels):
+            padded[i, :len(d)] = d
+        self.spectra = np.fft.fft(padded, axis=1)
+        self.index = (starts + self.lookback)[:, None] + np.arange(block)[None, :]
+
+    def apply(self, segments):
+        """
+        Coefficients (batch x scales x block) of segments (batch x nfft) whose sample
+        `lookback` is the first output position.
+        """
+        segments = np.asarray(segments)
+        complex_path = self.is_complex or segments.dtype.kind == 'c'
+        itemsize = 16 * len(self.scales) * self.nfft
+        group = max(1, MAX_BATCH_BYTES // itemsize)
+        out = np.empty((len(segments), len(self.scales), self.block),
+                       dtype=np.complex128 if complex_path else np.float64)
+        for lo in range(0, len(segments), group):
+            chunk = segments[lo:lo + group]
+            if complex_path:
+                full = np.fft.ifft(np.fft.fft(chunk, axis=1)[:, None, :] * self.spectra, axis=2)
+            else:
+                # Real filters: the rfft is the first half of the full spectrum.
+                half = self.spectra[:, :self.nfft // 2 + 1]
+                full = np.fft.irfft(np.fft.rfft(chunk, axis=1)[:, None, :] * half, self.nfft, axis=2)
+            out[lo:lo + group] = np.take_along_axis(full, self.index[None, :, :], axis=2)
+        return out
+
+@lru_cache(maxsize=16)
+def filter_bank(scales, wavelet=DEFAULT_WAVELET, block=STREAM_BLOCK, precision=PRECISION):
+    """Cached FilterBank for a tuple of scales."""
+    return FilterBank(scales, wavelet, block, precision)
+
+def frequencies(scales, wavelet=DEFAULT_WAVELET, precision=PRECISION, sampling_period=1.0):
+    """Normalized frequencies of the scales, as returned by pywt.cwt."""
+    import pywt
+    return np.atleast_1d(pywt.scale2frequency(wavelet, np.asarray(scales), precision)) / sampling_period
+
+def cwt(data, scales, wavelet=DEFAULT_WAVELET, sampling_period=1.0, precision=PRECISION):
+    """
+    Drop-in for pywt.cwt(data, scales, wavelet) along the last axis: returns
+    (coefficients, frequencies) with coefficients of shape (scales,) + data.shape.
+    """
+    data = np.asarray(data)
+    if not np.issubdtype(data.dtype, np.complexfloating):
+        data = data.astype(np.float64)
+    batch = data.reshape(-1, data.shape[-1])
+    n = batch.shape[1]
+    bank = filter_bank(tuple(np.asarray(scales).tolist()), wavelet, n, precision)
+    segments = np.zeros((len(batch), bank.nfft), dtype=batch.dtype)
+    segments[:, bank.lookback:bank.lookback + n] = batch
+    coefficients = bank.apply(segments)
+    coefficients = np.moveaxis(coefficients, 1, 0).reshape((len(bank.scales),) + data.shape)
+    return coefficients, frequencies(scales, wavelet, precision, sampling_period)
+
+def cwt_stream(data, scales, wavelet=DEFAULT_WAVELET, block=STREAM_BLOCK, precision=PRECISION):
+    """
+    Yields (start, coefficients) for consecutive output blocks of a long 1-D signal
+    (any sliceable array, e.g. a numpy memmap), each of shape (scales, up to block).
+    """
+    bank = filter_bank(tuple(np.asarray(scales).tolist()), wavelet, block, precision)
+    n = len(data)
+    for start in range(0, n, block):
+        lo = start - bank.lookback
+        hi = min(lo + bank.nfft, n)
+        segment = np.zeros((1, bank.nfft))
+        segment[0, max(lo, 0) - lo:hi - lo] = np.asarray(data[max(lo, 0):hi], dtype=np.float64)
+        yield start, bank.apply(segment)[0, :, :min(block, n - start)]
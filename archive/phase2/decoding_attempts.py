@@ -3,9 +3,16 @@ import random
 import matplotlib.pyplot as plt
 import base64
 
+from bitvector import BitVector
+import permutation_sweep
+import xor_keyspace
+
 # --- Constants ---
 BINARY_STRING = "110011111110011110001110111101111100011100100110001011000001100001110101110011011000111000000111001001101100100001001101001101111111111111000000011000101100000110011011100000111000101011111100110101100101111011101000101011001000001101111101110001110000010111001001111111101101111001011100111011111111"
 DECODING_KEY = 1868
+KEYSPACE_BITS = 20
+PERMUTATION_SEEDS = range(1 << 16)
+PERMUTATION_RENDER_TOP = 9
 
 def xor_with_key(binary_data, key):
     """
@@ -17,10 +24,10 @@ def xor_with_key(binary_data, key):
     key_binary = bin(key)[2:]
     
     # Repeat the key to match the length of the binary data
-    repeated_key = (key_binary * (len(binary_data) // len(key_binary) + 1))[:len(binary_data)]
+    repeated_key = BitVector(key_binary).tile(len(binary_data))
     
     # Perform XOR operation
-    xored_result = "".join(['1' if a != b else '0' for a, b in zip(binary_data, repeated_key)])
+    xored_result = str(BitVector(binary_data) ^ repeated_key)
     
     print(f"Key (1868) in binary: {key_binary}")
     print(f"XOR result: {xored_result}")
@@ -94,6 +101,46 @@ def image_manipulation_with_key(binary_data, key):
     print("If the shuffled image reveals a clear pattern, it could mean the key (1868) is a seed used to encode the message.")
     print("-" * 20)
 
+def xor_keyspace_search(binary_data, key):
+    """
+    Ranks every repeating XOR key up to KEYSPACE_BITS bits, to see whether the key stands out.
+    """
+    print(f"\n--- Decoding Method 4: XOR Keyspace Search ({KEYSPACE_BITS}-bit keys) ---")
+    rows = xor_keyspace.search(binary_data, KEYSPACE_BITS, top=5, keep=(key,))
+    for row in rows:
+        print(f"#{row['rank']:<7} key={row['key']:<8} score={row['score']:6.2f} printable={row['printable']:.2f} "
+              f"structure={row['structure']:.2f} {row['image_shape']} prime={row['is_prime']}")
+    rank = next(row['rank'] for row in rows if row['key'] == key)
+    print(f"Key {key} ranks {rank} of {2 ** KEYSPACE_BITS - 1} keys.")
+    print("-" * 20)
+
+def permutation_sweep_with_key(binary_data, key):
+    """
+    Screens PERMUTATION_SEEDS seeds as shuffle keys and renders only the best-scoring images.
+    """
+    print(f"\n--- Decoding Method 5: Seeded Permutation Sweep ({len(PERMUTATION_SEEDS)} seeds) ---")
+    rows = permutation_sweep.sweep(binary_data, PERMUTATION_SEEDS, top=PERMUTATION_RENDER_TOP, keep=(key,))
+    for row in rows:
+        print(f"#{row['rank']:<7} seed={row['seed']:<8} score={row['score']:6.2f} "
+              f"autocorrelation={row['autocorrelation']:.3f} run_length={row['run_length']:.2f} "
+              f"symmetry={row['symmetry']:.2f}")
+
+    top = [row for row in rows if row['rank'] <= PERMUTATION_RENDER_TOP]
+    cols = 3
+    fig, axes = plt.subplots(-(-len(top) // cols), cols, figsize=(12, 9), squeeze=False)
+    for ax in axes.flat:
+        ax.axis('off')
+    for ax, row in zip(axes.flat, top):
+        pixels = permutation_sweep.permuted(binary_data, row['seed']).array.reshape(permutation_sweep.IMAGE_SHAPE)
+        ax.imshow(pixels, cmap='gray_r', interpolation='nearest')
+        ax.set_title(f"#{row['rank']} seed {row['seed']}")
+    output_path = "permutation_sweep_top.png"
+    fig.savefig(output_path)
+    plt.close(fig)
+    print(f"Top {len(top)} shuffled images saved to '{output_path}'")
+    print("Note: the sweep shuffles with SplitMix64 keys, so seed 1868 here is not the permutation of Method 3.")
+    print("-" * 20)
+
 def main():
     """
     Runs all decoding attempts.
@@ -105,6 +152,8 @@ def main():
     xor_with_key(BINARY_STRING, DECODING_KEY)
     ascii_decoding_with_offset(BINARY_STRING, DECODING_KEY)
     image_manipulation_with_key(BINARY_STRING, DECODING_KEY)
+    xor_keyspace_search(BINARY_STRING, DECODING_KEY)
+    permutation_sweep_with_key(BINARY_STRING, DECODING_KEY)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Escape-Time Fractal Engine
+---------------------------------------------------
+Computes Mandelbrot and Julia escape times for any number of points at once,
+instead of iterating z = z**2 + c in Python for one point at a time.
+
+`escape_times` keeps the points that have not escaped as an index array,
+which is compacted after every iteration. Each step therefore only
+touches the live points. The escape time of a point is the first iteration
+i with |z_i| > 2, or max_iterations if there is none. Since a shorter run
+just truncates a longer one,
+
+    escape time at N iterations = min(escape time at M iterations, N)   for N <= M,
+
+so a sweep over iteration counts costs one run at the largest count.
+
+A bit stream becomes points by cutting it into chunks of `chunk_size` bits
+and splitting each chunk into a real and an imaginary part. Each part is
+scaled from [0, 2**k - 1] to [-2, 2]. `sweep` builds the points of every
+split of every chunk size, runs them through one escape-time pass per
+chunk size and summarizes each (chunk size, split, iterations)
+combination. `escape_grid` gives the escape times of a regular grid, for a
+background image.
+"""
+
+import numpy as np
+
+from bitvector import BitVector
+from fixed_width_tokenizer import MAX_WIDTH, tokenize
+
+ESCAPE_RADIUS = 2.0
+
+
+def escape_times(c, max_iterations, z0=None):
+    """
+    Escape time of every point: Mandelbrot (z0 = 0) for the parameters c, or Julia when
+    z0 holds the starting points (c may then be one complex constant).
+    """
+    c = np.asarray(c, dtype=np.complex128)
+    z = np.zeros(c.shape, dtype=np.complex128) if z0 is None else np.asarray(z0, dtype=np.complex128)
+    z, c = np.broadcast_arrays(z, c)
+    shape = z.shape
+    z = z.ravel().copy()
+    c = c.ravel().copy()
+    times = np.full(z.shape, max_iterations, dtype=np.int64)
+    live = np.arange(z.size)
+    for i in range(max_iterations):
+        escaped = np.abs(z) > ESCAPE_RADIUS
+        if escaped.any():
+            times[live[escaped]] = i
+            keep = ~escaped
+            live, z, c = live[keep], z[keep], c[keep]
+            if not live.size:
+                break
+        z = z * z + c
+    return times.reshape(shape)
+
+def scale(values, bits):
+    """Maps integers in [0, 2**bits - 1] linearly onto [-2, 2]."""
+    return np.asarray(values, dtype=np.float64) / ((1 << bits) - 1) * 4.0 - 2.0
+
+def complex_points(bits, chunk_size=20, real_bits=None, offset=0):
+    """
+    One point per whole chunk: the first `real_bits` bits of the chunk (default: half) give
+    the real part and the remaining bits the imaginary part.
+    """
+    real_bits = chunk_size // 2 if real_bits is None else real_bits
+    if not 0 < real_bits < chunk_size <= MAX_WIDTH:
+        raise ValueError(f"Need 0 < real_bits < chunk_size <= {MAX_WIDTH}, got {real_bits} and {chunk_size}.")
+    tokens = tokenize(BitVector(bits), [chunk_size])[chunk_size].tokens(offset)
+    return split_tokens(tokens, chunk_size, real_bits)
+
+def split_tokens(tokens, chunk_size, real_bits):
+    """Points from chunk_size-bit tokens: the high real_bits bits are the real part."""
+    imag_bits = chunk_size - real_bits
+    real = tokens >> np.uint64(imag_bits)
+    imag = tokens & np.uint64((1 << imag_bits) - 1)
+    return scale(real, real_bits) + 1j * scale(imag, imag_bits)
+
+def sweep(bits, chunk_sizes=range(2, 33), iterations=(26,), real_splits=None, julia_c=None):
+    """
+    Summary rows for every chunk size, real/imaginary split (default: all of them) and
+    iteration count: number of points, fraction that never escaped, mean escape time.
+    With julia_c the points are Julia starting points for that constant.
+    """
+    bits = BitVector(bits)
+    top = max(iterations)
+    chunk_sizes = [size for size in chunk_sizes if size <= len(bits)]
+    matrices = tokenize(bits, chunk_sizes)
+    rows = []
+    for chunk_size in chunk_sizes:
+        tokens = matrices[chunk_size].tokens(0)
+        splits = range(1, chunk_size) if real_splits is None else [r for r in real_splits if 0 < r < chunk_size]
+        points = [split_tokens(tokens, chunk_size, real_bits) for real_bits in splits]
+        if not points:
+            continue
+        flat = np.concatenate(points)
+        if julia_c is None:
+            times = escape_times(flat, top)
+        else:
+            times = escape_times(julia_c, top, z0=flat)
+        start = 0
+        for real_bits, pts in zip(splits, points):
+            segment = times[start:start + len(pts)]
+            start += len(pts)
+            for n in iterations:
+                clipped = np.minimum(segment, n)
+                rows.append({
+                    'chunk_size': chunk_size, 'real_bits': real_bits, 'max_iterations': n,
+                    'points': len(pts), 'bounded': float(np.mean(clipped == n)),
+                    'mean_escape': float(clipped.mean()),
+                })
+    return rows
+
+def escape_grid(real_range=(-2.0, 2.0), imag_range=(-2.0, 2.0), resolution=400, max_iterations=26, julia_c=None):
+    """Escape times on a resolution x resolution grid (rows run along the imaginary axis)."""
+    re = np.linspace(*real_range, resolution)
+    im = np.linspace(*imag_range, resolution)
+    grid = re[None, :] + 1j * im[:, None]
+    if julia_c is None:
+        times = escape_times(grid, max_iterations)
+    else:
+        times = escape_times(julia_c, max_iterations, z0=grid)
+    return times
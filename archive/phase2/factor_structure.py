@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Factor Structure
+---------------------------------------------------
+Splits many integers at once into a B-smooth part (all prime factors <= B)
+and a cofactor, using batched trial division against every prime up to B.
+
+The primes are multiplied into a product tree once per bound. For a batch of
+values N_i the engine builds a second product tree over the values and
+reduces the prime product P down it (a remainder tree), giving P mod N_i for
+every value in O(log) big-int divisions instead of one division per prime.
+Squaring the remainder e times, with 2**e >= bits(N_i), makes
+
+    gcd(N_i, P**(2**e) mod N_i)
+
+the full B-smooth part of N_i, prime powers included. The primes in each
+smooth part are recovered by walking down the prime tree and following only
+the branches whose gcd with it is not 1.
+
+The cofactor left over can optionally be attacked with Pollard's p-1 and
+Brent's variant of Pollard rho under a time budget. `special_prime_flags`
+runs the Sophie Germain and safe-prime checks over a whole batch of values.
+"""
+
+import time
+from functools import lru_cache
+from math import gcd
+
+from primality import is_prime, is_prime_batch, primes_below
+
+DEFAULT_BOUND = 10 ** 6
+# Stage 1 bound for Pollard p-1 on the cofactor.
+PM1_BOUND = 10 ** 5
+
+
+def _mpz():
+    """gmpy2.mpz when gmpy2 is installed (much faster big-int products), otherwise int."""
+    try:
+        import gmpy2
+        return gmpy2.mpz
+    except ImportError:
+        return int
+
+def product_tree(values):
+    """Levels of a product tree, leaves first; the last level holds the product of all values."""
+    tree = [list(values)]
+    while len(tree[-1]) > 1:
+        level = tree[-1]
+        tree.append([level[i] * level[i + 1] if i + 1 < len(level) else level[i]
+                     for i in range(0, len(level), 2)])
+    return tree
+
+def remainder_tree(value, tree):
+    """value mod every leaf of `tree`, by reducing down from the root."""
+    remainders = [value % tree[-1][0]]
+    for level in reversed(tree[:-1]):
+        remainders = [remainders[i // 2] % node for i, node in enumerate(level)]
+    return remainders
+
+@lru_cache(maxsize=4)
+def prime_tree(bound):
+    """Product tree over all primes <= bound (cached per bound)."""
+    mpz = _mpz()
+    return product_tree([mpz(p) for p in primes_below(bound + 1).tolist()])
+
+def smooth_parts(values, bound=DEFAULT_BOUND):
+    """The bound-smooth part of every value (1 for values < 2)."""
+    mpz = _mpz()
+    values = [int(v) for v in values]
+    indices = [i for i, v in enumerate(values) if v >= 2]
+    parts = [1] * len(values)
+    if not indices:
+        return parts
+    tree = product_tree([mpz(values[i]) for i in indices])
+    remainders = remainder_tree(prime_tree(bound)[-1][0], tree)
+    for i, r in zip(indices, remainders):
+        n = values[i]
+        for _ in range((n.bit_length() - 1).bit_length()):
+            r = r * r % n
+        parts[i] = int(gcd(int(r), n))
+    return parts
+
+def _split_smooth(smooth, bound):
+    """{prime: exponent} for a bound-smooth integer."""
+    if smooth == 1:
+        return {}
+    tree = prime_tree(bound)
+    # Walk from the root; g is the product of the tree primes under the node that divide `smooth`.
+    divisors = []
+    stack = [(len(tree) - 1, 0, gcd(smooth, int(tree[-1][0])))]
+    while stack:
+        depth, index, g = stack.pop()
+        if g == 1:
+            continue
+        if depth == 0:
+            divisors.append(int(tree[0][index]))
+            continue
+        for child in (2 * index, 2 * index + 1):
+            if child < len(tree[depth - 1]):
+                stack.append((depth - 1, child, gcd(g, int(tree[depth - 1][child]))))
+    factors = {}
+    for p in sorted(divisors):
+        e = 0
+        while smooth % p == 0:
+            smooth //= p
+            e += 1
+        factors[p] = e
+    return factors
+
+def pollard_pm1(n, deadline, bound=PM1_BOUND):
+    """A nontrivial factor of n found by Pollard's p-1 stage 1, or None."""
+    a = 2
+    for i, p in enumerate(primes_below(bound + 1).tolist()):
+        pk = p
+        while pk * p <= bound:
+            pk *= p
+        a = pow(a, pk, n)
+        if i % 256 == 0 and time.monotonic() > deadline:
+            break
+    g = gcd(a - 1, n)
+    return g if 1 < g < n else None
+
+def pollard_rho(n, deadline):
+    """A nontrivial factor of n found by Brent's variant of Pollard rho, or None."""
+    if n % 2 == 0:
+        return 2
+    for c in range(1, 64):
+        y, r, q, g = 2, 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(128, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += 128
+            r *= 2
+            if time.monotonic() > deadline:
+                return None
+        if g == n:
+            # Backtrack one step at a time from the last saved point.
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if 1 < g < n:
+            return g
+    return None
+
+def factor_cofactor(n, budget):
+    """
+    Factors a cofactor within `budget` seconds.
+    Returns ({prime: exponent}, [composite parts left unfactored]).
+    """
+    deadline = time.monotonic() + budget
+    factors, remaining = {}, []
+    stack = [n]
+    while stack:
+        m = stack.pop()
+        if m == 1:
+            continue
+        if is_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        d = None
+        if time.monotonic() < deadline:
+            d = pollard_pm1(m, deadline) or pollard_rho(m, deadline)
+        if d is None:
+            remaining.append(m)
+        else:
+            stack.extend((d, m // d))
+    return dict(sorted(factors.items())), sorted(remaining)
+
+def factor_structure(values, bound=DEFAULT_BOUND, cofactor_budget=0.0):
+    """
+    Factor structure of every value: the bound-smooth part with its factorization,
+    and the cofactor with its size and primality. With a positive cofactor_budget
+    (seconds per value) the cofactor is also attacked with Pollard p-1 / rho.
+    """
+    values = [int(v) for v in values]
+    parts = smooth_parts(values, bound)
+    cofactors = [n // s if n >= 2 else n for n, s in zip(values, parts)]
+    cofactor_prime = is_prime_batch(cofactors).tolist()
+    results = []
+    for n, smooth, cofactor, prime in zip(values, parts, cofactors, cofactor_prime):
+        entry = {
+            "n": n,
+            "bound": bound,
+            "smooth_part": smooth,
+            "smooth_factors": _split_smooth(smooth, bound),
+            "cofactor": cofactor,
+            "cofactor_bits": cofactor.bit_length() if cofactor > 1 else 0,
+            "cofactor_is_prime": prime,
+        }
+        if cofactor_budget > 0 and cofactor > 1 and not prime:
+            entry["cofactor_factors"], entry["cofactor_unfactored"] = factor_cofactor(cofactor, cofactor_budget)
+        results.append(entry)
+    return results
+
+def special_prime_flags(values):
+    """
+    Primality, Sophie Germain (2p + 1 prime) and safe-prime ((p - 1) / 2 prime)
+    flags for every value, each as a list of booleans.
+    """
+    values = [int(v) for v in values]
+    prime = is_prime_batch(values).tolist()
+    above = is_prime_batch([2 * v + 1 for v in values]).tolist()
+    below = is_prime_batch([(v - 1) // 2 if v % 2 else 0 for v in values]).tolist()
+    return {
+        "prime": prime,
+        "sophie_germain": [p and a for p, a in zip(prime, above)],
+        "safe": [p and b for p, b in zip(prime, below)],
+    }
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Fixed-Width Tokenizer
+---------------------------------------------------
+Decodes a bit stream into fixed-width integer tokens for every width and
+every starting offset at once, instead of slicing the string and calling
+int(chunk, 2) per token, per offset and per width.
+
+The value of the w-bit window starting at every bit position follows from
+the (w - 1)-bit windows in one vectorized step,
+
+    big[w]    = (big[w - 1][:-1] << 1) | bits[w - 1:]
+    little[w] = little[w - 1][:-1] | (bits[w - 1:] << (w - 1)),
+
+so all widths up to W cost O(W * len(bits)). The tokens of width w at
+offset o are the windows starting at o, o + w, o + 2w, ..., gathered into a
+(w offsets x tokens) TokenMatrix. Offsets with fewer tokens are padded and
+masked out by `valid`, so scores such as the element-mapping rate are plain
+reductions over the matrix rows.
+"""
+
+import numpy as np
+
+from bitvector import BitVector
+
+# Token values are uint64, which limits the width.
+MAX_WIDTH = 64
+
+
+class TokenMatrix:
+    """Tokens of one width for all offsets: values[offset, index] with a validity mask."""
+
+    def __init__(self, width, values, valid, n_bits):
+        self.width = width
+        self.values = values
+        self.valid = valid
+        self.n_bits = n_bits
+
+    @property
+    def counts(self):
+        """Number of tokens at each offset."""
+        return self.valid.sum(axis=1)
+
+    def tokens(self, offset):
+        """Token values at one offset."""
+        return self.values[offset, :self.counts[offset]]
+
+    def rate(self, low, high):
+        """Per-offset fraction of tokens with low <= value <= high (0 for offsets without tokens)."""
+        hits = ((self.values >= low) & (self.values <= high) & self.valid).sum(axis=1)
+        return hits / np.maximum(self.counts, 1)
+
+    def best_offset(self, low, high):
+        """(offset, rate) with the highest rate; ties go to the smallest offset."""
+        rates = self.rate(low, high)
+        offset = int(np.argmax(rates))
+        return offset, float(rates[offset])
+
+def iter_window_values(bits, max_width, endian='big', ignore_tail=True):
+    """
+    Yields (width, windows) for width = 1..max_width, where windows[i] is the value
+    of the width-bit window starting at bit i. With ignore_tail=False the stream is
+    padded with zeros so that windows run up to the last bit.
+    """
+    if max_width > MAX_WIDTH:
+        raise ValueError(f"Token values are 64-bit integers, so the width is limited to {MAX_WIDTH}.")
+    symbols = BitVector(bits).array.astype(np.uint64)
+    if not ignore_tail:
+        symbols = np.concatenate([symbols, np.zeros(max_width - 1, dtype=np.uint64)])
+    windows = symbols
+    for width in range(1, min(max_width, len(symbols)) + 1):
+        if width > 1:
+            if endian == 'big':
+                windows = (windows[:-1] << np.uint64(1)) | symbols[width - 1:]
+            else:
+                windows = windows[:-1] | (symbols[width - 1:] << np.uint64(width - 1))
+        yield width, windows
+
+def token_matrix(windows, width, n_bits, ignore_tail=True):
+    """Gathers the width-bit tokens of every offset 0..width-1 from the window values."""
+    n_tokens = n_bits // width if ignore_tail else -(-n_bits // width)
+    starts = np.arange(width)[:, None] + width * np.arange(max(n_tokens, 1))[None, :]
+    ends = starts + (width if ignore_tail else 1)
+    valid = ends <= n_bits
+    values = np.where(valid, windows[np.minimum(starts, len(windows) - 1)], 0) if len(windows) else \
+        np.zeros(starts.shape, dtype=np.uint64)
+    return TokenMatrix(width, values.astype(np.uint64), valid, n_bits)
+
+def tokenize(bits, widths, endian='big', ignore_tail=True):
+    """{width: TokenMatrix} for every requested width, from one pass over the windows."""
+    bits = BitVector(bits)
+    wanted = set(widths)
+    if not wanted:
+        return {}
+    if min(wanted) < 1:
+        raise ValueError("width must be >= 1")
+    matrices = {}
+    for width, windows in iter_window_values(bits, max(wanted), endian, ignore_tail):
+        if width in wanted:
+            matrices[width] = token_matrix(windows, width, len(bits), ignore_tail)
+    for width in wanted - set(matrices):
+        # Wider than the whole stream: no token at any offset.
+        matrices[width] = token_matrix(np.zeros(0, dtype=np.uint64), width, len(bits), ignore_tail)
+    return {width: matrices[width] for width in widths}
+
+def best_offsets(bits, widths, low, high, endian='big', ignore_tail=True):
+    """{width: (offset, rate)} maximizing the fraction of token values in [low, high]."""
+    return {width: matrix.best_offset(low, high)
+            for width, matrix in tokenize(bits, widths, endian, ignore_tail).items()}
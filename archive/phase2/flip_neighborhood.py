@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Bit-Flip Neighborhood Search
+---------------------------------------------------
+Measures how the number of motif hits in a message changes when bits are
+flipped, without rescanning the whole message for every candidate.
+
+Flipping bit q can only create or destroy matches that contain q, so the
+change in the total hit count is
+
+    hits containing q after the flip - hits containing q before the flip,
+
+which MotifScanner.count_containing computes from a window of
+2 * max_length - 1 bits around q. Applying the flips of a set one at a time
+and summing these local deltas gives the exact gain of the whole set.
+
+`exhaustive_flip_search` enumerates every set of 1..k flipped positions as a
+depth-first search in increasing position order, flipping and unflipping one
+working copy of the message. A branch is pruned when even the best case
+cannot reach `min_gain`. Adding a flip at q can gain at most `potential[q]`
+hits, the number of motif windows that contain q. The subtrees rooted at
+each first position are sharded across a process pool.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from bitvector import BitVector
+from motif_scanner import MotifScanner
+
+
+@lru_cache(maxsize=16)
+def _scanner(patterns):
+    return MotifScanner(patterns)
+
+def working_copy(bits):
+    """Writable uint8 copy of a bit string or BitVector for in-place flipping."""
+    return np.array(BitVector(bits).array)
+
+def flip_delta(scanner, arr, position):
+    """Flips arr[position] in place and returns the change in the total number of hits."""
+    before = scanner.count_containing(arr, position)
+    arr[position] ^= 1
+    return scanner.count_containing(arr, position) - before
+
+def flip_gain(scanner, arr, positions):
+    """Exact change in the number of hits if all `positions` were flipped; arr is left unchanged."""
+    gain = 0
+    for position in positions:
+        gain += flip_delta(scanner, arr, position)
+    for position in positions:
+        arr[position] ^= 1
+    return gain
+
+def hit_potential(scanner, n):
+    """Number of motif windows that contain each position of an n-bit message."""
+    q = np.arange(n)
+    potential = np.zeros(n, dtype=np.int64)
+    for length in scanner.lengths.tolist():
+        # Window starts s with s <= q < s + length and 0 <= s <= n - length.
+        potential += np.clip(np.minimum(q, n - length) - np.maximum(0, q - length + 1) + 1, 0, None)
+    return potential
+
+def gain_bounds(potential, max_flips):
+    """
+    bounds[r][q] = largest total potential of up to r positions at indices >= q,
+    an upper bound on what r more flips from position q onwards can gain.
+    """
+    n = len(potential)
+    bounds = np.zeros((max_flips + 1, n + 1), dtype=np.int64)
+    for q in range(n - 1, -1, -1):
+        for r in range(1, max_flips + 1):
+            bounds[r][q] = max(bounds[r][q + 1], bounds[r - 1][q + 1] + potential[q])
+    return bounds
+
+def _explore(task):
+    """Enumerates every flip set whose smallest position is `first`; returns its statistics."""
+    patterns, bits, first, max_flips, min_gain, max_examples = task
+    scanner = _scanner(patterns)
+    arr = working_copy(bits)
+    n = len(arr)
+    bounds = gain_bounds(hit_potential(scanner, n), max_flips)
+    stats = {"explored": 0, "pruned": 0, "improving_by_flips": [0] * (max_flips + 1),
+             "best_gain": None, "examples": []}
+    path = []
+
+    def visit(gain):
+        stats["explored"] += 1
+        if stats["best_gain"] is None or gain > stats["best_gain"]:
+            stats["best_gain"] = gain
+        if gain >= min_gain:
+            stats["improving_by_flips"][len(path)] += 1
+            stats["examples"].append((gain, list(path)))
+            if len(stats["examples"]) > 4 * max_examples:
+                stats["examples"] = _top_examples(stats["examples"], max_examples)
+        remaining = max_flips - len(path)
+        if not remaining:
+            return
+        for q in range(path[-1] + 1, n):
+            # Bounds only shrink as q grows, so once a branch is hopeless all later ones are too.
+            if gain + bounds[remaining][q] < min_gain:
+                stats["pruned"] += n - q  # branches skipped at this depth
+                break
+            delta = flip_delta(scanner, arr, q)
+            path.append(q)
+            visit(gain + delta)
+            path.pop()
+            arr[q] ^= 1
+
+    path.append(first)
+    visit(flip_delta(scanner, arr, first))
+    stats["examples"] = _top_examples(stats["examples"], max_examples)
+    return stats
+
+def _top_examples(examples, max_examples):
+    return sorted(examples, key=lambda ex: (-ex[0], len(ex[1]), ex[1]))[:max_examples]
+
+def exhaustive_flip_search(bits, patterns, max_flips=2, min_gain=1, max_workers=None, max_examples=10):
+    """
+    Enumerates every set of 1..max_flips flipped positions and counts the sets
+    that raise the number of motif hits by at least `min_gain`. `best_gain`
+    is the best gain among the sets that were not pruned.
+    `max_workers=1` runs in this process.
+    """
+    patterns = tuple(patterns)
+    bits = str(BitVector(bits))
+    base_hits = _scanner(patterns).count(bits)
+    tasks = [(patterns, bits, first, max_flips, min_gain, max_examples) for first in range(len(bits))]
+    if max_workers == 1:
+        results = [_explore(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers or os.cpu_count()) as pool:
+            results = list(pool.map(_explore, tasks))
+
+    improving = [0] * (max_flips + 1)
+    examples = []
+    best_gain = None
+    for stats in results:
+        improving = [a + b for a, b in zip(improving, stats["improving_by_flips"])]
+        examples.extend(stats["examples"])
+        if stats["best_gain"] is not None and (best_gain is None or stats["best_gain"] > best_gain):
+            best_gain = stats["best_gain"]
+    return {
+        "baseline_hits": base_hits,
+        "max_flips": max_flips,
+        "explored": sum(stats["explored"] for stats in results),
+        "pruned": sum(stats["pruned"] for stats in results),
+        "improving_sets": sum(improving),
+        "improving_by_flips": {k: improving[k] for k in range(1, max_flips + 1)},
+        "best_gain": best_gain,
+        "examples": [{"flip_positions": positions, "gain": gain}
+                     for gain, positions in _top_examples(examples, max_examples)],
+    }
@@ -1,60 +1,44 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+import escape_time
+
 # --- Constants ---
 BINARY_STRING = "110011111110011110001110111101111100011100100110001011000001100001110101110011011000111000000111001001101100100001001101001101111111111111000000011000101100000110011011100000111000101011111100110101100101111011101000101011001000001101111101110001110000010111001001111111101101111001011100111011111111"
 FRACTAL_KEY = 26  # Number of iterations
+SWEEP_CHUNK_SIZES = range(2, 65)
+SWEEP_ITERATIONS = (10, FRACTAL_KEY, 50, 100)
+SWEEP_MIN_POINTS = 8
+SWEEP_REPORT = 10
 
-def normalize_data(binary_data):
+def normalize_data(binary_data, chunk_size=20, real_bits=10):
     """
     Converts the binary string into a series of complex numbers between -2.0 and 2.0.
     """
-    # We need pairs of numbers for real and imaginary parts, so we'll use 20-bit chunks
-    # 300 bits / 20 bits/chunk = 15 chunks
-    chunk_size = 20
-    chunks = [binary_data[i:i+chunk_size] for i in range(0, len(binary_data), chunk_size)]
-    
-    complex_numbers = []
-    for chunk in chunks:
-        # Split each chunk into two 10-bit parts for real and imaginary components
-        real_part_bin = chunk[:10]
-        imag_part_bin = chunk[10:]
-        
-        real_part_int = int(real_part_bin, 2)
-        imag_part_int = int(imag_part_bin, 2)
-        
-        # Normalize to the range [-2, 2]
-        # Max value for a 10-bit number is 1023
-        real_part_norm = (real_part_int / 1023.0) * 4.0 - 2.0
-        imag_part_norm = (imag_part_int / 1023.0) * 4.0 - 2.0
-        
-        complex_numbers.append(complex(real_part_norm, imag_part_norm))
-        
-    return complex_numbers
+    # 20-bit chunks split into two 10-bit parts: 300 bits / 20 bits/chunk = 15 points
+    return escape_time.complex_points(binary_data, chunk_size, real_bits).tolist()
 
 def generate_fractal_points(c, max_iterations):
     """
-    Applies the Mandelbrot set calculation (z = z^2 + c) for a given point c.
-    Returns the number of iterations it takes to 'escape'.
+    Applies the Mandelbrot set calculation (z = z^2 + c) to every point c.
+    Returns the number of iterations each takes to 'escape'.
     """
-    z = 0
-    for i in range(max_iterations):
-        if abs(z) > 2.0:
-            return i  # Escaped
-        z = z**2 + c
-    return max_iterations  # Did not escape
+    return escape_time.escape_times(c, max_iterations)
 
 def visualize_fractal(complex_points, max_iterations):
     """
     Plots the fractal points, colored by their escape time.
     """
-    escape_times = [generate_fractal_points(c, max_iterations) for c in complex_points]
+    escape_times = generate_fractal_points(complex_points, max_iterations)
     
     x = [c.real for c in complex_points]
     y = [c.imag for c in complex_points]
     
     plt.figure(figsize=(12, 12))
-    plt.scatter(x, y, c=escape_times, cmap='magma', s=100)
+    # The full Mandelbrot escape-time grid as a faint background for context
+    background = escape_time.escape_grid(max_iterations=max_iterations)
+    plt.imshow(background, extent=(-2, 2, -2, 2), origin='lower', cmap='gray_r', alpha=0.35)
+    plt.scatter(x, y, c=escape_times, cmap='magma', s=100, edgecolors='white')
     plt.title(f"Fractal Plot from Binary Data (Iterations: {max_iterations})")
     plt.xlabel("Real Part")
     plt.ylabel("Imaginary Part")
@@ -66,6 +50,22 @@ def visualize_fractal(complex_points, max_iterations):
     print(f"\nFractal plot saved to '{output_path}'")
     plt.close()
 
+def sweep_chunkings(binary_data):
+    """
+    Escape-time statistics for every chunk size, real/imaginary split and iteration count.
+    """
+    print("\n--- Chunking Sweep ---")
+    rows = escape_time.sweep(binary_data, SWEEP_CHUNK_SIZES, SWEEP_ITERATIONS)
+    print(f"Evaluated {len(rows)} (chunk size, split, iterations) combinations.")
+    candidates = [row for row in rows if row['points'] >= SWEEP_MIN_POINTS]
+    candidates.sort(key=lambda row: (-row['bounded'], -row['mean_escape']))
+    print(f"Most bounded chunkings (at least {SWEEP_MIN_POINTS} points):")
+    for row in candidates[:SWEEP_REPORT]:
+        print(f"  chunk={row['chunk_size']:>2} real/imag={row['real_bits']}/{row['chunk_size'] - row['real_bits']} "
+              f"iterations={row['max_iterations']:>3} points={row['points']:>3} "
+              f"bounded={row['bounded']:.2f} mean_escape={row['mean_escape']:.1f}")
+    return rows
+
 def main():
     """
     Runs the fractal analysis script.
@@ -80,8 +80,11 @@ def main():
     
     # 2. Generate and visualize the fractal
     visualize_fractal(complex_points, FRACTAL_KEY)
+
+    # 3. Sweep every chunking of the bitstream
+    sweep_chunkings(BINARY_STRING)
     
-    # 3. Interpretation
+    # 4. Interpretation
     print("\n--- Interpretation ---")
     print("The fractal plot has been saved to 'fractal_plot.png'.")
     print("This plot visualizes the recursive structure of the binary data when interpreted through the lens of fractal mathematics.")
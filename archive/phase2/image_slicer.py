@@ -4,14 +4,18 @@ from PIL import Image
 import os
 import random
 
+from bitvector import BitVector
+from stage_registry import StageFailed
+
 def analyze_layered_images(binary_string, num_layers, output_dir="."):
     """Creates and saves layered and composite images from a binary string."""
     print(f"\n[ANALYSIS] Generating {num_layers}-layer images...")
     print("Methodology: The 300-bit string is divided into multiple layers, which are then visualized individually and as a composite image. This could reveal hidden structures that are not apparent in a single image.")
     image_paths = []
     try:
-        layer_len = len(binary_string) // num_layers
-        layers = [binary_string[i:i+layer_len] for i in range(0, len(binary_string), layer_len)]
+        bits = BitVector(binary_string)
+        layer_len = len(bits) // num_layers
+        layers = [bits[i:i+layer_len] for i in range(0, len(bits), layer_len)]
         
         composite = Image.new('RGBA', (20, 15), (0, 0, 0, 0))
         colors = [(255, 0, 0, 128), (0, 255, 0, 128), (0, 0, 255, 128), 
@@ -19,7 +23,7 @@ def analyze_layered_images(binary_string, num_layers, output_dir="."):
 
         for i, layer in enumerate(layers):
             if len(layer) == 300:
-                pixels = np.array([int(bit) for bit in layer])
+                pixels = layer.array
                 image_grid = pixels.reshape((15, 20))
                 
                 plt.figure(figsize=(8, 6))
@@ -45,6 +49,7 @@ def analyze_layered_images(binary_string, num_layers, output_dir="."):
 
     except Exception as e:
         print(f"An error occurred during layered image analysis: {e}")
+        raise StageFailed(str(e)) from e
     return image_paths
 
 def analyze_parity_layers(binary_string, output_dir="."):
@@ -53,7 +58,7 @@ def analyze_parity_layers(binary_string, output_dir="."):
     print("Methodology: The image is segmented into layers based on the parity (even or odd) of the number of '1's in each row and column. This can reveal hidden structures related to error-checking or data encoding schemes.")
     image_paths = []
     try:
-        pixels = np.array([int(bit) for bit in binary_string])
+        pixels = BitVector(binary_string).array
         image_grid = pixels.reshape((15, 20))
 
         row_parity = np.sum(image_grid, axis=1) % 2
@@ -94,6 +99,7 @@ def analyze_parity_layers(binary_string, output_dir="."):
 
     except Exception as e:
         print(f"An error occurred during parity layer analysis: {e}")
+        raise StageFailed(str(e)) from e
     return image_paths
 
 def analyze_with_hamming_code(binary_string, width, height, output_dir="."):
@@ -107,7 +113,7 @@ def analyze_with_hamming_code(binary_string, width, height, output_dir="."):
             print(f"Error: Binary string length ({len(binary_string)}) does not match image dimensions.")
             return image_paths
 
-        data_bits = np.array([int(b) for b in binary_string])
+        data_bits = BitVector(binary_string).array
         n = len(data_bits)
         r = 1
         while 2**r < n + r + 1:
@@ -187,4 +193,5 @@ def analyze_with_hamming_code(binary_string, width, height, output_dir="."):
 
     except Exception as e:
         print(f"An error occurred during Hamming code analysis: {e}")
+        raise StageFailed(str(e)) from e
     return image_paths
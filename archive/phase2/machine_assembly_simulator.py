@@ -2,6 +2,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 
+import assembly_engine
+
 # --- Constants ---
 BINARY_STRING = "110011111110011110001110111101111100011100100110001011000001100001110101110011011000111000000111001001101100100001001101001101111111111111000000011000101100000110011011100000111000101011111100110101100101111011101000101011001000001101111101110001110000010111001001111111101101111001011100111011111111"
 NUM_COMPONENTS = 26
@@ -16,12 +18,12 @@ INSTRUCTION_SET = {
     # Add more mappings as needed, for now, unassigned codes will be 'WAIT'
 }
 
-class Component:
-    def __init__(self, id):
-        self.id = id
-        self.pos = np.random.rand(2) * 10  # Random starting position in a 10x10 grid
-        self.active = True
-        self.attached_to = None
+# Engine opcodes; DETACH and the rotations have no effect on positions yet
+ENGINE_TABLE = {
+    "MOVE_UP": (assembly_engine.MOVE, (0, 1)), "MOVE_DOWN": (assembly_engine.MOVE, (0, -1)),
+    "MOVE_LEFT": (assembly_engine.MOVE, (-1, 0)), "MOVE_RIGHT": (assembly_engine.MOVE, (1, 0)),
+    "ATTACH": (assembly_engine.ATTACH, (0, 0)), "DEACTIVATE": (assembly_engine.DEACTIVATE, (0, 0)),
+}
 
 def parse_instructions(binary_data):
     """Parses the binary string into a list of instructions."""
@@ -30,48 +32,16 @@ def parse_instructions(binary_data):
 
 def simulate_assembly(instructions):
     """Simulates the assembly process and returns the history of component positions."""
-    components = [Component(i) for i in range(NUM_COMPONENTS)]
-    history = []
-
-    for i, instruction in enumerate(instructions):
-        comp_index = i % NUM_COMPONENTS
-        comp = components[comp_index]
-
-        if not comp.active:
-            # Record current state and continue
-            current_positions = np.array([c.pos for c in components])
-            history.append(current_positions)
-            continue
+    positions = np.random.rand(NUM_COMPONENTS, 2) * 10  # Random starting positions in a 10x10 grid
+    ops, args = assembly_engine.compile_program(instructions, ENGINE_TABLE)
+    history = assembly_engine.AssemblyEngine(positions).run(ops, args)
+    return history.pos[:, 0]
 
-        if instruction == "MOVE_UP":
-            comp.pos[1] += 1
-        elif instruction == "MOVE_DOWN":
-            comp.pos[1] -= 1
-        elif instruction == "MOVE_LEFT":
-            comp.pos[0] -= 1
-        elif instruction == "MOVE_RIGHT":
-            comp.pos[0] += 1
-        elif instruction == "ATTACH":
-            # Attach to the nearest active, unattached component
-            min_dist = float('inf')
-            target = None
-            for other_comp in components:
-                if other_comp.id != comp.id and other_comp.active and other_comp.attached_to is None:
-                    dist = np.linalg.norm(comp.pos - other_comp.pos)
-                    if dist < min_dist:
-                        min_dist = dist
-                        target = other_comp
-            if target:
-                comp.attached_to = target.id
-                comp.pos = target.pos + np.array([0.5, 0.5]) # Snap to target
-        elif instruction == "DEACTIVATE":
-            comp.active = False
-        
-        # Record the state of all components after this step
-        current_positions = np.array([c.pos for c in components])
-        history.append(current_positions)
-        
-    return history
+def simulate_seeds(instructions, seeds, num_components=NUM_COMPONENTS, record_every=1):
+    """Runs the same instructions from the starting positions of every seed in parallel."""
+    positions = assembly_engine.random_positions(seeds, num_components, 2, 0, 10)
+    ops, args = assembly_engine.compile_program(instructions, ENGINE_TABLE)
+    return assembly_engine.AssemblyEngine(positions).run(ops, args, record_every)
 
 def animate_simulation(history):
     """Creates and saves an animation of the assembly process."""
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Multi-Pattern Motif Scanner
+---------------------------------------------------
+Compiles any number of binary motifs (element codes, chemical formulae,
+command patterns, ...) into one Aho-Corasick automaton over the alphabet
+{0, 1}. A scan walks the bit stream once, whatever the number of motifs,
+instead of rescanning the whole string with str.find once per pattern.
+
+The automaton is a dense DFA: the failure links are folded into a
+(states x 2) transition table, and every state carries the ids of all the
+motifs that end there (merged along the suffix links). The walk only records
+the state after each bit. The hits are then expanded with numpy into
+parallel arrays of (pattern_id, position), where position is the index of
+the first bit of the match, sorted by position and then pattern id.
+
+Changing a few bits only affects the matches that overlap the changed window,
+so `rescan` patches an earlier result by rescanning max_length - 1 bits on
+either side of the window instead of the whole stream.
+
+`count_rows` walks many candidate messages of the same length in lockstep,
+with one table lookup per bit position for all of them.
+"""
+
+from collections import deque
+
+import numpy as np
+
+from bitvector import BitVector
+
+
+class MotifScanner:
+    """Aho-Corasick automaton over the bit alphabet for a fixed list of motifs."""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        if not self.patterns:
+            raise ValueError("MotifScanner needs at least one pattern.")
+        for pattern in self.patterns:
+            if not pattern or set(pattern) - {'0', '1'}:
+                raise ValueError(f"Motifs must be non-empty binary strings, got {pattern!r}.")
+        self.lengths = np.array([len(p) for p in self.patterns], dtype=np.int64)
+        self.max_length = int(self.lengths.max())
+
+        # 1. Trie of all motifs.
+        goto = [[-1, -1]]
+        outputs = [[]]
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                bit = ord(char) - 48
+                if goto[state][bit] == -1:
+                    goto[state][bit] = len(goto)
+                    goto.append([-1, -1])
+                    outputs.append([])
+                state = goto[state][bit]
+            outputs[state].append(pattern_id)
+
+        # 2. Failure links in BFS order, folded into the transition table.
+        fail = [0] * len(goto)
+        queue = deque()
+        for bit in (0, 1):
+            child = goto[0][bit]
+            if child == -1:
+                goto[0][bit] = 0
+            else:
+                queue.append(child)
+        while queue:
+            state = queue.popleft()
+            # The failure state is shallower, so its outputs are already complete.
+            outputs[state] = sorted(set(outputs[state]) | set(outputs[fail[state]]))
+            for bit in (0, 1):
+                child = goto[state][bit]
+                if child == -1:
+                    goto[state][bit] = goto[fail[state]][bit]
+                else:
+                    fail[child] = goto[fail[state]][bit]
+                    queue.append(child)
+
+        self._goto = [tuple(row) for row in goto]
+        counts = np.array([len(out) for out in outputs], dtype=np.int64)
+        self._out_count = counts
+        self._out_ptr = np.concatenate(([0], np.cumsum(counts)))
+        self._out_ids = np.array([pid for out in outputs for pid in out], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.patterns)
+
+    @staticmethod
+    def _symbols(bits):
+        if isinstance(bits, BitVector):
+            return bits.array
+        if isinstance(bits, np.ndarray):
+            return bits  # already a 0/1 array, e.g. a mutable working copy
+        return np.frombuffer(bits.encode('ascii'), dtype=np.uint8) - 48
+
+    def _walk(self, symbols):
+        """States of the automaton after each symbol, starting from the root."""
+        goto = self._goto
+        state = 0
+        states = np.empty(len(symbols), dtype=np.int64)
+        for i, bit in enumerate(symbols.tolist()):
+            state = goto[state][bit]
+            states[i] = state
+        return states
+
+    def _expand(self, states, offset):
+        """Turns walk states into (pattern_ids, positions) sorted by position then id."""
+        counts = self._out_count[states]
+        total = int(counts.sum())
+        if not total:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty.copy()
+        ends = np.repeat(np.arange(len(states), dtype=np.int64) + offset, counts)
+        firsts = np.repeat(self._out_ptr[states] - (np.cumsum(counts) - counts), counts)
+        ids = self._out_ids[firsts + np.arange(total)]
+        positions = ends - self.lengths[ids] + 1
+        order = np.lexsort((ids, positions))
+        return ids[order], positions[order]
+
+    def scan(self, bits, start=0, stop=None):
+        """
+        Every match lying entirely inside bits[start:stop], as two arrays
+        (pattern_ids, positions) with positions relative to the whole stream.
+        """
+        symbols = self._symbols(bits)[start:stop]
+        return self._expand(self._walk(symbols), start)
+
+    def count(self, bits, start=0, stop=None):
+        """Number of matches inside bits[start:stop] without materializing them."""
+        symbols = self._symbols(bits)[start:stop]
+        return int(self._out_count[self._walk(symbols)].sum())
+
+    def count_rows(self, rows):
+        """
+        Number of matches in every row of a 2-D 0/1 array. All rows are walked
+        together, one column at a time, through the transition table.
+        """
+        rows = np.asarray(rows)
+        table = np.array(self._goto, dtype=np.int64)
+        states = np.zeros(len(rows), dtype=np.int64)
+        totals = np.zeros(len(rows), dtype=np.int64)
+        for column in rows.T:
+            states = table[states, column]
+            totals += self._out_count[states]
+        return totals
+
+    def scan_overlapping(self, bits, start, stop):
+        """Matches that overlap the window [start, stop)."""
+        lo = max(0, start - self.max_length + 1)
+        hi = min(len(bits), stop + self.max_length - 1)
+        ids, positions = self.scan(bits, lo, hi)
+        keep = (positions < stop) & (positions + self.lengths[ids] > start)
+        return ids[keep], positions[keep]
+
+    def count_containing(self, bits, position):
+        """Number of matches that include the bit at `position`."""
+        lo = max(0, position - self.max_length + 1)
+        hi = min(len(bits), position + self.max_length)
+        ids, positions = self.scan(bits, lo, hi)
+        return int(np.count_nonzero((positions <= position) & (positions + self.lengths[ids] > position)))
+
+    def rescan(self, bits, ids, positions, start, stop):
+        """
+        Updates an earlier scan result after bits[start:stop] changed (the stream
+        length must be unchanged). Only matches overlapping the window are recomputed.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        positions = np.asarray(positions, dtype=np.int64)
+        stale = (positions < stop) & (positions + self.lengths[ids] > start)
+        new_ids, new_positions = self.scan_overlapping(bits, start, stop)
+        ids = np.concatenate((ids[~stale], new_ids))
+        positions = np.concatenate((positions[~stale], new_positions))
+        order = np.lexsort((ids, positions))
+        return ids[order], positions[order]
+
+    def first_positions(self, bits):
+        """Index of the first match of every pattern, or -1 where a pattern does not occur."""
+        ids, positions = self.scan(bits)
+        first = np.full(len(self.patterns), -1, dtype=np.int64)
+        # Positions are sorted, so the first assignment per id is its earliest match.
+        unique_ids, where = np.unique(ids, return_index=True)
+        first[unique_ids] = positions[where]
+        return first
+
+    def counts_per_pattern(self, bits):
+        """Number of matches of every pattern."""
+        ids, _ = self.scan(bits)
+        return np.bincount(ids, minlength=len(self.patterns))
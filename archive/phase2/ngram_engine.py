@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - N-gram Engine
+---------------------------------------------------
+Counts every n-gram of a bit stream for all n from 1 to N in one sweep.
+
+Each window of n bits is read as an integer code, first bit most significant.
+The codes for n + 1 follow from the codes for n in one vectorized step,
+
+    codes[n + 1] = (codes[n][:-1] << 1) | bits[n:],
+
+so all N widths cost O(N * len(bits)). The counts come from np.bincount over
+the 2**n possible codes (np.unique for wide n, where most codes never occur).
+
+For each n the engine compares the counts with the uniform expectation
+windows / 2**n and reports the chi-squared statistic. It also lists the most
+over- and under-represented grams.
+
+Usage:
+    python ngram_engine.py stream.txt --max-n 16
+"""
+
+import sys
+
+import numpy as np
+
+from bitvector import BitVector
+
+# Above this width a dense 2**n count array would be mostly zeros, so counts are kept sparse.
+DENSE_MAX_N = 20
+
+
+def iter_codes(bits, max_n, min_n=1):
+    """Yields (n, codes) with the integer code of every n-bit window, for n = min_n..max_n."""
+    if max_n > 64:
+        raise ValueError("N-gram codes are 64-bit integers, so n is limited to 64.")
+    symbols = BitVector(bits).array.astype(np.uint64)
+    codes = symbols
+    for n in range(1, min(max_n, len(symbols)) + 1):
+        if n > 1:
+            codes = (codes[:-1] << np.uint64(1)) | symbols[n - 1:]
+        if n >= min_n:
+            yield n, codes
+
+def gram(code, n):
+    """The n-bit gram for an integer code."""
+    return format(int(code), f'0{n}b')
+
+def ngram_counts(bits, max_n, min_n=1):
+    """
+    Returns {n: (codes, counts)} listing every gram that occurs, for n = min_n..max_n.
+    Codes are sorted in increasing order.
+    """
+    result = {}
+    for n, codes in iter_codes(bits, max_n, min_n):
+        if n <= DENSE_MAX_N:
+            counts = np.bincount(codes.astype(np.int64), minlength=1 << n)
+            present = np.flatnonzero(counts)
+            result[n] = (present.astype(np.uint64), counts[present])
+        else:
+            result[n] = np.unique(codes, return_counts=True)
+    return result
+
+def chi_squared_pvalue(statistic, dof):
+    """Upper-tail p-value of a chi-squared statistic, or None without SciPy."""
+    try:
+        # Imported here so that loading the engine does not pull in SciPy.
+        from scipy.stats import chi2
+    except ImportError:
+        return None
+    return float(chi2.sf(statistic, dof))
+
+def ngram_statistics(bits, max_n, min_n=1, top=5):
+    """
+    Per-n statistics against a uniform source: observed and expected counts,
+    chi-squared (over all 2**n grams, unseen ones included) and the `top` most
+    over- and under-represented grams.
+    """
+    stats = {}
+    for n, (codes, counts) in ngram_counts(bits, max_n, min_n).items():
+        windows = int(counts.sum())
+        cells = 2 ** n
+        expected = windows / cells
+        # Unseen grams contribute (0 - e)^2 / e = e each, which folds into the closed form below.
+        chi_squared = float((counts.astype(float) ** 2).sum() / expected - windows)
+        order = np.argsort(-counts, kind='stable')
+        over = [(gram(codes[i], n), int(counts[i])) for i in order[:top] if counts[i] > expected]
+        # Grams that never occur are the most under-represented; list the first few.
+        under = [(gram(code, n), 0) for code in _missing_codes(codes, n, top)]
+        under += [(gram(codes[i], n), int(counts[i])) for i in order[::-1][:top - len(under)] if counts[i] < expected]
+        stats[n] = {
+            "windows": windows,
+            "distinct": len(codes),
+            "expected": expected,
+            "chi_squared": chi_squared,
+            "dof": cells - 1,
+            "p_value": chi_squared_pvalue(chi_squared, cells - 1),
+            "over": over,
+            "under": under[:top],
+        }
+    return stats
+
+def _missing_codes(codes, n, limit):
+    """The smallest `limit` n-bit codes that do not appear in the sorted array `codes`."""
+    missing = []
+    candidate = 0
+    for code in codes.tolist() + [2 ** n]:
+        while candidate < code and len(missing) < limit:
+            missing.append(candidate)
+            candidate += 1
+        if len(missing) >= limit:
+            break
+        candidate = code + 1
+    return missing
+
+def format_statistics(stats):
+    """One summary line per n, in the style of the analysis logs."""
+    lines = []
+    for n, s in stats.items():
+        p_value = "n/a" if s["p_value"] is None else f"{s['p_value']:.4f}"
+        over = ", ".join(f"{g}:{c}" for g, c in s["over"][:3])
+        under = ", ".join(f"{g}:{c}" for g, c in s["under"][:3])
+        lines.append(f"    n={n:<2} distinct={s['distinct']:<5} expected={s['expected']:.2f}  "
+                     f"chi2={s['chi_squared']:.2f} (dof={s['dof']}, p={p_value})  over=[{over}]  under=[{under}]")
+    return lines
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    if not args:
+        print("Usage: python ngram_engine.py <file with a binary string | -> [--max-n N]")
+        return
+    max_n = int(args[args.index("--max-n") + 1]) if "--max-n" in args else 16
+    source = sys.stdin if args[0] == "-" else open(args[0])
+    with source:
+        bits = "".join(ch for ch in source.read() if ch in "01")
+    print(f"--- N-gram statistics for {len(bits)} bits, n = 1..{max_n} ---")
+    for line in format_statistics(ngram_statistics(bits, max_n)):
+        print(line)
+
+if __name__ == "__main__":
+    main()
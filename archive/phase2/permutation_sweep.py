@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Seeded Permutation Sweep
+---------------------------------------------------
+Screens many seeds as keys for a bit shuffle. Without this, the message is
+shuffled with one seed and one PNG is rendered per guess.
+
+The permutation of seed s sorts positions 0..n-1 by random keys: the first
+n outputs of a SplitMix64 generator seeded with s. SplitMix64 is
+counter-based, so the keys of a whole block of seeds are computed in one
+vectorized step and one argsort turns them into a (seeds x n) index matrix.
+Any seed in a sweep can be reproduced alone with `permuted`, which goes
+through the same function. One fancy-indexing step,
+bits[perms], applies every shuffle of the block at once. Each row is then
+read as an image (15 x 20 by default) and scored with vectorized
+reductions over the block:
+
+  * autocorrelation: Moran's I with rook (4-neighbour) adjacency, which is
+    positive when equal pixels cluster,
+  * run_length: mean length of the runs of equal pixels along rows and
+    columns,
+  * symmetry: fraction of pixels equal to their mirror image, for the
+    better of the left-right and up-down mirrors.
+
+The score is the sum of the metrics standardized over the whole sweep. Only
+the scores are kept, so millions of seeds can be screened over a process
+pool and only the top images need to be rendered.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from bitvector import BitVector
+from xor_keyspace import standardize
+
+IMAGE_SHAPE = (15, 20)
+BLOCK_SEEDS = 1 << 13
+GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+WEIGHTS = {'autocorrelation': 1.0, 'run_length': 1.0, 'symmetry': 1.0}
+METRICS = tuple(WEIGHTS)
+
+
+def splitmix64(x):
+    """SplitMix64 output mix of every element of a uint64 array (arithmetic wraps mod 2**64)."""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def seed_permutations(seeds, n):
+    """(seeds x n) matrix whose row i is the permutation of seeds[i], generated for all seeds at once."""
+    state = np.asarray(seeds, dtype=np.uint64)[:, None]
+    keys = splitmix64(state + np.arange(1, n + 1, dtype=np.uint64) * GOLDEN_GAMMA)
+    return np.argsort(keys, axis=1)
+
+def permuted(bits, seed):
+    """The message shuffled by one seed, as in a sweep: shuffled[i] = bits[perm[i]]."""
+    arr = BitVector(bits).array
+    return BitVector(arr[seed_permutations([seed], len(arr))[0]])
+
+def autocorrelation(images):
+    """Moran's I of every image with rook adjacency (0 for a constant image)."""
+    x = images - images.mean(axis=(1, 2), keepdims=True)
+    h, w = images.shape[1:]
+    pairs = x[:, :, 1:] * x[:, :, :-1]
+    cross = pairs.sum(axis=(1, 2)) + (x[:, 1:, :] * x[:, :-1, :]).sum(axis=(1, 2))
+    variance = (x * x).sum(axis=(1, 2))
+    n_pairs = h * (w - 1) + (h - 1) * w
+    out = np.zeros(len(images))
+    np.divide(h * w * cross, n_pairs * variance, out=out, where=variance > 0)
+    return out
+
+def run_length(images):
+    """Mean length of the runs of equal pixels, along rows and along columns."""
+    h, w = images.shape[1:]
+    row_runs = h + np.count_nonzero(images[:, :, 1:] != images[:, :, :-1], axis=(1, 2))
+    col_runs = w + np.count_nonzero(images[:, 1:, :] != images[:, :-1, :], axis=(1, 2))
+    return (h * w / row_runs + h * w / col_runs) / 2
+
+def symmetry(images):
+    """Fraction of pixels equal to their mirror, for the better of the two mirror axes."""
+    left_right = (images == images[:, :, ::-1]).mean(axis=(1, 2))
+    up_down = (images == images[:, ::-1, :]).mean(axis=(1, 2))
+    return np.maximum(left_right, up_down)
+
+def score_block(task):
+    """Raw metrics of every seed of one block."""
+    bits, seeds, shape = task
+    arr = BitVector(bits).array
+    images = arr[seed_permutations(seeds, len(arr))].reshape(len(seeds), *shape).astype(np.float64)
+    return {'autocorrelation': autocorrelation(images), 'run_length': run_length(images),
+            'symmetry': symmetry(images)}
+
+def sweep(bits, seeds=range(1 << 20), shape=IMAGE_SHAPE, top=10, weights=None, keep=(), max_workers=None):
+    """
+    Scores the image of every seed and returns the `top` rows (plus any seed of `keep` in
+    the sweep) sorted by rank: dicts with seed, rank, score and the raw metrics.
+    `max_workers=1` runs in this process.
+    """
+    bits = BitVector(bits)
+    if shape[0] * shape[1] != len(bits):
+        raise ValueError(f"A {shape[0]}x{shape[1]} image needs {shape[0] * shape[1]} bits, got {len(bits)}.")
+    weights = WEIGHTS if weights is None else weights
+    seeds = list(seeds)
+    tasks = [(str(bits), seeds[i:i + BLOCK_SEEDS], shape) for i in range(0, len(seeds), BLOCK_SEEDS)]
+    if max_workers == 1:
+        results = [score_block(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers or os.cpu_count()) as pool:
+            results = list(pool.map(score_block, tasks))
+    metrics = {name: np.concatenate([m[name] for m in results]) for name in METRICS}
+
+    score = sum(weight * standardize(metrics[name]) for name, weight in weights.items())
+    order = np.argsort(-score, kind='stable')
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(1, len(order) + 1)
+    chosen = list(order[:top])
+    index = {seed: i for i, seed in enumerate(seeds)} if keep else {}
+    chosen += [index[seed] for seed in keep if seed in index and index[seed] not in chosen]
+
+    return [{'seed': seeds[i], 'rank': int(rank[i]), 'score': float(score[i]),
+             **{name: float(metrics[name][i]) for name in METRICS}}
+            for i in sorted(chosen, key=lambda i: rank[i])]
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Primality Service
+---------------------------------------------------
+One deterministic primality test shared by every analyzer, replacing the
+unseeded Miller-Rabin copies and the trial-division helpers.
+
+  * n < 2**64: Miller-Rabin with the first twelve prime bases, which is
+    proven exact for every n < 3.3 * 10**24.
+  * larger n: the Baillie-PSW test (`gmpy2.is_bpsw_prp` when gmpy2 is
+    installed, otherwise a pure-Python strong Lucas test). No counterexample
+    is known.
+
+Both paths are reproducible: there is no random base selection. Results are
+memoized, and `is_prime_batch` answers a whole array of token values in one
+call. Small values are looked up in a sieve; the rest are deduplicated and
+tested once each.
+"""
+
+from functools import lru_cache
+from math import isqrt
+
+import numpy as np
+
+SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+DETERMINISTIC_LIMIT = 1 << 64
+SIEVE_LIMIT = 1 << 20
+
+
+def _gmpy2():
+    """The gmpy2 module, or None (imported here to keep startup fast)."""
+    try:
+        import gmpy2
+        return gmpy2
+    except ImportError:
+        return None
+
+def _strong_probable_prime(n, base):
+    """One strong Fermat (Miller-Rabin) round for odd n > 2."""
+    d, r = n - 1, 0
+    while not d & 1:
+        d >>= 1
+        r += 1
+    x = pow(base, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(r - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+def _jacobi(a, n):
+    a %= n
+    result = 1
+    while a:
+        while not a & 1:
+            a >>= 1
+            if n & 7 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a & 3 == 3 and n & 3 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+def _strong_lucas_probable_prime(n):
+    """Strong Lucas test with Selfridge's parameters, for odd n > 2 that is not a square."""
+    d = 5
+    while True:
+        j = _jacobi(d, n)
+        if j == -1:
+            break
+        if j == 0 and abs(d) != n:
+            return False
+        d = -d - 2 if d > 0 else -d + 2
+    p, q = 1, (1 - d) // 4
+    k, s = n + 1, 0
+    while not k & 1:
+        k >>= 1
+        s += 1
+
+    def halve(x):
+        return (x + n if x & 1 else x) // 2 % n
+
+    u, v, qk = 1, p, q % n
+    for bit in bin(k)[3:]:
+        u, v = u * v % n, (v * v - 2 * qk) % n
+        qk = qk * qk % n
+        if bit == '1':
+            u, v = halve(p * u + v), halve(d * u + p * v)
+            qk = qk * q % n
+    if u == 0 or v == 0:
+        return True
+    for _ in range(s - 1):
+        v = (v * v - 2 * qk) % n
+        qk = qk * qk % n
+        if v == 0:
+            return True
+    return False
+
+def _bpsw(n):
+    gmpy2 = _gmpy2()
+    if gmpy2 is not None:
+        return bool(gmpy2.is_bpsw_prp(n))
+    if isqrt(n) ** 2 == n:
+        return False
+    return _strong_probable_prime(n, 2) and _strong_lucas_probable_prime(n)
+
+@lru_cache(maxsize=1 << 16)
+def _is_prime(n):
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if n < SMALL_PRIMES[-1] ** 2:
+        return True
+    if n < DETERMINISTIC_LIMIT:
+        return all(_strong_probable_prime(n, base) for base in SMALL_PRIMES)
+    return _bpsw(n)
+
+def is_prime(n):
+    """Deterministic primality test for any non-negative integer (int, numpy int or mpz)."""
+    return _is_prime(int(n))
+
+@lru_cache(maxsize=1)
+def _sieve():
+    sieve = np.ones(SIEVE_LIMIT, dtype=bool)
+    sieve[:2] = False
+    for p in range(2, isqrt(SIEVE_LIMIT - 1) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = False
+    sieve.flags.writeable = False
+    return sieve
+
+def primes_below(limit):
+    """All primes < limit as an int64 array."""
+    if limit <= SIEVE_LIMIT:
+        return np.flatnonzero(_sieve()[:limit])
+    sieve = np.ones(limit, dtype=bool)
+    sieve[:2] = False
+    for p in range(2, isqrt(limit - 1) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = False
+    return np.flatnonzero(sieve)
+
+def is_prime_batch(values):
+    """
+    Primality of every value in a list or array, as a boolean array of the same shape.
+    Values below SIEVE_LIMIT are answered by the sieve, and each distinct larger
+    value is tested once.
+    """
+    arr = np.asarray(values)
+    if arr.dtype.kind in 'iu':
+        flat = arr.ravel()
+        result = np.zeros(flat.shape, dtype=bool)
+        small = (flat >= 0) & (flat < SIEVE_LIMIT)
+        result[small] = _sieve()[flat[small].astype(np.int64)]
+        large = ~small & (flat >= SIEVE_LIMIT)
+        if large.any():
+            unique, inverse = np.unique(flat[large], return_inverse=True)
+            result[large] = np.array([is_prime(v) for v in unique.tolist()], dtype=bool)[inverse]
+        return result.reshape(arr.shape)
+    # Big integers (object arrays, lists of int/mpz): test each distinct value once.
+    flat = [int(v) for v in arr.ravel().tolist()]
+    answers = {v: is_prime(v) for v in set(flat)}
+    return np.array([answers[v] for v in flat], dtype=bool).reshape(arr.shape)
@@ -1,35 +1,15 @@
 import math
-import random
+
+from primality import is_prime
+from factor_structure import factor_structure, special_prime_flags
+
+# Trial-division bound for the p-1 / p+1 factor structure, and the seconds spent on each cofactor.
+FACTOR_BOUND = 10 ** 6
+COFACTOR_BUDGET = 2.0
 
 # The 300-bit binary string identified as a prime number
 BINARY_PRIME = "110011111110011110001110111101111100011100100110001011000001100001110101110011011000111000000111001001101100100001001101001101111111111111000000011000101100000110011011100000111000101011111100110101100101111011101000101011001000001101111101110001110000010111001001111111101101111001011100111011111111"
 
-def miller_rabin(n, k=5):
-    """Miller-Rabin primality test."""
-    if n < 2:
-        return False
-    for p in [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]:
-        if n < p * p:
-            return True
-        if n % p == 0:
-            return False
-    r, s = 0, n - 1
-    while s % 2 == 0:
-        r += 1
-        s //= 2
-    for _ in range(k):
-        a = random.randint(2, n - 1)
-        x = pow(a, s, n)
-        if x == 1 or x == n - 1:
-            continue
-        for _ in range(r - 1):
-            x = (x * x) % n
-            if x == n - 1:
-                break
-        else:
-            return False
-    return True
-
 def analyze_prime_properties(p):
     """
     Investigates several mathematical properties of a given prime number p.
@@ -39,45 +19,40 @@ def analyze_prime_properties(p):
     # 1. Check for special prime types
     print("[1] Checking for special prime types...")
 
+    flags = special_prime_flags([p])
+
     # Sophie Germain Prime: p is a prime such that 2p + 1 is also prime.
-    if miller_rabin(2 * p + 1):
+    if flags["sophie_germain"][0]:
         print(f"  -> FINDING: The number is a Sophie Germain prime. (2p + 1 is also prime)")
     else:
         print("  -> Not a Sophie Germain prime.")
 
     # Safe Prime: p is a prime of the form 2q + 1, where q is also a prime.
-    q = (p - 1) // 2
-    if (p - 1) % 2 == 0 and miller_rabin(q):
+    if flags["safe"][0]:
         print(f"  -> FINDING: The number is a Safe Prime. (p-1)/2 is also prime.")
     else:
         print("  -> Not a Safe Prime.")
 
-    print("\n[2] Analyzing small factors of p-1 and p+1...")
-    
-    # Check for small factors up to a reasonable limit.
-    limit = 1000
-    p_minus_1_has_small_factors = False
-    p_plus_1_has_small_factors = False
-    
-    for i in range(2, limit):
-        if (p - 1) % i == 0:
-            p_minus_1_has_small_factors = True
-            break
-            
-    for i in range(2, limit):
-        if (p + 1) % i == 0:
-            p_plus_1_has_small_factors = True
-            break
+    print("\n[2] Analyzing the factor structure of p-1 and p+1...")
 
-    if p_minus_1_has_small_factors:
-        print(f"  -> FINDING: p-1 has at least one small factor (< {limit}). This is relevant for cryptographic applications.")
-    else:
-        print(f"  -> NOTE: p-1 appears to have no small factors (< {limit}).")
-        
-    if p_plus_1_has_small_factors:
-        print(f"  -> FINDING: p+1 has at least one small factor (< {limit}).")
-    else:
-        print(f"  -> NOTE: p+1 appears to have no small factors (< {limit}).")
+    # One batched sieve over every prime <= FACTOR_BOUND for both neighbours, then a
+    # short Pollard p-1 / rho attempt on whatever cofactor is left.
+    for label, entry in zip(("p-1", "p+1"), factor_structure([p - 1, p + 1], FACTOR_BOUND, COFACTOR_BUDGET)):
+        factors = " * ".join(f"{q}^{e}" if e > 1 else str(q) for q, e in entry["smooth_factors"].items())
+        print(f"  -> {label}: {FACTOR_BOUND}-smooth part = {factors or '1'}")
+        if entry["cofactor_is_prime"]:
+            print(f"     Cofactor is a {entry['cofactor_bits']}-bit PRIME.")
+        elif entry["cofactor_bits"]:
+            print(f"     Cofactor is a {entry['cofactor_bits']}-bit composite.")
+            found = entry.get("cofactor_factors")
+            if found:
+                print(f"     Pollard p-1 / rho found: {' * '.join(f'{q}^{e}' if e > 1 else str(q) for q, e in found.items())}")
+            for part in entry.get("cofactor_unfactored", []):
+                print(f"     Left unfactored: {part.bit_length()} bits")
+        if entry["smooth_factors"]:
+            print(f"  -> FINDING: {label} has small factors (<= {FACTOR_BOUND}). This is relevant for cryptographic applications.")
+        else:
+            print(f"  -> NOTE: {label} appears to have no small factors (<= {FACTOR_BOUND}).")
     
     print("\n[3] Conclusion and Interpretation")
     print("The primality of the number is a strong indicator of non-randomness, suggesting it was constructed intentionally.")
@@ -93,8 +68,8 @@ if __name__ == "__main__":
     prime_decimal = int(BINARY_PRIME, 2)
     
     # Verify it's prime before analyzing
-    if miller_rabin(prime_decimal):
-        print("Primality confirmed with Miller-Rabin test.\n")
+    if is_prime(prime_decimal):
+        print("The number passes the Baillie-PSW probable-prime test (no known counterexample).\n")
         analyze_prime_properties(prime_decimal)
     else:
         print("Error: The provided binary string does not represent a prime number.")
\ No newline at end of file
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Quantum Evolution Engine
+---------------------------------------------------
+Shared implementation of the QFT evolution model used across the analysis
+scripts. Each timestep applies the unitary DFT followed by a scalar phase
+shift of exp(2j * pi * FREQUENCY_OFFSET_KEY * i / (TIME_STEPS * 1e6)).
+
+Because the phase shifts are scalars they commute with the DFT, and the
+unitary DFT has period 4 (F^4 = I). The state at timestep t is therefore
+
+    state_t = F^(t mod 4) x * exp(2j * pi * key * t(t-1)/2 / (TIME_STEPS * 1e6))
+
+so the whole evolution needs three O(n log n) FFTs instead of one dense
+O(n^2) matrix product per timestep. `get_evolution` hands out one shared,
+memoizing QuantumEvolution per message so scripts that walk every timestep
+only ever evolve each state once.
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+from bitvector import BitVector
+
+
+def binary_to_state(binary_string):
+    """Maps a binary string or BitVector onto the +/-1 complex initial state of the model."""
+    if isinstance(binary_string, BitVector):
+        return binary_string.to_state()
+    return np.array([int(bit) * 2 - 1 for bit in binary_string], dtype=np.complex128)
+
+def state_to_binary(state):
+    """Collapses a complex state back to a binary string using the sign of its real part."""
+    return str(BitVector(np.real(state) >= 0))
+
+def qft_powers(initial_state):
+    """Returns the (4, n) array [x, Fx, F^2x, F^3x] for the unitary DFT F."""
+    # Imported here so that loading the engine does not pull in SciPy.
+    from scipy.fft import fft
+    powers = np.empty((4, len(initial_state)), dtype=np.complex128)
+    powers[0] = initial_state
+    for k in range(1, 4):
+        powers[k] = fft(powers[k - 1], norm='ortho')
+    return powers
+
+def cumulative_phase(t, freq_key, time_steps):
+    """Product of the per-step phase shifts applied during the first t timesteps."""
+    t = np.asarray(t, dtype=float)
+    return np.exp(1j * 2 * np.pi * freq_key * (t * (t - 1) / 2) / (time_steps * 1e6))
+
+def evolve_state(initial_state, t, freq_key, time_steps, powers=None):
+    """Returns the state after t evolution steps without replaying steps 0..t-1."""
+    if powers is None:
+        powers = qft_powers(initial_state)
+    return powers[t % 4] * cumulative_phase(t, freq_key, time_steps)
+
+def evolve_states(initial_state, num_steps, freq_key, time_steps, powers=None):
+    """Returns a (num_steps + 1, n) array holding the states for timesteps 0..num_steps."""
+    if powers is None:
+        powers = qft_powers(initial_state)
+    t = np.arange(num_steps + 1)
+    return powers[t % 4] * cumulative_phase(t, freq_key, time_steps)[:, None]
+
+
+class QuantumEvolution:
+    """
+    Evolution of a single binary message that memoizes every timestep it serves.
+
+    States, their binary collapses and the XOR deltas between consecutive
+    timesteps are computed once and then returned from the cache. Set
+    `max_cached` to bound the number of timesteps kept (least recently used
+    entries are dropped first); evicted timesteps are cheap to recompute
+    from the four cached DFT powers.
+    """
+
+    def __init__(self, initial_binary, freq_key, time_steps, max_cached=None):
+        self.initial_binary = initial_binary
+        self.freq_key = freq_key
+        self.time_steps = time_steps
+        self.max_cached = max_cached
+        self.initial_state = binary_to_state(initial_binary)
+        self._powers = qft_powers(self.initial_state)
+        self._states = OrderedDict()
+        self._bits = OrderedDict()
+        self._binary = OrderedDict()
+        self._deltas = OrderedDict()
+
+    def __len__(self):
+        return len(self.initial_state)
+
+    def _cached(self, cache, t, compute):
+        if t in cache:
+            cache.move_to_end(t)
+            return cache[t]
+        value = cache[t] = compute(t)
+        if self.max_cached is not None and len(cache) > self.max_cached:
+            cache.popitem(last=False)
+        return value
+
+    def state_at(self, t):
+        """Complex state after t evolution steps."""
+        return self._cached(self._states, t, lambda t: evolve_state(
+            self.initial_state, t, self.freq_key, self.time_steps, self._powers))
+
+    def bits_at(self, t):
+        """BitVector of the collapsed state after t evolution steps."""
+        return self._cached(self._bits, t, lambda t: BitVector(np.real(self.state_at(t)) >= 0))
+
+    def binary_state_at(self, t):
+        """Binary string of the collapsed state after t evolution steps."""
+        return self._cached(self._binary, t, lambda t: str(self.bits_at(t)))
+
+    def delta(self, t):
+        """XOR delta between the binary states at timesteps t and t+1."""
+        return self._cached(self._deltas, t, lambda t: str(self.bits_at(t) ^ self.bits_at(t + 1)))
+
+    def binary_states(self, num_steps):
+        """Binary states for timesteps 0..num_steps."""
+        return [self.binary_state_at(t) for t in range(num_steps + 1)]
+
+    def deltas(self, num_steps):
+        """XOR deltas for the transitions 0->1 .. (num_steps-1)->num_steps."""
+        return [self.delta(t) for t in range(num_steps)]
+
+
+@lru_cache(maxsize=None)
+def get_evolution(initial_binary, freq_key, time_steps):
+    """Returns the shared QuantumEvolution for a message, creating it on first use."""
+    return QuantumEvolution(initial_binary, freq_key, time_steps)
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Symbolic Relation Detector
+---------------------------------------------------
+Tests a library of arithmetic relations (a = b * c, a = b + c,
+a^2 + b^2 = c^2, ...) between the token values of every sliding window at
+once, instead of unpacking windows one by one in Python.
+
+Each relation is written as a residual and a scale over numpy arrays of
+operands. A window matches when the operands in `nonzero` are non-zero and
+
+    |residual| / |scale| <= tolerance.
+
+The operands of a window at anchor i are the tokens at i + p for a
+placement p. By default the placement is consecutive, (0, 1, 2) for three
+operands. With `gapped=True` every increasing placement inside the window
+that starts at 0 is tested, so larger windows find relations between
+tokens that are not adjacent. The residuals are exact integer arithmetic
+(int64 when the values are small enough, Python ints otherwise), so a zero
+tolerance means exact equality. The relative errors are computed once and
+then compared against every tolerance of a sweep.
+
+Relations that compute the same test under different names (F = ma and
+E = hf are both a = b * c) are found by evaluating the relations on a fixed
+probe grid. They are merged into the first one, and its hits list the other
+names as `aliases`.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+from itertools import combinations, product
+
+import numpy as np
+
+Relation = namedtuple('Relation', 'name formula arity residual scale nonzero')
+Relation.__doc__ = """
+An arithmetic relation over `arity` operands. residual(*ops) and scale(*ops)
+map operand arrays to arrays; `nonzero` lists the operand indices that must
+not be zero; `formula` is formatted with the operand values.
+"""
+
+DEFAULT_RELATIONS = (
+    Relation('symbolic_axbc', '{0} = {1} * {2}', 3,
+             lambda a, b, c: a - b * c, lambda a, b, c: a, (0, 1, 2)),
+    Relation('symbolic_axbc2', '{0} = {1} * {2}^2', 3,
+             lambda a, b, c: a - b * c * c, lambda a, b, c: a, (0, 1, 2)),
+    Relation('symbolic_axbpc', '{0} = {1} + {2}', 3,
+             lambda a, b, c: a - (b + c), lambda a, b, c: a, (0,)),
+    Relation('symbolic_pythagorean', '{0}^2 + {1}^2 = {2}^2', 3,
+             lambda a, b, c: c * c - (a * a + b * b), lambda a, b, c: c * c, (2,)),
+    Relation('symbolic_fma', '{0} = {1} * {2}', 3,
+             lambda a, b, c: a - b * c, lambda a, b, c: a, (0, 1, 2)),
+    Relation('symbolic_ehf', '{0} = {1} * {2}', 3,
+             lambda a, b, c: a - b * c, lambda a, b, c: a, (0, 1, 2)),
+)
+
+# Magnitudes below this bound keep products of up to three operands (plus a sum) inside int64.
+INT64_SAFE = 1 << 20
+
+
+@lru_cache(maxsize=8)
+def _probe(arity):
+    """Every combination of small operand values, zero and negatives included."""
+    return np.array(list(product(range(-3, 6), repeat=arity)), dtype=np.int64).T
+
+def _signature(relation):
+    """What a relation computes on the probe grid, used to spot equivalent relations."""
+    ops = list(_probe(relation.arity))
+    mask = np.ones(len(ops[0]), dtype=bool)
+    for k in relation.nonzero:
+        mask &= ops[k] != 0
+    residual = np.abs(relation.residual(*ops))
+    scale = np.abs(relation.scale(*ops))
+    # The relative error a / b is compared as the pair (a, b) reduced by their gcd.
+    g = np.gcd(residual, scale)
+    g[g == 0] = 1
+    return relation.arity, (mask * (residual // g)).tobytes(), (mask * (scale // g)).tobytes(), mask.tobytes()
+
+def dedupe_relations(relations):
+    """[(relation, [alias names])] with every equivalent relation merged into its first occurrence."""
+    merged = {}
+    for relation in relations:
+        key = _signature(relation)
+        if key in merged:
+            merged[key][1].append(relation.name)
+        else:
+            merged[key] = (relation, [])
+    return list(merged.values())
+
+def placements(arity, window, gapped=False):
+    """Operand offsets inside a window: consecutive, or every increasing choice starting at 0."""
+    if not gapped:
+        return [tuple(range(arity))]
+    return [(0,) + rest for rest in combinations(range(1, window), arity - 1)]
+
+
+class RelationDetector:
+    """Evaluates a relation library over every window of a token sequence."""
+
+    def __init__(self, relations=DEFAULT_RELATIONS, window=5, gapped=False):
+        self.relations = dedupe_relations(relations)
+        self.window = window
+        self.gapped = gapped
+        for relation, _ in self.relations:
+            if relation.arity > window:
+                raise ValueError(f"{relation.name} needs {relation.arity} operands, more than the window of {window}.")
+
+    def relative_errors(self, values):
+        """
+        Yields (relation index, placement, errors) where errors[i] is the relative error
+        of the window anchored at token i (inf where a required operand is zero).
+        """
+        values = np.asarray(values)
+        anchors = len(values) - self.window + 1
+        if anchors <= 0:
+            return
+        if values.dtype.kind in 'iu' and (values.size == 0 or max(-int(values.min()), int(values.max())) < INT64_SAFE):
+            values = values.astype(np.int64)
+        else:
+            values = np.array([int(v) for v in values.tolist()], dtype=object)
+        for index, (relation, _) in enumerate(self.relations):
+            for placement in placements(relation.arity, self.window, self.gapped):
+                ops = [values[p:p + anchors] for p in placement]
+                ok = np.ones(anchors, dtype=bool)
+                for k in relation.nonzero:
+                    ok &= ops[k] != 0
+                residual = np.abs(relation.residual(*ops)).astype(float)
+                scale = np.abs(relation.scale(*ops)).astype(float)
+                errors = np.full(anchors, np.inf)
+                np.divide(residual, scale, out=errors, where=ok & (scale != 0))
+                # An exact residual of zero is a match even when float division would round.
+                errors[ok & (residual == 0)] = 0.0
+                yield index, placement, errors
+
+    def detect(self, values, bit_starts=None, tolerances=(0.0,)):
+        """
+        Hits for every tolerance of the sweep, in sweep order, each sorted by anchor and
+        then relation: dicts with type, formula, token_start, bit_start and tolerance
+        (plus aliases of merged relations and, when gapped, the operand positions).
+        """
+        values = np.asarray(values)
+        python_values = values.tolist()
+        bit_starts = list(range(len(values))) if bit_starts is None else np.asarray(bit_starts).tolist()
+        evaluated = list(self.relative_errors(values))
+        results = []
+        for tolerance in tolerances:
+            hits = []
+            for index, placement, errors in evaluated:
+                for anchor in np.flatnonzero(errors <= tolerance).tolist():
+                    hits.append((anchor, index, placement))
+            hits.sort()
+            for anchor, index, placement in hits:
+                relation, aliases = self.relations[index]
+                ops = [python_values[anchor + p] for p in placement]
+                hit = {'type': relation.name, 'formula': relation.formula.format(*ops),
+                       'token_start': anchor, 'bit_start': bit_starts[anchor], 'tolerance': tolerance}
+                if aliases:
+                    hit['aliases'] = list(aliases)
+                if self.gapped:
+                    hit['positions'] = [anchor + p for p in placement]
+                results.append(hit)
+        return results
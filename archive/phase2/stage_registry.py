@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Analysis Stage Registry & Scheduler
+---------------------------------------------------
+Each analysis stage declares the named values it consumes (`inputs`) and the
+named values it produces (`outputs`). The registry resolves those names into
+a dependency graph and runs every stage as soon as its inputs exist, with
+independent stages running side by side on a process pool. Shared
+intermediates (the decoded message, evolution states, ...) are produced once
+by their stage and handed to every consumer. A full run then takes about as
+long as the slowest chain of stages, not the sum of all of them.
+
+Stages print as they always have. Each stage's console output is captured
+in the worker and replayed in registration order, so the analysis log reads
+the same as a sequential run.
+
+When `run` is given an ArtifactCache, each stage is looked up by its name,
+version, dependencies, inputs and parameters first. A hit restores the
+stage's result, log and `artifacts` (the files it writes) without running
+it. Only stages that return normally are stored: a stage that raises runs
+again next time. A stage that prints its own error message raises
+StageFailed, so the failure is not logged a second time.
+"""
+
+import contextlib
+import io
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+
+class StageFailed(Exception):
+    """Raised by a stage that has already reported its failure in its log."""
+
+
+class Stage:
+    """A single analysis step: func(*inputs, *args, **kwargs) -> outputs."""
+
+    def __init__(self, name, func, inputs=(), outputs=(), args=(), kwargs=None, inline=False,
+                 version=1, artifacts=(), cacheable=True):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.args = tuple(args)
+        self.kwargs = dict(kwargs or {})
+        # Inline stages are cheap enough that shipping them to a worker costs more than running them.
+        self.inline = inline
+        self.version = version
+        self.artifacts = list(artifacts)
+        # Stages that depend on unseeded randomness or external services should not be cached.
+        self.cacheable = cacheable
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, inputs={self.inputs}, outputs={self.outputs})"
+
+
+def _run_stage(func, args, kwargs):
+    """Runs one stage with its stdout captured. Returns (ok, result or error, log)."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        try:
+            return True, func(*args, **kwargs), buffer.getvalue()
+        except Exception as e:
+            return False, e, buffer.getvalue()
+
+
+class StageRegistry:
+    """Ordered collection of stages plus the dependency-aware scheduler that runs them."""
+
+    def __init__(self):
+        self.stages = []
+
+    def add(self, name, func, inputs=(), outputs=(), args=(), kwargs=None, inline=False,
+            version=1, artifacts=(), cacheable=True):
+        """Registers a stage and returns it."""
+        if any(stage.name == name for stage in self.stages):
+            raise ValueError(f"Stage '{name}' is already registered.")
+        stage = Stage(name, func, inputs, outputs, args, kwargs, inline, version, artifacts, cacheable)
+        self.stages.append(stage)
+        return stage
+
+    def producers(self):
+        """Maps every output name to the stage that produces it."""
+        producers = {}
+        for stage in self.stages:
+            for output in stage.outputs:
+                if output in producers:
+                    raise ValueError(f"'{output}' is produced by both '{producers[output].name}' and '{stage.name}'.")
+                producers[output] = stage
+        return producers
+
+    def validate(self, available=()):
+        """Checks that every input is either available up front or produced by a stage."""
+        producers = self.producers()
+        for stage in self.stages:
+            for name in stage.inputs:
+                if name not in producers and name not in available:
+                    raise ValueError(f"Stage '{stage.name}' needs '{name}', which nothing provides.")
+
+    def run(self, values=None, max_workers=None, cache=None):
+        """
+        Runs every registered stage and returns the dict of all named values.
+
+        `values` seeds the run with intermediates computed beforehand.
+        `max_workers=1` runs everything sequentially in this process.
+        `cache` is an optional ArtifactCache consulted before each stage.
+        """
+        values = dict(values or {})
+        self.validate(values)
+        pending = list(self.stages)
+        finished = {}  # stage name -> log text
+        unavailable = set()  # outputs of failed or skipped stages
+        log_cursor = 0
+        cache_keys = {}  # stage name -> cache key of the run in flight
+
+        def flush_logs():
+            nonlocal log_cursor
+            while log_cursor < len(self.stages) and self.stages[log_cursor].name in finished:
+                print(finished[self.stages[log_cursor].name], end="")
+                log_cursor += 1
+
+        def complete(stage, ok, result, log):
+            if ok:
+                if len(stage.outputs) == 1:
+                    values[stage.outputs[0]] = result
+                elif stage.outputs:
+                    values.update(zip(stage.outputs, result))
+                if stage.name in cache_keys:
+                    cache.store(cache_keys[stage.name], result, log, stage.artifacts)
+            else:
+                if not isinstance(result, StageFailed):
+                    log += f"An error occurred during stage '{stage.name}': {result}\n"
+                unavailable.update(stage.outputs)
+            finished[stage.name] = log
+            flush_logs()
+
+        pool = ProcessPoolExecutor(max_workers or os.cpu_count()) if max_workers != 1 else None
+        running = {}
+        try:
+            while pending or running:
+                # Skipping a stage or finishing one in-process can unblock stages registered before it,
+                # so rescan until a pass starts, finishes or skips nothing.
+                progress = True
+                while progress:
+                    progress = False
+                    for stage in list(pending):
+                        blocked = [name for name in stage.inputs if name in unavailable]
+                        if blocked:
+                            pending.remove(stage)
+                            progress = True
+                            unavailable.update(stage.outputs)
+                            finished[stage.name] = f"\n[SKIPPED] Stage '{stage.name}': missing input(s) {blocked}.\n"
+                            flush_logs()
+                            continue
+                        if not all(name in values for name in stage.inputs):
+                            continue
+                        pending.remove(stage)
+                        progress = True
+                        args = [values[name] for name in stage.inputs] + list(stage.args)
+                        if cache is not None and stage.cacheable:
+                            key = cache.key(stage.name, stage.version, stage.func, args,
+                                            [stage.kwargs, stage.artifacts])
+                            hit = cache.load(key)
+                            if hit is not None:
+                                complete(stage, True, *hit)
+                                continue
+                            cache_keys[stage.name] = key
+                        if pool is None or stage.inline:
+                            complete(stage, *_run_stage(stage.func, args, stage.kwargs))
+                        else:
+                            running[pool.submit(_run_stage, stage.func, args, stage.kwargs)] = stage
+
+                if not running:
+                    # Nothing is in flight and a full pass changed nothing: what is left waits on itself.
+                    if pending:
+                        waiting = {stage.name: [n for n in stage.inputs if n not in values] for stage in pending}
+                        raise ValueError(f"Stage dependencies form a cycle: {waiting}")
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    try:
+                        complete(stage, *future.result())
+                    except Exception as e:  # the stage or its result could not be pickled
+                        complete(stage, False, e, "")
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            if cache is not None:
+                cache.evict()
+        return values
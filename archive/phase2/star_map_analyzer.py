@@ -2,10 +2,14 @@ import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 
+import star_map_sweep
+
 # --- Constants ---
 BINARY_STRING = "110011111110011110001110111101111100011100100110001011000001100001110101110011011000111000000111001001101100100001001101001101111111111111000000011000101100000110011011100000111000101011111100110101100101111011101000101011001000001101111101110001110000010111001001111111101101111001011100111011111111"
 NUM_OBJECTS = 26
 SCALING_FACTOR = 1868
+SWEEP_TOP = 10
+SWEEP_RENDER_TOP = 4
 
 def split_data_into_chunks(binary_data, num_chunks):
     """
@@ -76,6 +80,32 @@ def plot_star_map(coordinates):
     print(f"\n3D star map plot saved to '{output_path}'")
     plt.close()
 
+def sweep_configurations(binary_data):
+    """
+    Ranks every (number of objects, bit-split rule) configuration and renders the best ones.
+    """
+    print("\n--- Configuration Sweep ---")
+    rows = star_map_sweep.sweep(binary_data, top=SWEEP_TOP, keep=[(NUM_OBJECTS, 'remainder_z')])
+    for row in rows:
+        marker = " <- current configuration" if (row['num_objects'], row['rule']) == (NUM_OBJECTS, 'remainder_z') else ""
+        print(f"#{row['rank']:<4} objects={row['num_objects']:>3} split={row['rule']:<12} score={row['score']:6.2f} "
+              f"nn_ratio={row['nn_ratio']:.2f} (z={row['nn_ratio_z']:+.1f}) "
+              f"planarity={row['planarity']:.2f} (z={row['planarity_z']:+.1f}) "
+              f"clustering={row['clustering']:.2f} (z={row['clustering_z']:+.1f}){marker}")
+
+    fig = plt.figure(figsize=(16, 16))
+    for i, row in enumerate(rows[:SWEEP_RENDER_TOP]):
+        coordinates = star_map_sweep.coordinates(binary_data, row['num_objects'], row['rule'], SCALING_FACTOR)
+        ax = fig.add_subplot(2, 2, i + 1, projection='3d')
+        ax.scatter(coordinates[:, 0], coordinates[:, 1], coordinates[:, 2], s=50, c='yellow', marker='*')
+        ax.set_title(f"#{row['rank']}: {row['num_objects']} objects, {row['rule']}")
+        ax.set_facecolor('black')
+    output_path = "star_map_sweep_top.png"
+    plt.savefig(output_path)
+    plt.close()
+    print(f"Top {min(SWEEP_RENDER_TOP, len(rows))} configurations saved to '{output_path}'")
+    return rows
+
 def main():
     """
     Runs the star map analysis script.
@@ -94,8 +124,11 @@ def main():
     
     # 3. Plot the map
     plot_star_map(coordinates)
+
+    # 4. Rank every other configuration
+    sweep_configurations(BINARY_STRING)
     
-    # 4. Interpretation
+    # 5. Interpretation
     print("\n--- Interpretation ---")
     print("The 3D plot has been saved to 'star_map_plot.png'.")
     print("Review the plot to look for any recognizable patterns, such as:")
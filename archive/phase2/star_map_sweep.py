@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Star Map Configuration Sweep
+---------------------------------------------------
+Ranks every (number of objects, bit-split rule) reading of the message as a
+3D point cloud. Without this, one guessed configuration (26 objects) is
+plotted.
+
+The message is cut into `num_objects` chunks of nearly equal length (the
+first len % num_objects chunks get one extra bit), as
+split_data_into_chunks does. Each chunk's bits are dealt to the x, y and z
+fields by a split rule:
+
+  * remainder_z, remainder_x, remainder_y: contiguous thirds, with the
+    leftover bits going to the named axis (remainder_z is the original
+    n // 3, n // 3, rest),
+  * interleaved: bit i of the chunk goes to axis i % 3.
+
+Configurations whose chunks are too short for MIN_FIELD_BITS bits per axis
+are skipped. Every field is normalized to [0, 1] by dividing by 2**k - 1.
+A configuration is therefore a fixed linear map from bits to coordinates:
+a (bits x 3 * num_objects) matrix. The point clouds of the message and of
+all its shuffles come out of one matrix product.
+
+Each cloud is scored with cheap geometric statistics:
+
+  * nn_ratio: Clark-Evans ratio of the mean nearest-neighbour distance to
+    its value for uniform random points (< 1 clustered, > 1 regular),
+  * nn_cv: coefficient of variation of the nearest-neighbour distances
+    (low for lattice-like spacing),
+  * planarity: 1 - 3 * (smallest principal variance / total variance),
+  * clustering: fraction of points whose nearest neighbour is closer than
+    half the uniform expectation.
+
+Small clouds look planar and sparse ones look clustered whatever the bits
+are. So every statistic is compared with the same configuration applied
+to NULL_SHUFFLES random shuffles of the message, which keep the number of
+ones. The score is the sum of the z-scores in the interesting direction.
+The nearest neighbours use scipy's cKDTree when SciPy is installed, and
+pairwise distances otherwise. The scaling factor multiplies every
+coordinate, so it does not change any of the statistics.
+"""
+
+from functools import lru_cache
+from math import gamma, pi
+
+import numpy as np
+
+from bitvector import BitVector
+
+OBJECT_COUNTS = range(4, 101)
+SPLIT_RULES = ('remainder_z', 'remainder_x', 'remainder_y', 'interleaved')
+# Narrower fields put the points on a coarse lattice full of duplicates.
+MIN_FIELD_BITS = 3
+NULL_SHUFFLES = 32
+NULL_SEED = 0
+# +1: higher is more structured, -1: lower is, 0: either direction.
+DIRECTIONS = {'nn_ratio': 0, 'nn_cv': -1, 'planarity': 1, 'clustering': 1}
+METRICS = tuple(DIRECTIONS)
+# Mean nearest-neighbour distance of uniform random points at unit density in 3D.
+CLARK_EVANS_3D = gamma(4 / 3) * (4 * pi / 3) ** (-1 / 3)
+
+
+def field_layout(n_bits, num_objects, rule='remainder_z'):
+    """
+    (group, exponent, width) per bit: group = 3 * object + axis, the bit's weight is
+    2**exponent inside its field, and width is the number of bits in that field.
+    """
+    if not 0 < num_objects <= n_bits:
+        raise ValueError(f"Cannot split {n_bits} bits into {num_objects} objects.")
+    base, remainder = divmod(n_bits, num_objects)
+    lengths = base + (np.arange(num_objects) < remainder)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    obj = np.repeat(np.arange(num_objects), lengths)
+    pos = np.arange(n_bits) - starts[obj]
+    n = lengths[obj]
+    if rule == 'interleaved':
+        axis = pos % 3
+        field_pos = pos // 3
+        width = (n - axis + 2) // 3
+    else:
+        sizes = np.stack([n // 3] * 3)
+        leftover = n - 2 * (n // 3)
+        sizes[{'remainder_x': 0, 'remainder_y': 1, 'remainder_z': 2}[rule]] = leftover
+        ends = np.cumsum(sizes, axis=0)
+        axis = (pos >= ends[0]).astype(np.int64) + (pos >= ends[1])
+        field_start = np.where(axis == 0, 0, ends[np.maximum(axis - 1, 0), np.arange(n_bits)])
+        field_pos = pos - field_start
+        width = sizes[axis, np.arange(n_bits)]
+    return 3 * obj + axis, width - 1 - field_pos, width
+
+@lru_cache(maxsize=1024)
+def coordinate_matrix(n_bits, num_objects, rule='remainder_z'):
+    """(bits x 3 * num_objects) matrix mapping a bit row to flattened normalized coordinates."""
+    group, exponent, width = field_layout(n_bits, num_objects, rule)
+    matrix = np.zeros((n_bits, 3 * num_objects))
+    matrix[np.arange(n_bits), group] = np.exp2(exponent) / (np.exp2(width) - 1)
+    matrix.flags.writeable = False
+    return matrix
+
+def coordinates(bits, num_objects, rule='remainder_z', scale=1.0):
+    """(num_objects x 3) coordinates of one configuration, in [0, scale]."""
+    arr = BitVector(bits).array
+    return (arr @ coordinate_matrix(len(arr), num_objects, rule)).reshape(num_objects, 3) * scale
+
+def _kdtree():
+    try:
+        # Imported here so that loading the sweep does not pull in SciPy.
+        from scipy.spatial import cKDTree
+    except ImportError:
+        return None
+    return cKDTree
+
+def nearest_neighbour_distances(clouds):
+    """(clouds x points) distance from every point to its nearest neighbour."""
+    tree = _kdtree()
+    if tree is not None:
+        return np.stack([tree(cloud).query(cloud, k=2)[0][:, 1] for cloud in clouds])
+    diff = clouds[:, :, None, :] - clouds[:, None, :, :]
+    dist = np.sqrt((diff * diff).sum(axis=-1))
+    idx = np.arange(clouds.shape[1])
+    dist[:, idx, idx] = np.inf
+    return dist.min(axis=2)
+
+def cloud_statistics(clouds):
+    """{metric: array over clouds} for a (clouds x points x 3) batch in the unit cube."""
+    m = clouds.shape[1]
+    nn = nearest_neighbour_distances(clouds)
+    expected = CLARK_EVANS_3D * m ** (-1 / 3)
+    mean = nn.mean(axis=1)
+    centered = clouds - clouds.mean(axis=1, keepdims=True)
+    eig = np.linalg.eigvalsh(np.einsum('bpi,bpj->bij', centered, centered) / m)
+    total = eig.sum(axis=1)
+    return {
+        'nn_ratio': mean / expected,
+        'nn_cv': np.divide(nn.std(axis=1), mean, out=np.zeros_like(mean), where=mean > 0),
+        'planarity': np.where(total > 0, 1 - 3 * eig[:, 0] / np.where(total > 0, total, 1), 0.0),
+        'clustering': (nn < expected / 2).mean(axis=1),
+    }
+
+def sweep(bits, object_counts=OBJECT_COUNTS, rules=SPLIT_RULES, shuffles=NULL_SHUFFLES, seed=NULL_SEED, top=10,
+          keep=()):
+    """
+    Scores every (num_objects, rule) configuration against shuffled copies of the message.
+    Returns the `top` rows by score, plus any (num_objects, rule) pair in `keep`: dicts
+    with num_objects, rule, rank, score and, per metric, the observed value and its
+    z-score against the shuffles.
+    """
+    arr = BitVector(bits).array
+    rng = np.random.default_rng(seed)
+    batch = np.vstack([arr] + [rng.permutation(arr) for _ in range(shuffles)]).astype(np.float64)
+    rows = []
+    for num_objects in object_counts:
+        if len(arr) // num_objects < 3 * MIN_FIELD_BITS:
+            continue
+        for rule in rules:
+            clouds = (batch @ coordinate_matrix(len(arr), num_objects, rule)).reshape(len(batch), num_objects, 3)
+            stats = cloud_statistics(clouds)
+            row = {'num_objects': num_objects, 'rule': rule, 'score': 0.0}
+            for name, direction in DIRECTIONS.items():
+                observed, null = stats[name][0], stats[name][1:]
+                std = null.std()
+                z = (observed - null.mean()) / std if std > 0 else 0.0
+                row[name] = float(observed)
+                row[f'{name}_z'] = float(z)
+                row['score'] += float(abs(z) if direction == 0 else direction * z)
+            rows.append(row)
+    rows.sort(key=lambda row: -row['score'])
+    for rank, row in enumerate(rows, 1):
+        row['rank'] = rank
+    keep = set(keep)
+    return [row for row in rows if row['rank'] <= top or (row['num_objects'], row['rule']) in keep]
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Artifact cache tests. Run with: python -m pytest archive/phase2/test_artifact_cache.py"""
+
+import sys
+
+import pytest
+
+from artifact_cache import ArtifactCache, dependency_digest, package_version
+from stage_registry import StageFailed, StageRegistry
+
+SCALE = 2
+
+
+def scaled(value):
+    return value * SCALE
+
+def uses_missing_package(value):
+    import a_package_that_is_not_installed
+    return a_package_that_is_not_installed.scaled(value)
+
+def reports_failure(value):
+    try:
+        raise RuntimeError("boom")
+    except Exception as e:
+        print(f"An error occurred during the demonstration: {e}")
+        raise StageFailed(str(e)) from e
+
+def prints_error_text(value):
+    print("Error: this line is part of the normal output.")
+    return value
+
+
+def test_key_follows_module_constants(monkeypatch):
+    before = dependency_digest(scaled)
+    monkeypatch.setattr(sys.modules[__name__], "SCALE", 3)
+    assert dependency_digest(scaled) != before
+
+def test_key_records_missing_packages():
+    assert package_version("a_package_that_is_not_installed") == "missing"
+    assert dependency_digest(uses_missing_package) != dependency_digest(scaled)
+
+@pytest.mark.parametrize("func", [uses_missing_package, reports_failure])
+def test_failed_stages_are_not_cached(func, tmp_path):
+    for _ in range(2):
+        cache = ArtifactCache(str(tmp_path))
+        registry = StageRegistry()
+        registry.add("stage", func, inputs=["value"], outputs=["result"])
+        registry.run({"value": 1}, max_workers=1, cache=cache)
+        assert cache.hits == 0 and not cache.entries()
+
+def test_successful_stage_is_restored(tmp_path):
+    for hits in (0, 1):
+        cache = ArtifactCache(str(tmp_path))
+        registry = StageRegistry()
+        registry.add("stage", scaled, inputs=["value"], outputs=["result"])
+        assert registry.run({"value": 2}, max_workers=1, cache=cache)["result"] == 4
+        assert cache.hits == hits
+
+def test_caching_ignores_the_log_text(tmp_path):
+    for hits in (0, 1):
+        cache = ArtifactCache(str(tmp_path))
+        registry = StageRegistry()
+        registry.add("stage", prints_error_text, inputs=["value"], outputs=["result"])
+        registry.run({"value": 1}, max_workers=1, cache=cache)
+        assert cache.hits == hits
+
+def test_reported_failure_is_logged_once(tmp_path, capsys):
+    registry = StageRegistry()
+    registry.add("stage", reports_failure, inputs=["value"], outputs=["result"])
+    assert "result" not in registry.run({"value": 1}, max_workers=1)
+    log = capsys.readouterr().out
+    assert log.count("boom") == 1
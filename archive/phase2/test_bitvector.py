@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+"""BitVector tests. Run with: python -m pytest archive/phase2/test_bitvector.py"""
+
+from bitvector import BitVector
+
+
+def test_flip_toggles_repeated_positions_once_per_occurrence():
+    assert str(BitVector("0000").flip([1, 1, 2])) == "0010"
+
+def test_from_bytes_left_pads_short_input():
+    assert str(BitVector.from_bytes(b"\xff", 12)) == "000011111111"
+    assert str(BitVector.from_bytes(b"\xff", 4)) == "1111"
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Scheduler tests for stage_registry. Run with: python -m pytest archive/phase2/test_stage_registry.py"""
+
+import pytest
+
+from stage_registry import StageRegistry
+
+
+def fail():
+    raise RuntimeError("producer failed")
+
+def produce():
+    return 1
+
+def consume(value):
+    return value + 1
+
+
+@pytest.mark.parametrize("max_workers, inline", [(1, False), (2, True)])
+def test_failing_producer_registered_after_consumer_skips_consumer(max_workers, inline, capsys):
+    registry = StageRegistry()
+    registry.add("consumer", consume, inputs=["value"], outputs=["result"])
+    registry.add("producer", fail, outputs=["value"], inline=inline)
+    values = registry.run(max_workers=max_workers)
+    assert "value" not in values and "result" not in values
+    log = capsys.readouterr().out
+    assert "An error occurred during stage 'producer'" in log
+    assert "[SKIPPED] Stage 'consumer'" in log
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_producer_registered_after_consumer_runs_both(max_workers):
+    registry = StageRegistry()
+    registry.add("consumer", consume, inputs=["value"], outputs=["result"])
+    registry.add("producer", produce, outputs=["value"])
+    assert registry.run(max_workers=max_workers)["result"] == 2
+
+def test_cycle_is_reported():
+    registry = StageRegistry()
+    registry.add("a", consume, inputs=["b"], outputs=["a"])
+    registry.add("b", consume, inputs=["a"], outputs=["b"])
+    with pytest.raises(ValueError, match="cycle"):
+        registry.run(max_workers=1)
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Text Decoder Sweep
+---------------------------------------------------
+Reads the bit stream as text under every combination of
+
+  * bit offset 0..7 (bits dropped before the first byte),
+  * bit order within a byte (most or least significant bit first),
+  * codec (UTF-8/16, the GB, Big5 and other CJK families, Latin-1, ...),
+
+instead of trying four codecs on the bytes at offset 0 and giving up at the
+first UnicodeDecodeError.
+
+Each candidate is decoded by an incremental decoder with errors='replace',
+so every candidate yields text and is scored rather than rejected. The
+score is the fraction of decoded characters that are printable and not the
+replacement character U+FFFD. The keywords are searched with one compiled
+alternation, where each keyword is a named group. The candidates are
+shared across a process pool, and the result is a table ranked by keyword
+hits and then by valid-character ratio.
+"""
+
+import codecs
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from bitvector import BitVector
+
+SWEEP_CODECS = (
+    'utf-8', 'utf-16-be', 'utf-16-le',
+    'gbk', 'gb2312', 'gb18030', 'hz',
+    'big5', 'big5hkscs', 'cp950',
+    'shift_jis', 'euc_jp', 'iso2022_jp', 'euc_kr',
+    'latin-1', 'cp1252',
+)
+BIT_ORDERS = ('big', 'little')
+REPLACEMENT = '\ufffd'
+
+
+def candidate_bytes(bits, offset, bit_order='big'):
+    """Bytes of the stream after dropping `offset` bits, zero-padded to a whole byte."""
+    arr = BitVector(bits).array[offset:]
+    return np.packbits(arr, bitorder=bit_order).tobytes()
+
+@lru_cache(maxsize=8)
+def compile_keywords(patterns):
+    """One regex for a tuple of (name, pattern) pairs; each name becomes a named group."""
+    return re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in patterns), flags=re.I)
+
+def decode_candidate(data, codec):
+    """Text of `data` under `codec` and the number of replaced (undecodable) sequences."""
+    decoder = codecs.getincrementaldecoder(codec)(errors='replace')
+    text = decoder.decode(data, final=True)
+    return text, text.count(REPLACEMENT)
+
+def score_candidate(task):
+    """Decodes one (offset, bit order, codec) candidate and scores it."""
+    bits, offset, bit_order, codec, patterns, preview = task
+    text, replaced = decode_candidate(candidate_bytes(bits, offset, bit_order), codec)
+    printable = "".join(c for c in text if c.isprintable())
+    valid = len(printable) - printable.count(REPLACEMENT)
+    hits = []
+    if patterns:
+        for match in compile_keywords(patterns).finditer(printable):
+            hits.append({'type': match.lastgroup, 'string': match.group(0), 'start_index': match.start()})
+    return {
+        'offset': offset,
+        'bit_order': bit_order,
+        'codec': codec,
+        'chars': len(text),
+        'replaced': replaced,
+        'valid_ratio': valid / len(text) if text else 0.0,
+        'hits': hits,
+        'preview': printable[:preview] + ('...' if len(printable) > preview else ''),
+    }
+
+def sweep(bits, patterns=None, codec_names=SWEEP_CODECS, offsets=range(8), bit_orders=BIT_ORDERS,
+          max_workers=None, preview=200):
+    """
+    Scores every (offset, bit order, codec) candidate and returns them ranked by the
+    number of keyword hits, then by valid-character ratio. `patterns` maps keyword
+    names to regexes. Unknown codecs are skipped. `max_workers=1` runs in this process.
+    """
+    bits = str(BitVector(bits))
+    patterns = tuple((patterns or {}).items())
+    available = []
+    for codec in codec_names:
+        try:
+            codecs.lookup(codec)
+            available.append(codec)
+        except LookupError:
+            continue
+    tasks = [(bits, offset, order, codec, patterns, preview)
+             for offset in offsets for order in bit_orders for codec in available]
+    if max_workers == 1:
+        rows = [score_candidate(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers or os.cpu_count()) as pool:
+            rows = list(pool.map(score_candidate, tasks, chunksize=8))
+    rows.sort(key=lambda row: (-len(row['hits']), -row['valid_ratio'], row['offset'], row['bit_order'] != 'big'))
+    return rows
+
+def candidate_label(row):
+    """Short name of a candidate, e.g. 'gbk' at offset 0 or 'big5@o3_lsb'."""
+    if row['offset'] == 0 and row['bit_order'] == 'big':
+        return row['codec']
+    return f"{row['codec']}@o{row['offset']}" + ('_lsb' if row['bit_order'] == 'little' else '')
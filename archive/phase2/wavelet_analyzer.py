@@ -1,7 +1,10 @@
 import numpy as np
-import pywt
 import matplotlib.pyplot as plt
 
+import cwt_engine
+import quantum_evolution
+from constants import FREQUENCY_OFFSET_KEY, TIME_STEPS
+
 # The 300-bit binary string from the Wow! signal analysis
 BINARY_STRING = "110011111110011110001110111101111100011100100110001011000001100001110101110011011000111000000111001001101100100001001101001101111111111111000000011000101100000110011011100000111000101011111100110101100101111011101000101011001000001101111101110001110000010111001001111111101101111001011100111011111111"
 
@@ -22,7 +25,8 @@ def analyze_with_wavelets(binary_data):
     scales = np.arange(1, 128)
 
     # 3. Perform the Continuous Wavelet Transform (CWT)
-    coefficients, frequencies = pywt.cwt(signal, scales, wavelet)
+    # All scales in one batched FFT multiply; the result matches pywt.cwt
+    coefficients, frequencies = cwt_engine.cwt(signal, scales, wavelet)
 
     # 4. Create the scalogram plot
     plt.figure(figsize=(15, 10))
@@ -49,6 +53,36 @@ def analyze_with_wavelets(binary_data):
     print(" - Dark areas indicate low energy.")
     print("Look for horizontal bands (persistent frequencies), vertical lines (transient events), or changes in the pattern over time.")
 
+def analyze_evolved_states(binary_data):
+    """
+    Applies the same CWT to all evolved states in one batch and maps the energy of each
+    state at every scale.
+    """
+    print("\n--- Wavelet Analysis of the Evolved States ---")
+    evolution = quantum_evolution.get_evolution(binary_data, FREQUENCY_OFFSET_KEY, TIME_STEPS)
+    states = np.array([evolution.bits_at(t).array for t in range(TIME_STEPS)], dtype=float)
+
+    scales = np.arange(1, 128)
+    coefficients, _ = cwt_engine.cwt(states, scales, 'morl')
+    # (scales, states, bits) -> mean energy per state and scale
+    energy = (np.abs(coefficients) ** 2).mean(axis=2).T
+    dominant = scales[energy.argmax(axis=1)]
+    print(f" -> Transformed {len(states)} states x {len(scales)} scales in one batch.")
+    print(f" -> Dominant scale per state ranges from {dominant.min()} to {dominant.max()} "
+          f"(most common: {np.bincount(dominant).argmax()}).")
+
+    plt.figure(figsize=(15, 10))
+    plt.imshow(energy.T, extent=[0, len(states), 1, 128], cmap='viridis', aspect='auto', origin='lower')
+    plt.title("Wavelet Energy per Scale across the Evolved States")
+    plt.ylabel("Scale")
+    plt.xlabel("Timestep")
+    plt.colorbar(label='Mean Coefficient Energy')
+    output_path = "wavelet_evolution_energy.png"
+    plt.savefig(output_path)
+    print(f" -> Evolution energy map saved to '{output_path}'")
+    plt.close()
+    return energy
+
 if __name__ == "__main__":
     # First, ensure the required libraries are installed.
     try:
@@ -57,3 +91,4 @@ if __name__ == "__main__":
         print("PyWavelets is not installed. Please install it using: pip install PyWavelets")
     else:
         analyze_with_wavelets(BINARY_STRING)
+        analyze_evolved_states(BINARY_STRING)
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Repeating-Key XOR Keyspace Search
+---------------------------------------------------
+XORs the message against every repeating key of up to K bits and ranks
+the keys. Without this, the analyzers test one key at a time (11 in XOR.py,
+1868 in decoding_attempts.py).
+
+A key is repeated using its own binary digits, with no leading zeros, as
+repeating_key_xor does. So the keys of bit length L are 2**(L-1) .. 2**L - 1.
+The keys are processed in blocks of the same length. Each block becomes a
+(keys x L) bit matrix, and one broadcast XOR against the message gives a
+(keys x message bits) matrix of candidates. Every metric is then one
+reduction over the rows:
+
+  * entropy: binary Shannon entropy of the ones density,
+  * printable: fraction of bytes (zero-padded at the end) that are
+    printable ASCII,
+  * structure: fraction of equal neighbouring pixels (horizontal and
+    vertical) for the best image shape with both sides >= IMAGE_MIN_SIDE,
+  * motifs: MotifScanner hits, with all rows walked together,
+  * prime_candidate: the value has no prime factor below SMALL_PRIME_BOUND.
+    Residues come from one matrix product with the powers of two mod p.
+
+Each metric is standardized over the whole keyspace. The score is the
+weighted sum, with entropy weighted negatively because order lowers it. The
+top keys get an exact primality test. The blocks are spread over a process
+pool, so all 2**20 keys of up to 20 bits take seconds.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from bitvector import BitVector
+from motif_scanner import MotifScanner
+from primality import is_prime, primes_below
+
+KEY_BITS = 20
+BLOCK_KEYS = 1 << 14
+IMAGE_MIN_SIDE = 8
+SMALL_PRIME_BOUND = 256
+WEIGHTS = {'entropy': -1.0, 'printable': 1.0, 'structure': 1.0, 'motifs': 1.0, 'prime_candidate': 1.0}
+METRICS = tuple(WEIGHTS)
+
+
+def key_matrix(keys, length):
+    """(keys x length) bit matrix of the keys, most significant bit first."""
+    keys = np.asarray(keys, dtype=np.int64)
+    shifts = np.arange(length - 1, -1, -1, dtype=np.int64)
+    return ((keys[:, None] >> shifts) & 1).astype(np.uint8)
+
+def xor_candidates(message, keys, length):
+    """Every key of bit length `length` repeated over the message and XORed with it."""
+    message = BitVector(message).array
+    stream = key_matrix(keys, length)[:, np.arange(len(message)) % length]
+    return stream ^ message
+
+def image_shapes(n, min_side=IMAGE_MIN_SIDE):
+    """Every (height, width) with height * width == n and both sides >= min_side."""
+    return [(h, n // h) for h in range(min_side, n // min_side + 1) if n % h == 0]
+
+def entropy(rows):
+    """Binary Shannon entropy of every row from its ones density."""
+    p = rows.mean(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        h = -(p * np.log2(p) + (1 - p) * np.log2(1 - p))
+    return np.nan_to_num(h)
+
+def printable_ratio(rows):
+    """Fraction of the bytes of every row that are printable ASCII (32..126)."""
+    data = np.packbits(rows, axis=1)
+    return ((data >= 32) & (data <= 126)).mean(axis=1)
+
+def image_structure(rows, shapes):
+    """(best fraction of equal neighbouring pixels, index of the best shape) for every row."""
+    if not shapes:
+        return np.zeros(len(rows)), np.full(len(rows), -1)
+    scores = np.empty((len(shapes), len(rows)))
+    for i, (h, w) in enumerate(shapes):
+        img = rows.reshape(len(rows), h, w)
+        same = np.count_nonzero(img[:, :, 1:] == img[:, :, :-1], axis=(1, 2)) + \
+            np.count_nonzero(img[:, 1:, :] == img[:, :-1, :], axis=(1, 2))
+        scores[i] = same / (h * (w - 1) + (h - 1) * w)
+    best = scores.argmax(axis=0)
+    return scores[best, np.arange(len(rows))], best
+
+def small_factor_free(rows, primes):
+    """Whether the integer value of every row has none of `primes` as a factor."""
+    n = rows.shape[1]
+    # weights[i, j] = 2**(n - 1 - i) mod primes[j]; the products stay far below 2**24.
+    weights = np.array([[pow(2, n - 1 - i, p) for p in primes] for i in range(n)], dtype=np.float32)
+    residues = (rows.astype(np.float32) @ weights).astype(np.int64) % np.asarray(primes, dtype=np.int64)
+    return (residues != 0).all(axis=1)
+
+def score_block(task):
+    """Raw metrics of the keys start..stop-1, which all have bit length `length`."""
+    message, start, stop, length, patterns = task
+    keys = np.arange(start, stop, dtype=np.int64)
+    rows = xor_candidates(message, keys, length)
+    structure, shape = image_structure(rows, image_shapes(rows.shape[1]))
+    metrics = {
+        'entropy': entropy(rows),
+        'printable': printable_ratio(rows),
+        'structure': structure,
+        'motifs': MotifScanner(patterns).count_rows(rows) if patterns else np.zeros(len(keys)),
+        'prime_candidate': small_factor_free(rows, primes_below(SMALL_PRIME_BOUND).tolist()),
+    }
+    return keys, shape, metrics
+
+def blocks(key_bits, block_keys=BLOCK_KEYS):
+    """(start, stop, length) blocks of keys 1 .. 2**key_bits - 1 with the same bit length."""
+    for length in range(1, key_bits + 1):
+        for start in range(1 << (length - 1), 1 << length, block_keys):
+            yield start, min(start + block_keys, 1 << length), length
+
+def standardize(values):
+    """Zero mean, unit variance (all zeros for a constant metric)."""
+    values = np.asarray(values, dtype=float)
+    std = values.std()
+    return (values - values.mean()) / std if std > 0 else np.zeros_like(values)
+
+def search(message, key_bits=KEY_BITS, top=20, patterns=(), weights=None, keep=(), max_workers=None):
+    """
+    Ranks every repeating key of 1..key_bits bits. Returns the `top` rows, plus the rows of any
+    key in `keep`, sorted by rank. Each row holds the key, rank, score, every raw metric,
+    the best image shape, and an exact is_prime of the decrypted value.
+    `max_workers=1` runs in this process.
+    """
+    message = BitVector(message)
+    weights = WEIGHTS if weights is None else weights
+    patterns = tuple(patterns)
+    tasks = [(str(message), start, stop, length, patterns) for start, stop, length in blocks(key_bits)]
+    if max_workers == 1:
+        results = [score_block(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers or os.cpu_count()) as pool:
+            results = list(pool.map(score_block, tasks))
+    keys = np.concatenate([keys for keys, _, _ in results])
+    shape_index = np.concatenate([shape for _, shape, _ in results])
+    metrics = {name: np.concatenate([m[name] for _, _, m in results]) for name in METRICS}
+
+    score = sum(weight * standardize(metrics[name]) for name, weight in weights.items())
+    order = np.argsort(-score, kind='stable')
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(1, len(order) + 1)
+    chosen = list(order[:top])
+    chosen += [key - 1 for key in keep if 1 <= key < 1 << key_bits and key - 1 not in chosen]
+
+    shapes = image_shapes(len(message))
+    rows = []
+    for i in sorted(chosen, key=lambda i: rank[i]):
+        key = int(keys[i])
+        decrypted = BitVector(xor_candidates(message, [key], key.bit_length())[0])
+        rows.append({
+            'key': key,
+            'rank': int(rank[i]),
+            'score': float(score[i]),
+            **{name: float(metrics[name][i]) for name in METRICS},
+            'image_shape': shapes[shape_index[i]] if shape_index[i] >= 0 else None,
+            'is_prime': is_prime(decrypted.to_int()),
+        })
+    return rows
@@ -3,7 +3,12 @@ import re
 # The 300-bit binary string from the Wow! signal analysis
 BINARY_STRING = "110011111110011110001110111101111100011100100110001011000001100001110101110011011000111000000111001001101100100001001101001101111111111111000000011000101100000110011011100000111000101011111100110101100101111011101000101011001000001101111101110001110000010111001001111111101101111001011100111011111111"
 
-import math
+import os
+import sys
+
+# Shared analysis engines live alongside the phase 2 modules.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'phase2'))
+from constant_matcher import ConstantTable, match_fixed_point, match_token_ratios
 
 # --- Character Set and Equations ---
 # Hypothetical 5-bit character mapping for equations
@@ -23,9 +28,11 @@ EQUATIONS = {
 }
 
 # --- Constants for Fractional Analysis ---
-CONSTANTS = {
-    "Golden Ratio Value": (1 + math.sqrt(5)) / 2
-}
+# Relative tolerance for a constant match, and the widest chance-match probability
+# (after correcting for the number of values tried) that still counts as a finding.
+MATCH_TOLERANCE = 0.001
+SIGNIFICANCE = 0.01
+RATIO_WIDTHS = range(4, 17)
 
 def string_to_5bit_binary(s):
     """Converts a string to a 5-bit binary string using the custom map."""
@@ -57,33 +64,45 @@ def search_with_5bit_encoding(binary_data):
             print("  -> Not found.")
     return found_match
 
-def analyze_as_fraction(binary_data):
+def report_matches(matches, label):
     """
-    Interprets the binary string as a fixed-point fraction and compares to constants.
+    Prints the best constant matches. Returns (found, rejected): whether any match is
+    significant, and how many raw matches were rejected as chance.
     """
-    print("\n--- Analysis 2: Interpreting as a Fraction ---")
-    # Interpret the 300-bit string as a fixed-point number between 0 and some integer max.
-    # A common way is to treat it as integer / 2^length.
-    # To get a number > 1, we can scale it. Let's try scaling to the first 8 bits as integer part.
-    integer_part_str = binary_data[:8]
-    fractional_part_str = binary_data[8:]
-    
-    integer_part = int(integer_part_str, 2)
-    fractional_part = int(fractional_part_str, 2) / (2**len(fractional_part_str))
-    
-    value = integer_part + fractional_part
-    print(f"Interpreted value (8-bit integer, 292-bit fraction): {value:.6f}")
-    
-    found_match = False
-    for name, const_val in CONSTANTS.items():
-        print(f"Comparing to {name}: {const_val:.6f}")
-        # Check if the values are very close (e.g., within 0.1% tolerance)
-        if abs(value - const_val) / const_val < 0.001:
-            print(f"  -> MATCH FOUND! The interpreted value is very close to {name}.")
-            found_match = True
-        else:
-            print("  -> No match.")
-    return found_match
+    if not matches:
+        print("  -> No match.")
+        return False, 0
+    rejected = sum(1 for m in matches if m['p_any'] >= SIGNIFICANCE)
+    print(f"  {len(matches)} {label} within {MATCH_TOLERANCE:.1%} of a constant; "
+          f"{rejected} rejected as chance (p_any >= {SIGNIFICANCE}).")
+    # Closest matches first, weighted by how crowded the table is around them.
+    for m in sorted(matches, key=lambda m: m['p_chance'] * m['rel_error'])[:5]:
+        where = ", ".join(f"{k}={m[k]}" for k in ('integer_bits', 'width', 'offset', 'token_start') if k in m)
+        print(f"  {m['query']:.6g} ~ {m['constant']} = {m['value']:.6g} [{where}] "
+              f"error {m['rel_error']:.2e}, p_any {m['p_any']:.3f}")
+        print(f"     continued fraction {m['continued_fraction']}; convergents of the constant: "
+              f"{', '.join(m['constant_convergents'][:5])}" + (" (a convergent)" if m.get('is_convergent') else ""))
+        if m['p_any'] < SIGNIFICANCE:
+            print("  -> MATCH FOUND! This is unlikely to be a chance coincidence.")
+    return rejected < len(matches), rejected
+
+def analyze_as_fraction(binary_data, table=None):
+    """
+    Interprets the binary string as a fixed-point number at every integer/fraction
+    split point and compares each value with the whole constant table in one lookup.
+    """
+    print("\n--- Analysis 2: Interpreting as a Fraction (every split point) ---")
+    matches = match_fixed_point(binary_data, table, MATCH_TOLERANCE)
+    return report_matches(matches, "split points")
+
+def analyze_token_ratios(binary_data, table=None):
+    """
+    Compares the ratio of every pair of adjacent tokens, over several widths and all
+    offsets, with the constant table.
+    """
+    print(f"\n--- Analysis 3: Adjacent Token Ratios (widths {RATIO_WIDTHS.start}-{RATIO_WIDTHS.stop - 1}, all offsets) ---")
+    matches = match_token_ratios(binary_data, RATIO_WIDTHS, table, MATCH_TOLERANCE)
+    return report_matches(matches, "ratios")
 
 def main():
     """
@@ -93,19 +112,24 @@ def main():
     print("  Advanced Equation Finder Analysis")
     print("=" * 50)
     
-    # Run both analyses
+    # Run all analyses
+    table = ConstantTable()
     match1 = search_with_5bit_encoding(BINARY_STRING)
-    match2 = analyze_as_fraction(BINARY_STRING)
+    match2, rejected2 = analyze_as_fraction(BINARY_STRING, table)
+    match3, rejected3 = analyze_token_ratios(BINARY_STRING, table)
     
     print("\n--- Final Interpretation ---")
-    if match1 or match2:
+    if match1 or match2 or match3:
         print("A potential match was found, suggesting the signal may contain encoded mathematical or physical constants.")
         print("This strengthens the hypothesis of an intelligent, artificial origin.")
     else:
-        print("No matches were found with the tested 5-bit encoding or fractional interpretation.")
+        print(f"No statistically significant match (p_any < {SIGNIFICANCE}) was found with the tested 5-bit "
+              "encoding, fractional interpretation or token ratios.")
+        print(f"{rejected2 + rejected3} raw constant matches were rejected as chance coincidences.")
         print("This could mean:")
         print("  - The encoding scheme is different from the one hypothesized.")
         print("  - The fractional interpretation is incorrect (e.g., different bit allocation for integer/fraction).")
+        print("  - Constants are not stored as ratios of adjacent tokens of the tested widths.")
         print("  - The message contains other types of information.")
 
 if __name__ == "__main__":
@@ -6,10 +6,14 @@ This script performs the final, full translation of the Wow! signal,
 combining all discoveries into a single narrative report.
 """
 
-import numpy as np
-from scipy.linalg import dft
+import os
+import sys
 from collections import Counter
 
+# The shared evolution engine lives with the phase 2 modules.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'phase2'))
+import quantum_evolution
+
 # --- All Identified Constants (The Rosetta Stone) ---
 BINARY_STRING = "110011111110011110001110111101111100011100100110001011000001100001110101110011011000111000000111001001101100100001001101001101111111111111000000011000101100000110011011100000111000101011111100110101100101111011101000101011001000001101111101110001110000010111001001111111101101111001011100111011111111"
 TIMESTEPS = 72
@@ -46,26 +50,12 @@ ATOMIC_NUMBERS = {
 }
 
 
-def get_binary_state_at_timestep(initial_binary, t):
-    """
-    Runs the quantum evolution model for 't' steps and returns the binary state.
-    """
-    initial_state = np.array([int(bit) * 2 - 1 for bit in initial_binary], dtype=np.complex128)
-    n = len(initial_state)
-    qft_matrix = dft(n, scale='sqrtn')
-    current_state = initial_state
-    for i in range(t):
-        evolved_state = np.dot(qft_matrix, current_state)
-        phase_shift = np.exp(1j * 2 * np.pi * FREQUENCY_OFFSET_KEY * i / (TIMESTEPS * 1e6))
-        current_state = evolved_state * phase_shift
-    return "".join(['1' if np.real(c) >= 0 else '0' for c in current_state])
-
 def get_full_command_dict():
     """
     Generates a full dictionary of all 54 unique commands from the XOR deltas.
     """
-    all_states = [get_binary_state_at_timestep(BINARY_STRING, t) for t in range(TIMESTEPS + 1)]
-    deltas = ["".join(['1' if a != b else '0' for a, b in zip(all_states[t+1], all_states[t])]) for t in range(TIMESTEPS)]
+    evolution = quantum_evolution.get_evolution(BINARY_STRING, FREQUENCY_OFFSET_KEY, TIMESTEPS)
+    deltas = evolution.deltas(TIMESTEPS)
     
     # Use a Counter to get all unique deltas
     unique_deltas = list(Counter(deltas).keys())
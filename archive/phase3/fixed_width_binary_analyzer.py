@@ -33,6 +33,12 @@ from typing import List, Tuple, Dict, Optional
 from collections import Counter
 import itertools
 import math
+import os
+import sys
+
+# Shared analysis engines live alongside the phase 2 modules.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'phase2'))
+from fixed_width_tokenizer import TokenMatrix, tokenize
 
 try:
     import pandas as pd  # type: ignore
@@ -77,63 +83,31 @@ class Token:
     element: Optional[str]  # element symbol if 1..118 else None
 
 # ---------------------- CORE FUNCTIONS ----------------------
-def parse_fixed_width(bits: str, width: int, offset: int = 0, ignore_tail: bool = True) -> List[Token]:
-    """Parse bits into fixed-width tokens with a starting bit offset.
-    Leftover tail is ignored if ignore_tail else padded with zeros.
-    """
-    if width <= 0:
-        raise ValueError("width must be >= 1")
-    if not all(c in "01" for c in bits):
-        raise ValueError("bits must be a binary string")
-
-    # apply offset by skipping initial bits
-    if offset < 0 or offset >= width:
-        raise ValueError("offset must be in [0, width-1]")
-
-    usable = bits[offset:]
-    length = len(usable)
-    remainder = length % width
-
-    if remainder and not ignore_tail:
-        # pad with zeros to fill last token
-        usable = usable + ("0" * (width - remainder))
-    elif remainder and ignore_tail:
-        usable = usable[: length - remainder]
-
+def tokens_at_offset(matrix: TokenMatrix, offset: int) -> List[Token]:
+    """Token objects for one offset of a tokenizer matrix."""
+    width = matrix.width
     tokens: List[Token] = []
-    for i in range(0, len(usable), width):
-        chunk = usable[i:i+width]
-        val = int(chunk, 2)
-        el = ELEMENTS.get(val)
-        t = Token(
-            idx=i // width,
-            bit_start=offset + i,
-            bit_end=offset + i + width,
-            bits=chunk,
+    for i, val in enumerate(matrix.tokens(offset).tolist()):
+        tokens.append(Token(
+            idx=i,
+            bit_start=offset + i * width,
+            bit_end=offset + (i + 1) * width,
+            bits=format(val, f"0{width}b"),
             value=val,
-            element=el,
-        )
-        tokens.append(t)
+            element=ELEMENTS.get(val),
+        ))
     return tokens
 
 
-def score_tokens(tokens: List[Token]) -> float:
-    """Return fraction of tokens that map to real elements (1..118)."""
-    if not tokens:
-        return 0.0
-    good = sum(1 for t in tokens if t.element is not None)
-    return good / len(tokens)
-
-
-def best_offset_for_width(bits: str, width: int, ignore_tail: bool = True) -> Tuple[int, float, List[Token]]:
-    """Try all offsets 0..width-1, return the one with highest element mapping ratio."""
-    best = (-1, -1.0, [])
-    for offset in range(width):
-        toks = parse_fixed_width(bits, width, offset=offset, ignore_tail=ignore_tail)
-        score = score_tokens(toks)
-        if score > best[1]:
-            best = (offset, score, toks)
-    return best
+def best_offset_for_width(bits: str, width: int, ignore_tail: bool = True,
+                          matrix: Optional[TokenMatrix] = None) -> Tuple[int, float, List[Token]]:
+    """Try all offsets 0..width-1, return the one with highest element mapping ratio.
+    The rates of all offsets come from one vectorized reduction over the token matrix.
+    """
+    if matrix is None:
+        matrix = tokenize(bits, [width], ignore_tail=ignore_tail)[width]
+    offset, score = matrix.best_offset(min(ELEMENTS), max(ELEMENTS))
+    return offset, score, tokens_at_offset(matrix, offset)
 
 
 def detect_reactions(symbols: List[str]) -> List[Tuple[int, str]]:
@@ -208,10 +182,11 @@ def export_csv(tokens: List[Token], reactions: List[Tuple[int, str]], path: str)
     print(f"CSV written: {path} ({len(rows)} rows)")
 
 
-def analyze_with_width(bits: str, width: int, ignore_tail: bool = True) -> None:
+def analyze_with_width(bits: str, width: int, ignore_tail: bool = True,
+                       matrix: Optional[TokenMatrix] = None) -> None:
     print("=" * 70)
     print(f"Fixed‑width analysis | width={width}")
-    offset, score, tokens = best_offset_for_width(bits, width, ignore_tail=ignore_tail)
+    offset, score, tokens = best_offset_for_width(bits, width, ignore_tail=ignore_tail, matrix=matrix)
     print(f"Best offset: {offset} | Element‑mapping rate: {score:.3%}")
     print(summarize(tokens))
 
@@ -225,8 +200,10 @@ def analyze_with_width(bits: str, width: int, ignore_tail: bool = True) -> None:
 
 
 def sweep_and_report(bits: str, widths: List[int]) -> None:
+    # Tokenize every width and offset in one pass, then report each width.
+    matrices = tokenize(bits, widths, ignore_tail=IGNORE_PARTIAL_TAIL)
     for w in widths:
-        analyze_with_width(bits, w, ignore_tail=IGNORE_PARTIAL_TAIL)
+        analyze_with_width(bits, w, ignore_tail=IGNORE_PARTIAL_TAIL, matrix=matrices[w])
 
 
 def main():
@@ -1,8 +1,14 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.linalg import dft
 from matplotlib.animation import FuncAnimation
 
+# The shared evolution engine lives with the phase 2 modules.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'phase2'))
+import assembly_engine
+import quantum_evolution
+
 # --- Constants ---
 BINARY_STRING = "110011111110011110001110111101111100011100100110001011000001100001110101110011011000111000000111001001101160100001001101001101111111111111000000011000101100000110011011100000111000101011111100110101100101111011101000101011001000001101111101110001110000010111001001111111101101111001011100111011111111"
 TIMESTEPS = 72
@@ -20,30 +26,16 @@ for i in range(NUM_COMPONENTS):
     HELIX_BLUEPRINT.append((x, y, z))
 HELIX_BLUEPRINT = np.array(HELIX_BLUEPRINT)
 
-class Component:
-    """Represents a single component in the machine."""
-    def __init__(self, id, target_pos):
-        self.id = id
-        self.pos = np.random.rand(3) * 20 - 10  # Random 3D start
-        self.target_pos = target_pos
-        self.color = 'blue'
-        self.size = 30
-        self.energy_state = 0  # 0 = normal, >0 = glowing
-
-def get_binary_state_at_timestep(initial_binary, t):
-    initial_state = np.array([int(bit) * 2 - 1 for bit in initial_binary], dtype=np.complex128)
-    n = len(initial_state)
-    qft_matrix = dft(n, scale='sqrtn')
-    current_state = initial_state
-    for i in range(t):
-        evolved_state = np.dot(qft_matrix, current_state)
-        phase_shift = np.exp(1j * 2 * np.pi * FREQUENCY_OFFSET_KEY * i / (TIMESTEPS * 1e6))
-        current_state = evolved_state * phase_shift
-    return "".join(['1' if np.real(c) >= 0 else '0' for c in current_state])
+COLORS = np.array(['blue', 'cyan'])  # Engine color 0 / 1
+GLOW_FRAMES = 5
+ENGINE_TABLE = {
+    "PHYSICAL_OP": (assembly_engine.APPROACH, (0.1, 0, 0)),  # 10% closer to the target, glowing
+    "LOGICAL_OP": (assembly_engine.TOGGLE_COLOR, (0, 0, 0)),
+}
 
 def get_command_sequence():
-    all_states = [get_binary_state_at_timestep(BINARY_STRING, t) for t in range(TIMESTEPS + 1)]
-    return ["".join(['1' if a != b else '0' for a, b in zip(all_states[t+1], all_states[t])]) for t in range(TIMESTEPS)]
+    evolution = quantum_evolution.get_evolution(BINARY_STRING, FREQUENCY_OFFSET_KEY, TIMESTEPS)
+    return evolution.deltas(TIMESTEPS)
 
 def translate_prefix_to_action(prefix):
     if prefix == "000": return "LOGICAL_OP"
@@ -51,31 +43,12 @@ def translate_prefix_to_action(prefix):
     return "UNKNOWN_OP"
 
 def run_simulation(commands):
-    components = [Component(i, HELIX_BLUEPRINT[i]) for i in range(NUM_COMPONENTS)]
-    history = []
-
-    for t, command in enumerate(commands):
-        comp_index = t % NUM_COMPONENTS
-        comp = components[comp_index]
-        
-        # Decay energy state
-        if comp.energy_state > 0:
-            comp.energy_state -= 1
-        
-        action = translate_prefix_to_action(command[:3])
-        
-        if action == "PHYSICAL_OP":
-            # Move component 10% closer to its target position
-            direction = comp.target_pos - comp.pos
-            comp.pos += direction * 0.1
-            comp.energy_state = 5  # Glow for 5 frames
-        elif action == "LOGICAL_OP":
-            comp.color = 'cyan' if comp.color == 'blue' else 'blue'
-            
-        frame_state = [{'pos': c.pos.copy(), 'color': c.color, 'energy': c.energy_state} for c in components]
-        history.append(frame_state)
-        
-    return history
+    positions = np.random.rand(NUM_COMPONENTS, 3) * 20 - 10  # Random 3D start
+    actions = [translate_prefix_to_action(command[:3]) for command in commands]
+    ops, args = assembly_engine.compile_program(actions, ENGINE_TABLE, d=3)
+    # Energy decays by one each time a component is addressed
+    engine = assembly_engine.AssemblyEngine(positions, targets=HELIX_BLUEPRINT, glow=GLOW_FRAMES, energy_decay=True)
+    return engine.run(ops, args)
 
 def animate_simulation(history):
     """Creates and saves an animation of the simulation."""
@@ -91,10 +64,10 @@ def animate_simulation(history):
         ax.set_ylabel("Y Coordinate")
         ax.set_zlabel("Z Coordinate")
 
-        state = history[frame]
-        pos = np.array([s['pos'] for s in state])
-        colors = ['yellow' if s['energy'] > 0 else s['color'] for s in state]
-        sizes = [100 if s['energy'] > 0 else 30 for s in state]
+        pos = history.pos[frame, 0]
+        glowing = history.energy[frame, 0] > 0
+        colors = np.where(glowing, 'yellow', COLORS[history.color[frame, 0]])
+        sizes = np.where(glowing, 100, 30)
         
         ax.scatter(pos[:, 0], pos[:, 1], pos[:, 2], s=sizes, c=colors)
         ax.set_title(f"High-Fidelity Assembly Simulation: Timestep {frame + 1}/{len(history)}")
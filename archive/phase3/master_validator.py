@@ -5,12 +5,13 @@ Wow! Signal — Master Validator & Consistency Checker
 Purpose
   • Unify and verify your prior results in one auditable run:
       1) Structural checks (lengths, counts, entropy).
-      2) Mathematical markers (probabilistic Miller–Rabin primality).
+      2) Mathematical markers (deterministic Miller–Rabin / Baillie–PSW primality).
       3) Chemistry/element motifs (H2He, H2O, CH4, selected atomic numbers).
       4) 5-bit parsing across all offsets; delimiter '11111' analysis.
       5) Command-language verification of ACTIVATE/DEACTIVATE deltas.
       6) Optional state evolution (DFT/QFT-like) to derive timestep deltas.
-      7) Variable-bit-change trials (up to MAX_FLIPS=5) to test stability of findings.
+      7) Variable-bit-change trials (up to MAX_FLIPS=5) to test stability of findings,
+         plus an exhaustive sweep of every 1..EXHAUSTIVE_FLIPS-bit flip set.
       8) Consistency checks for constants you've used across scripts.
 
 Inputs
@@ -31,11 +32,17 @@ from __future__ import annotations
 import os, sys, math, random, csv, itertools, statistics
 from typing import List, Dict, Tuple, Optional
 from collections import Counter
+from functools import lru_cache
 
 # --- Try optional heavy deps gracefully (DFT/QFT step) ---
 try:
     import numpy as np
-    from scipy.linalg import dft
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "phase2"))
+    import quantum_evolution
+    from bitvector import BitVector
+    from motif_scanner import MotifScanner
+    from flip_neighborhood import working_copy, flip_gain, exhaustive_flip_search
+    import primality
     HAVE_SCI = True
 except Exception:
     HAVE_SCI = False
@@ -75,6 +82,7 @@ ELEMENT_CODES = {
 MAX_FLIPS = 5
 FLIP_TRIALS = 400  # increase for deeper search; watch runtime
 RNG_SEED = 1337
+EXHAUSTIVE_FLIPS = 2  # every 1..k flip set is checked; k=3 takes minutes on one core
 
 OUTDIR = "validator_out"
 
@@ -94,7 +102,7 @@ def shannon_entropy(bits: str) -> float:
     return -sum((v/n)*math.log2(v/n) for v in c.values())
 
 def miller_rabin(n: int, k: int = 16) -> bool:
-    """Probabilistic primality test appropriate for large ints."""
+    """Probabilistic primality test appropriate for large ints (fallback without the phase2 modules)."""
     if n < 2:
         return False
     # small primes
@@ -134,6 +142,11 @@ def find_all(pattern: str, s: str) -> List[int]:
         out.append(idx)
         start = idx + 1
 
+@lru_cache(maxsize=64)
+def motif_scanner(patterns: Tuple[str, ...]) -> "MotifScanner":
+    """Aho–Corasick automaton for a motif set, compiled once and reused across scans."""
+    return MotifScanner(patterns)
+
 def save_csv(path: str, rows: List[List[object]], header: Optional[List[str]] = None) -> None:
     with open(path, "w", newline="") as f:
         w = csv.writer(f)
@@ -162,7 +175,7 @@ def prime_check(bits: str) -> Dict[str, object]:
     if not is_binary(bits) or not bits:
         return {"checked": False, "is_probable_prime": False, "detail": "Non-binary or empty."}
     n = int(bits, 2)
-    is_p = miller_rabin(n)
+    is_p = primality.is_prime(n) if HAVE_SCI else miller_rabin(n)
     return {"checked": True, "is_probable_prime": is_p, "num_digits_decimal": len(str(n))}
 
 
@@ -170,6 +183,12 @@ def prime_check(bits: str) -> Dict[str, object]:
 
 def scan_patterns(bits: str, patterns: Dict[str, str]) -> List[Tuple[str, str, int]]:
     """Return [(name, pattern, index), ...] for each match."""
+    if HAVE_SCI:
+        # Single pass over the bits for all motifs; hits come back ordered by index, then motif.
+        pats = tuple(patterns)
+        names = list(patterns.values())
+        ids, positions = motif_scanner(pats).scan(bits)
+        return [(names[i], pats[i], p) for i, p in zip(ids.tolist(), positions.tolist())]
     hits = []
     for pat, name in patterns.items():
         for idx in find_all(pat, bits):
@@ -214,6 +233,12 @@ def verify_command_lengths() -> Dict[str, object]:
     }
 
 def search_command_patterns(bits: str) -> Dict[str, List[int]]:
+    if HAVE_SCI:
+        ids, positions = motif_scanner((COMMAND_ACTIVATE, COMMAND_DEACTIVATE)).scan(bits)
+        return {
+            "ACTIVATE_hits": positions[ids == 0].tolist(),
+            "DEACTIVATE_hits": positions[ids == 1].tolist()
+        }
     return {
         "ACTIVATE_hits": find_all(COMMAND_ACTIVATE, bits),
         "DEACTIVATE_hits": find_all(COMMAND_DEACTIVATE, bits)
@@ -227,14 +252,8 @@ def evolve_and_catalog(bits: str, timesteps: int, freq_key: float) -> Dict[str,
         return {"available": False, "reason": "NumPy/SciPy not available; skipping evolution."}
     # Initial +/-1 state
     init = np.array([1 if b == "1" else -1 for b in bits], dtype=np.complex128)
-    n = len(init)
-    q = dft(n, scale="sqrtn")
-    states = [init.copy()]
-    for t in range(timesteps):
-        evolved = q @ states[-1]
-        phase = np.exp(1j * 2 * np.pi * freq_key * t / (timesteps * 1e6))
-        states.append(evolved * phase)
-    bin_states = ["".join("1" if np.real(v) >= 0 else "0" for v in st) for st in states]
+    states = quantum_evolution.evolve_states(init, timesteps, freq_key, timesteps)
+    bin_states = [quantum_evolution.state_to_binary(st) for st in states]
     deltas = ["".join('1' if a != b else '0' for a, b in zip(bin_states[i], bin_states[i+1]))
               for i in range(len(bin_states)-1)]
     # Catalog deltas
@@ -249,6 +268,8 @@ def evolve_and_catalog(bits: str, timesteps: int, freq_key: float) -> Dict[str,
 # ========== 7) Variable bit changing (random flip trials) ==========
 
 def random_flip(bits: str, positions: List[int]) -> str:
+    if HAVE_SCI:
+        return str(BitVector(bits).flip(positions))
     lst = list(bits)
     for p in positions:
         lst[p] = "1" if lst[p] == "0" else "0"
@@ -262,6 +283,7 @@ def flip_search(bits: str,
     """
     Randomly flip up to `max_flips` bits (uniformly sampled count in [1..max_flips])
     and record if motif hits strictly increase; repeat for `trials`.
+    With NumPy available, each trial only rescans the windows around its flips.
     """
     rng = random.Random(seed)
     base_hits = scan_patterns(bits, motifs)
@@ -269,17 +291,34 @@ def flip_search(bits: str,
     improved = 0
     examples = []
     n = len(bits)
+    if HAVE_SCI:
+        scanner = motif_scanner(tuple(motifs))
+        arr = working_copy(bits)
     for _ in range(trials):
         k = rng.randint(1, max_flips)
         pos = sorted(rng.sample(range(n), k))
-        mutated = random_flip(bits, pos)
-        new_hits = scan_patterns(mutated, motifs)
-        if len(new_hits) > base_count:
+        if HAVE_SCI:
+            gain = flip_gain(scanner, arr, pos)
+        else:
+            gain = len(scan_patterns(random_flip(bits, pos), motifs)) - base_count
+        if gain > 0:
             improved += 1
-            examples.append({"flip_positions": pos, "gain": len(new_hits) - base_count})
+            examples.append({"flip_positions": pos, "gain": gain})
     return {"baseline_hits": base_count, "improved_trials": improved, "examples": examples[:10]}
 
 
+def exhaustive_flips(bits: str, motifs: Dict[str, str], max_flips: int = EXHAUSTIVE_FLIPS) -> Dict[str, object]:
+    """
+    Check every set of 1..max_flips flipped bits (not a random sample), sharded across cores.
+    Sets that cannot raise the motif count are pruned by an upper bound on their gain.
+    """
+    if not HAVE_SCI:
+        return {"available": False, "reason": "NumPy not available; skipping exhaustive search."}
+    result = exhaustive_flip_search(bits, tuple(motifs), max_flips=max_flips)
+    result["available"] = True
+    return result
+
+
 # ========== 8) Cross-script consistency checks (constants) ==========
 
 def consistency_checks() -> Dict[str, object]:
@@ -375,6 +414,17 @@ def main():
         for ex in improv["examples"]:
             print(f"    flips={ex['flip_positions'][:8]}...  gain=+{ex['gain']}")
 
+    exhaustive = exhaustive_flips(BINARY_STRING, CHEM_FORMULAE, max_flips=EXHAUSTIVE_FLIPS)
+    print(f"\n[VARIABLE BIT CHANGING — EXHAUSTIVE 1..{EXHAUSTIVE_FLIPS} FLIPS]")
+    if exhaustive["available"]:
+        print(f"  Flip sets checked: {exhaustive['explored']}  |  Branches pruned: {exhaustive['pruned']}")
+        print(f"  Sets with increased motif hits: {exhaustive['improving_sets']}  by flip count: {exhaustive['improving_by_flips']}")
+        print(f"  Best gain: +{exhaustive['best_gain']}")
+        for ex in exhaustive["examples"][:5]:
+            print(f"    flips={ex['flip_positions']}  gain=+{ex['gain']}")
+    else:
+        print(f"  Skipped: {exhaustive['reason']}")
+
     # 8) Cross-script consistency
     cons = consistency_checks()
     print("\n[CONSISTENCY CHECKS]")
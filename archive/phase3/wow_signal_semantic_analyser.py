@@ -8,6 +8,10 @@ adds semantic dimensions including equation discovery and multi-encoding scans.
 Usage:
   python wow_signal_semantic_analyzer.py
 
+Tokens stay in memory as numpy columns between the decoders and the
+detectors; the files below are only written by the export sink at the end
+of run_all (pass export=False to skip them).
+
 Outputs (validator_out/):
   - semantic_tokens_w{w}_o{o}.csv
   - ascii_mode{m}_o{o}.csv
@@ -18,10 +22,20 @@ Outputs (validator_out/):
 """
 from __future__ import annotations
 import os, json, csv, re
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterable
 from collections import Counter
 import base64
 import math
+import sys
+
+import numpy as np
+
+# Shared analysis engines live alongside the phase 2 modules.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'phase2'))
+from primality import is_prime_batch
+from fixed_width_tokenizer import tokenize
+from relation_detector import RelationDetector
+from constant_matcher import ConstantTable, TRANSFORMS, token_ratios
 
 # ------------------ CONFIG ------------------
 BINARY_STRING = (
@@ -45,24 +59,8 @@ MATHEMATICAL_CONSTANTS = {
     'FINE_STRUCTURE': 0.007297
 }
 
-os.makedirs(OUTDIR, exist_ok=True)
-
 # ------------------ UTILITIES ------------------
-def to_int(bits: str, endian: str = 'big') -> int:
-    if endian == 'big':
-        return int(bits, 2)
-    return int(bits[::-1], 2)  # little endian
-
-def chunk_bits(bits: str, width: int, offset: int = 0, ignore_tail: bool = True) -> List[str]:
-    s = bits[offset:]
-    rem = len(s) % width
-    if rem and ignore_tail:
-        s = s[:len(s)-rem]
-    elif rem and not ignore_tail:
-        s = s + ('0' * (width - rem))
-    return [s[i:i+width] for i in range(0, len(s), width) if i+width <= len(s)]
-
-def write_csv(path: str, header: List[str], rows: List[List[object]]) -> None:
+def write_csv(path: str, header: List[str], rows: Iterable[List[object]]) -> None:
     with open(path, 'w', newline='') as f:
         w = csv.writer(f)
         w.writerow(header)
@@ -79,42 +77,32 @@ def find_all(substr: str, s: str) -> List[int]:
         i = pos + 1
     return out
 
-def is_prime(n):
-    if n <= 1:
-        return False
-    if n <= 3:
-        return True
-    if n % 2 == 0 or n % 3 == 0:
-        return False
-    i = 5
-    while i * i <= n:
-        if n % i == 0 or n % (i + 2) == 0:
-            return False
-        i += 6
-    return True
-
 # ------------------ DECODERS ------------------
-def decode_fixed_width(bits: str, width: int, offset: int) -> List[Dict]:
-    toks = chunk_bits(bits, width, offset, IGNORE_PARTIAL_TAIL)
+def token_columns(big, little, offset: int) -> Dict[str, np.ndarray]:
+    """Columnar tokens of one offset: parallel numpy arrays instead of one dict per token."""
+    width = big.width
+    value_big = big.tokens(offset)
+    idx = np.arange(len(value_big))
+    return {
+        'token_index': idx,
+        'bit_start': offset + idx*width,
+        'bit_end': offset + (idx+1)*width,
+        'value_big': value_big,
+        'value_little': little.tokens(offset),
+    }
+
+def column_rows(columns: Dict[str, np.ndarray], width: int):
+    """Yields CSV rows (with the token bits) from columnar tokens, one at a time."""
+    for i, start, end, vb, vl in zip(*(columns[k].tolist() for k in ('token_index', 'bit_start', 'bit_end', 'value_big', 'value_little'))):
+        yield [i, start, end, format(vb, f'0{width}b'), vb, vl]
+
+def decode_ascii(bits: str, mode: int, offset: int = 0, matrix=None) -> List[Dict]:
+    if matrix is None:
+        matrix = tokenize(bits, [mode], 'big', IGNORE_PARTIAL_TAIL)[mode]
     out = []
-    for idx, t in enumerate(toks):
-        out.append({
-            'token_index': idx,
-            'bit_start': offset + idx*width,
-            'bit_end': offset + (idx+1)*width,
-            'bits': t,
-            'value_big': to_int(t, 'big'),
-            'value_little': to_int(t, 'little')
-        })
-    return out
-
-def decode_ascii(bits: str, mode: int, offset: int = 0) -> List[Dict]:
-    toks = chunk_bits(bits, mode, offset, IGNORE_PARTIAL_TAIL)
-    out = []
-    for idx, t in enumerate(toks):
-        v = to_int(t, 'big')
+    for idx, v in enumerate(matrix.tokens(offset).tolist()):
         ch = chr(v) if 32 <= v <= 126 else ''
-        out.append({'token_index': idx, 'bits': t, 'ascii_val': v, 'char': ch})
+        out.append({'token_index': idx, 'bits': format(v, f'0{mode}b'), 'ascii_val': v, 'char': ch})
     return out
 
 def decode_base_encoding(bits: str, base: int) -> Optional[str]:
@@ -137,13 +125,16 @@ def decode_base_encoding(bits: str, base: int) -> Optional[str]:
         return None
 
 # ------------------ SEARCH HELPERS ------------------
-def search_numbers_in_tokens(tokens: List[Dict], numbers: List[int]) -> List[Tuple[int,int,str]]:
+def search_numbers_in_tokens(tokens: Dict[str, np.ndarray], numbers: List[int]) -> List[Tuple[int,int,str]]:
     hits = []
-    for t in tokens:
-        if t['value_big'] in numbers:
-            hits.append((t['token_index'], t['value_big'], 'big'))
-        if t['value_little'] in numbers and t['value_little'] != t['value_big']:
-            hits.append((t['token_index'], t['value_little'], 'little'))
+    big, little = tokens['value_big'], tokens['value_little']
+    big_hit = np.isin(big, numbers)
+    little_hit = np.isin(little, numbers) & (little != big)
+    for i in np.flatnonzero(big_hit | little_hit).tolist():
+        if big_hit[i]:
+            hits.append((int(tokens['token_index'][i]), int(big[i]), 'big'))
+        if little_hit[i]:
+            hits.append((int(tokens['token_index'][i]), int(little[i]), 'little'))
     return hits
 
 def search_numbers_in_ascii(ascii_tokens: List[Dict], numbers: List[int]) -> List[Tuple[int,int,str]]:
@@ -159,6 +150,9 @@ def search_numbers_in_ascii(ascii_tokens: List[Dict], numbers: List[int]) -> Lis
     return hits
 
 # ------------------ EQUATION DETECTION ------------------
+# a = b*c, a = b*c^2, a = b+c and a^2 + b^2 = c^2 on the first tokens of each 5-token window
+SYMBOLIC_DETECTOR = RelationDetector(window=5)
+
 PHYSICS_EQS = [
     (['E','=','m','c','2'], 'E=mc^2'),
     (['F','=','m','a'], 'F=ma'),
@@ -187,101 +181,58 @@ def detect_equations_in_ascii_tokens(ascii_tokens: List[Dict]) -> List[Dict]:
 
     return results
 
-def detect_symbolic_equations(tokens: List[Dict], tolerance: float = 0.0) -> List[Dict]:
-    results = []
-    vals = [t['value_big'] for t in tokens]
-    
-    # Check for simple algebraic relationships
-    # a = b*c, a = b*c^2, a = b/c, etc. within a short window
-    WINDOW_SIZE = 5
-
-    for i in range(len(vals) - WINDOW_SIZE):
-        window = vals[i:i+WINDOW_SIZE]
-        a, b, c, d, e = window
-        
-        # Check a = b*c
-        if a != 0 and b != 0 and c != 0 and abs(a - (b*c)) / abs(a) <= tolerance:
-            results.append({'type': 'symbolic_axbc', 'formula': f'{a} = {b} * {c}', 'token_start': i, 'bit_start': tokens[i]['bit_start']})
-        
-        # Check a = b*c^2
-        if a != 0 and b != 0 and c != 0 and abs(a - (b * c**2)) / abs(a) <= tolerance:
-            results.append({'type': 'symbolic_axbc2', 'formula': f'{a} = {b} * {c}^2', 'token_start': i, 'bit_start': tokens[i]['bit_start']})
-        
-        # Check a = b + c
-        if a != 0 and abs(a - (b+c)) / abs(a) <= tolerance:
-             results.append({'type': 'symbolic_axbpc', 'formula': f'{a} = {b} + {c}', 'token_start': i, 'bit_start': tokens[i]['bit_start']})
-        
-        # Check a^2 + b^2 = c^2
-        if c != 0 and abs(c**2 - (a**2 + b**2)) / c**2 <= tolerance:
-            results.append({'type': 'symbolic_pythagorean', 'formula': f'{a}^2 + {b}^2 = {c}^2', 'token_start': i, 'bit_start': tokens[i]['bit_start']})
-            
-        # Check F=ma
-        if a != 0 and b != 0 and c != 0 and abs(a - b*c) / abs(a) <= tolerance:
-            results.append({'type': 'symbolic_fma', 'formula': f'{a} = {b} * {c}', 'token_start': i, 'bit_start': tokens[i]['bit_start']})
-            
-        # Check E=hf
-        if a != 0 and b != 0 and c != 0 and abs(a - b*c) / abs(a) <= tolerance:
-            results.append({'type': 'symbolic_ehf', 'formula': f'{a} = {b} * {c}', 'token_start': i, 'bit_start': tokens[i]['bit_start']})
-
-    return results
+def detect_symbolic_equations(tokens: Dict[str, np.ndarray], tolerances: Tuple[float, ...] = (0.0,)) -> List[Dict]:
+    # Every relation is tested over all windows at once, for every tolerance in one pass.
+    return SYMBOLIC_DETECTOR.detect(tokens['value_big'], tokens['bit_start'], tolerances)
 
-def detect_primes(tokens: List[Dict]) -> List[Dict]:
+def detect_primes(tokens: Dict[str, np.ndarray]) -> List[Dict]:
     results = []
-    for token in tokens:
-        val = token['value_big']
-        if is_prime(val):
-            results.append({'type': 'prime', 'value': val, 'token_start': token['token_index'], 'bit_start': token['bit_start']})
+    # One batched lookup: small values hit the sieve, each larger value is tested once.
+    flags = is_prime_batch(tokens['value_big'])
+    for i in np.flatnonzero(flags).tolist():
+        results.append({'type': 'prime', 'value': int(tokens['value_big'][i]), 'token_start': int(tokens['token_index'][i]), 'bit_start': int(tokens['bit_start'][i])})
     return results
 
-def detect_ratios(tokens: List[Dict], constants: Dict[str, float], tolerance: float = 0.01) -> List[Dict]:
+def detect_ratios(tokens: Dict[str, np.ndarray], constants: Dict[str, float], tolerance: float = 0.01) -> List[Dict]:
+    # Every adjacent ratio is matched against the constants in one sorted-table lookup.
+    table = ConstantTable(constants, transforms={'': TRANSFORMS['']})
+    vals = tokens['value_big'].tolist()
+    bit_starts = tokens['bit_start'].tolist()
+    ratios, _, _, index = token_ratios(tokens['value_big'])
     results = []
-    vals = [t['value_big'] for t in tokens]
-    
-    for i in range(len(vals) - 1):
-        if vals[i+1] != 0 and vals[i] != 0:
-            ratio = vals[i] / vals[i+1]
-            for name, const_val in constants.items():
-                if abs(ratio - const_val) / abs(const_val) <= tolerance:
-                    results.append({'type': 'ratio', 'ratio_of': f'{vals[i]}/{vals[i+1]}', 'approx_constant': name, 'token_start': i, 'bit_start': tokens[i]['bit_start']})
+    query_index, table_index, rel_error, p_chance = table.match(ratios, tolerance)
+    for q, t, err, p in zip(query_index.tolist(), table_index.tolist(), rel_error.tolist(), p_chance.tolist()):
+        i = int(index[q])
+        results.append({'type': 'ratio', 'ratio_of': f'{vals[i]}/{vals[i+1]}', 'approx_constant': table.names[t], 'token_start': i, 'bit_start': bit_starts[i], 'rel_error': err, 'p_chance': p})
     return results
 
 # ------------------ ANALYSIS PASSES ------------------
-def analyze_widths_and_encodings(bits: str, widths: List[int]) -> Dict:
+def analyze_widths_and_encodings(bits: str, widths: List[int]) -> Tuple[Dict, Dict]:
+    """
+    Returns (summary, tokens). The summary is JSON-ready; tokens holds the best-offset
+    tokens in memory: {'per_width': {w: columns}, 'ascii': {mode: ascii tokens}}.
+    """
     summary = {'per_width': {}}
+    tokens = {'per_width': {}, 'ascii': {}}
+    # Every width and offset is tokenized in one pass per endianness; the per-offset
+    # scores are vectorized reductions over the token matrices.
+    big = tokenize(bits, widths, 'big', IGNORE_PARTIAL_TAIL)
+    little = tokenize(bits, widths, 'little', IGNORE_PARTIAL_TAIL)
     for w in widths:
-        best_offset = 0
-        best_tokens = []
-        best_score = -1
-        for offset in range(w):
-            toks = decode_fixed_width(bits, w, offset)
-            score = sum(1 for t in toks if 0 <= t['value_big'] <= 255) / (len(toks) if toks else 1)
-            if score > best_score:
-                best_score = score
-                best_offset = offset
-                best_tokens = toks
-        # write tokens CSV
-        csv_path = os.path.join(OUTDIR, f"semantic_tokens_w{w}_o{best_offset}.csv")
-        rows = [[t['token_index'], t['bit_start'], t['bit_end'], t['bits'], t['value_big'], t['value_little']] for t in best_tokens]
-        write_csv(csv_path, ['token_index','bit_start','bit_end','bits','value_big','value_little'], rows)
+        best_offset, best_score = big[w].best_offset(0, 255)
+        best_tokens = token_columns(big[w], little[w], best_offset)
+        tokens['per_width'][w] = best_tokens
         # number hits
         num_hits = search_numbers_in_tokens(best_tokens, SPECIAL_NUMBERS)
-        summary['per_width'][w] = {'best_offset': best_offset, 'score': best_score, 'tokens_csv': csv_path, 'num_hits': num_hits}
+        summary['per_width'][w] = {'best_offset': best_offset, 'score': best_score, 'num_hits': num_hits}
     # ASCII passes
     summary['ascii'] = {}
+    ascii_matrices = tokenize(bits, ASCII_MODES, 'big', IGNORE_PARTIAL_TAIL)
     for mode in ASCII_MODES:
-        best_offset = 0
-        best_print_ratio = -1
-        best_atoks = []
-        for offset in range(mode):
-            atoks = decode_ascii(bits, mode, offset)
-            printable_ratio = sum(1 for t in atoks if t['char']) / (len(atoks) if atoks else 1)
-            if printable_ratio > best_print_ratio:
-                best_print_ratio = printable_ratio
-                best_offset = offset
-                best_atoks = atoks
-        csv_path = os.path.join(OUTDIR, f"ascii_mode{mode}_o{best_offset}.csv")
-        write_csv(csv_path, ['token_index','bits','ascii_val','char'], [[t['token_index'], t['bits'], t['ascii_val'], t['char']] for t in best_atoks])
-        summary['ascii'][mode] = {'best_offset': best_offset, 'print_ratio': best_print_ratio, 'csv': csv_path, 'equations': detect_equations_in_ascii_tokens(best_atoks)}
+        best_offset, best_print_ratio = ascii_matrices[mode].best_offset(32, 126)
+        best_atoks = decode_ascii(bits, mode, best_offset, ascii_matrices[mode])
+        tokens['ascii'][mode] = best_atoks
+        summary['ascii'][mode] = {'best_offset': best_offset, 'print_ratio': best_print_ratio, 'equations': detect_equations_in_ascii_tokens(best_atoks)}
     # Alternate encodings
     summary['alternate_encodings'] = {}
     for name, base in BASE_ENCODINGS.items():
@@ -291,7 +242,7 @@ def analyze_widths_and_encodings(bits: str, widths: List[int]) -> Dict:
             for eq_type, pattern in EQUATION_PATTERNS.items():
                 if re.search(pattern, decoded_string, flags=re.I):
                     summary['alternate_encodings'][name]['eq_matches'].append(eq_type)
-    return summary
+    return summary, tokens
 
 def analyze_special_numbers(bits: str, numbers: List[int]) -> Dict:
     results = {}
@@ -302,33 +253,46 @@ def analyze_special_numbers(bits: str, numbers: List[int]) -> Dict:
         results[n] = {'binary': b, 'big_endian_hits': hits_be, 'little_endian_hits': hits_le}
     return results
 
+# ------------------ EXPORT SINK ------------------
+def export_outputs(out: Dict, tokens: Dict, outdir: str = OUTDIR) -> None:
+    """Streams the token tables and candidate lists to CSV, and the summary to JSON."""
+    os.makedirs(outdir, exist_ok=True)
+    for w, columns in tokens['per_width'].items():
+        meta = out['semantic']['per_width'][w]
+        csv_path = os.path.join(outdir, f"semantic_tokens_w{w}_o{meta['best_offset']}.csv")
+        write_csv(csv_path, ['token_index','bit_start','bit_end','bits','value_big','value_little'], column_rows(columns, w))
+        meta['tokens_csv'] = csv_path
+    for mode, atoks in tokens['ascii'].items():
+        meta = out['semantic']['ascii'][mode]
+        csv_path = os.path.join(outdir, f"ascii_mode{mode}_o{meta['best_offset']}.csv")
+        write_csv(csv_path, ['token_index','bits','ascii_val','char'], ([t['token_index'], t['bits'], t['ascii_val'], t['char']] for t in atoks))
+        meta['csv'] = csv_path
+
+    with open(os.path.join(outdir, 'summary.json'), 'w') as f:
+        json.dump(out, f, indent=2)
+    
+    # write eq CSV
+    write_csv(os.path.join(outdir, 'equation_candidates.csv'), ['source','type','text','start'], ([e.get('source', 'numeric_symbolic'), e.get('type',''), e.get('formula') or e.get('text') or e.get('string',''), e.get('token_start', e.get('start_index', ''))] for e in out['equation_candidates']))
+    
+    # write prime CSV
+    write_csv(os.path.join(outdir, 'prime_candidates.csv'), ['type','value','token_start','bit_start'], ([p['type'], p['value'], p['token_start'], p['bit_start']] for p in out['prime_candidates']))
+    
+    # write ratio CSV
+    write_csv(os.path.join(outdir, 'ratio_candidates.csv'), ['type','ratio_of','approx_constant','token_start','bit_start'], ([r['type'], r['ratio_of'], r['approx_constant'], r['token_start'], r['bit_start']] for r in out['ratio_candidates']))
+
 # ------------------ RUN / DUMP ------------------
-def run_all(bits: str) -> Dict:
+def run_all(bits: str, export: bool = True) -> Dict:
     out = {'length': len(bits), 'ones': bits.count('1'), 'zeros': bits.count('0')}
-    out['semantic'] = analyze_widths_and_encodings(bits, N_BITS_SWEEPS)
+    out['semantic'], tokens = analyze_widths_and_encodings(bits, N_BITS_SWEEPS)
     out['special_numbers'] = analyze_special_numbers(bits, SPECIAL_NUMBERS)
-    # gather eq candidates from tokens written above
+    # the detectors read the in-memory token columns directly
     eq_candidates = []
     prime_candidates = []
     ratio_candidates = []
     
-    for w, meta in out['semantic']['per_width'].items():
-        csvp = meta['tokens_csv']
-        toks = []
-        with open(csvp, 'r', newline='') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                toks.append({
-                    'token_index': int(row['token_index']),
-                    'bit_start': int(row['bit_start']),
-                    'bit_end': int(row['bit_end']),
-                    'bits': row['bits'],
-                    'value_big': int(row['value_big'])
-                })
-        
+    for w, toks in tokens['per_width'].items():
         # New symbolic detection
-        eq_candidates += detect_symbolic_equations(toks, tolerance=0.0) # Search for exact matches
-        eq_candidates += detect_symbolic_equations(toks, tolerance=0.01) # Search with tolerance
+        eq_candidates += detect_symbolic_equations(toks, tolerances=(0.0, 0.01)) # Exact matches, then with tolerance
         
         # Prime number detection
         prime_candidates += detect_primes(toks)
@@ -352,26 +316,8 @@ def run_all(bits: str) -> Dict:
     out['prime_candidates'] = prime_candidates
     out['ratio_candidates'] = ratio_candidates
 
-    with open(os.path.join(OUTDIR, 'summary.json'), 'w') as f:
-        json.dump(out, f, indent=2)
-    
-    # write eq CSV
-    rows = []
-    for e in eq_candidates:
-        rows.append([e.get('source', 'numeric_symbolic'), e.get('type',''), e.get('formula') or e.get('text') or e.get('string',''), e.get('token_start', e.get('start_index', ''))])
-    write_csv(os.path.join(OUTDIR, 'equation_candidates.csv'), ['source','type','text','start'], rows)
-    
-    # write prime CSV
-    rows = []
-    for p in prime_candidates:
-        rows.append([p['type'], p['value'], p['token_start'], p['bit_start']])
-    write_csv(os.path.join(OUTDIR, 'prime_candidates.csv'), ['type','value','token_start','bit_start'], rows)
-    
-    # write ratio CSV
-    rows = []
-    for r in ratio_candidates:
-        rows.append([r['type'], r['ratio_of'], r['approx_constant'], r['token_start'], r['bit_start']])
-    write_csv(os.path.join(OUTDIR, 'ratio_candidates.csv'), ['type','ratio_of','approx_constant','token_start','bit_start'], rows)
+    if export:
+        export_outputs(out, tokens)
     
     return out
 
@@ -2,14 +2,17 @@ import subprocess
 import markdown
 import base64
 import os
+import sys
 
-def run_and_render():
+def run_and_render(analyzer_args=()):
     """Runs the consolidated_analyzer.py script, captures its output,
     converts it to HTML with styling, embeds the images and LLM response, 
-    and saves it to a file."""
+    and saves it to a file.
+    Unchanged analysis stages are restored from the analyzer's artifact cache;
+    `analyzer_args` (e.g. --no-cache, --skip-ml) are passed through to it."""
 
     # Run the script and capture the output
-    result = subprocess.run(['python3', 'archive/phase2/consolidated_analyzer.py'], capture_output=True, text=True)
+    result = subprocess.run(['python3', 'archive/phase2/consolidated_analyzer.py', *analyzer_args], capture_output=True, text=True)
     output = result.stdout
 
     # Encode the images in base64
@@ -159,4 +162,4 @@ def run_and_render():
         f.write(html_content)
 
 if __name__ == "__main__":
-    run_and_render()
+    run_and_render(sys.argv[1:])
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Wow! Signal - Startup Time Benchmark
+---------------------------------------------------
+Imports each analysis pipeline in a fresh interpreter under
+`python -X importtime` and fails if a heavy dependency is loaded at import
+time or if the import takes longer than the budget. Run it after touching the
+imports of the pipelines:
+
+    python startup_benchmark.py
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Module name -> directory that has to be on sys.path to import it.
+PIPELINE_MODULES = {
+    "wow_signal_analyzer": REPO_ROOT,
+    "consolidated_analyzer": os.path.join(REPO_ROOT, "archive", "phase2"),
+}
+
+# Dependencies that must only be imported inside the stages that use them.
+LAZY_DEPENDENCIES = ["tensorflow", "scipy.linalg", "scipy.fft", "reedsolo", "requests", "gmpy2", "markdown"]
+
+IMPORT_BUDGET_SECONDS = 1.0
+
+def measure_import(module, path):
+    """Imports `module` in a fresh interpreter and returns {imported name: cumulative seconds}."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [path, env.get("PYTHONPATH")]))
+    # The pipelines create their output directories on import, so keep them out of the repo.
+    with tempfile.TemporaryDirectory() as workdir:
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                cwd=workdir, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.strip()}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue  # column header
+        timings[fields[2].strip()] = int(fields[1]) / 1e6
+    return timings
+
+def check_module(module, path):
+    """Returns a list of regressions found for one pipeline module."""
+    timings = measure_import(module, path)
+    problems = []
+    for dependency in LAZY_DEPENDENCIES:
+        if dependency in timings:
+            problems.append(f"{dependency} is imported at module load ({timings[dependency]:.3f}s).")
+    total = timings.get(module, 0.0)
+    if total > IMPORT_BUDGET_SECONDS:
+        problems.append(f"import took {total:.3f}s, over the {IMPORT_BUDGET_SECONDS:.1f}s budget.")
+
+    slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)[1:6]
+    print(f"{module}: {total:.3f}s")
+    for name, seconds in slowest:
+        print(f"    {name:<40} {seconds:.3f}s")
+    return problems
+
+def main():
+    print("=" * 60)
+    print("  Startup Time Benchmark (python -X importtime)")
+    print("=" * 60)
+    failures = 0
+    for module, path in PIPELINE_MODULES.items():
+        problems = check_module(module, path)
+        for problem in problems:
+            print(f"  FAIL: {problem}")
+        failures += len(problems)
+    print("\n--- DONE ---")
+    print("All pipelines start within budget." if not failures else f"{failures} startup regression(s) found.")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())